@@ -4,48 +4,121 @@ call_mcp.py: FastAPI app with dynamic nested MCP calls and MCP server mounting.
 - 每个端点动态调用/转发到另一个 MCP。
 - 直接挂载 MCP 服务器到本 FastAPI。
 - 支持通过 HTTP 动态选择/调用不同的 MCP。
-- 用完即销毁，突破 tools 数量限制。
+- 工具总数超过 MAX_TOOLS 时，超出上限的 server 不能被调用。
+- 外部 MCP（配置了 command 的条目）由预热进程池管理，动态分配端口、复用持久会话。
+- 配置了 baseUrl 的 FastAPI 服务在启动时统一联邦为一个 MCP 服务器（工具名带命名空间），不再按请求创建 app。
+- 下游 server 的工具列表由注册表缓存并在后台刷新，数量上限与聚合列表都基于缓存，不再逐次请求下游。
 """
-import asyncio
+
 import json
-import subprocess
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Body, HTTPException
 from fastapi.responses import JSONResponse
-from fastapi_mcp import FastApiMCP
+from fastapi_mcp import FastApiMCP, FederatedMCP, MCPSource
 from typing import Dict, Any, Optional
-import httpx
 import os
 
+if not __package__:
+    # 作为脚本运行时（python backend/call_mcp.py），把 backend 的父目录加入 sys.path
+    from core.backend_in_syspath import ensure_backend_in_syspath  # type: ignore[import-not-found]
+
+    ensure_backend_in_syspath(__file__)
+
+from backend.mcp_pool import MCPProcessPool
+from backend.tool_registry import ToolRegistry
+
 # MCP 配置文件路径
 MCP_CONFIG_PATH = os.path.expanduser(r"~/.codeium/windsurf/mcp_config.json")
 MAX_TOOLS = 50
 
-# 全局 registry: {server_name: {'type': 'python'|'external', 'tools': int, 'proc': Popen, ...}}
-mcp_registry = {}
+# 全局 registry: 缓存每个下游 server 的完整工具列表，TTL 与后台刷新间隔可配置
+tool_registry = ToolRegistry(
+    max_tools=MAX_TOOLS,
+    ttl=float(os.environ.get("MCP_REGISTRY_TTL", "300")),
+    refresh_interval=float(os.environ.get("MCP_REGISTRY_REFRESH_INTERVAL", "60")),
+)
 
 # 读取 MCP config
 with open(MCP_CONFIG_PATH, encoding="utf-8") as f:
     MCP_CONFIG = json.load(f)["mcpServers"]
 
-app = FastAPI(title="Cascade动态MCP网关")
+# 外部 MCP 进程池: 每个 server 预热 MCP_POOL_MIN_WORKERS 个进程，最多 MCP_POOL_MAX_WORKERS 个
+mcp_pool = MCPProcessPool(
+    {server_name: cfg for server_name, cfg in MCP_CONFIG.items() if "command" in cfg},
+    min_workers=int(os.environ.get("MCP_POOL_MIN_WORKERS", "1")),
+    max_workers=int(os.environ.get("MCP_POOL_MAX_WORKERS", "4")),
+    idle_timeout=float(os.environ.get("MCP_POOL_IDLE_TIMEOUT", "300")),
+)
 
-async def get_tools_count():
-    """统计所有 MCP 的 tools 数量"""
-    total = 0
-    for entry in mcp_registry.values():
-        total += entry.get('tools', 0)
-    return total
 
-async def fetch_tools_from_http(server_url: str) -> int:
-    """通过 HTTP 获取 MCP server 的 tools 数量"""
-    async with httpx.AsyncClient() as client:
-        try:
-            resp = await client.post(f"{server_url}/list_tools")
-            resp.raise_for_status()
-            tools = resp.json()
-            return len(tools)
-        except Exception:
-            return 0
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await mcp_pool.start()
+    await tool_registry.start()
+    try:
+        yield
+    finally:
+        await tool_registry.close()
+        await mcp_pool.close()
+
+
+app = FastAPI(title="Cascade动态MCP网关", lifespan=lifespan)
+
+# 联邦的 FastAPI 服务: MCP config 中带 baseUrl 的条目（OpenAPI 默认在 /openapi.json）
+# 每个服务只转换一次，HTTP client 按服务共享
+gateway_mcp = FederatedMCP(
+    app,
+    name="cascade-gateway",
+    sources=[
+        MCPSource(
+            server_name,
+            base_url=cfg["baseUrl"],
+            openapi_url=cfg.get("openapiPath", "/openapi.json"),
+            # 只有显式配置 forwardAuthorization 的服务才会收到调用方的 Authorization 头
+            forward_authorization=cfg.get("forwardAuthorization", False),
+        )
+        for server_name, cfg in MCP_CONFIG.items()
+        if "baseUrl" in cfg
+    ],
+    # 下游服务的 OpenAPI 在后台获取，网关启动不依赖下游是否在线；获取失败的服务被跳过并记录日志
+    background_warmup=True,
+)
+gateway_mcp.mount(app, mount_path="/federated/mcp", transport="sse")
+
+
+def external_tools_fetcher(server_name: str):
+    """通过进程池中的持久会话获取外部 MCP 的工具列表"""
+
+    async def fetch():
+        return (await mcp_pool.list_tools(server_name)).tools
+
+    return fetch
+
+
+def federated_tools_fetcher(namespace: str):
+    """联邦服务的工具在本进程中转换，直接按命名空间筛选"""
+    prefix = gateway_mcp.tool_name(namespace, "")
+
+    async def fetch():
+        # 网关在后台构建工具，先异步等待构建完成（有超时），读取 tools 时才不会阻塞事件循环
+        await gateway_mcp.warmup(tool_registry.fetch_timeout)
+        return [tool for tool in gateway_mcp.tools if tool.name.startswith(prefix)]
+
+    return fetch
+
+
+for server_name in mcp_pool.configs:
+    tool_registry.register(server_name, "external", external_tools_fetcher(server_name))
+for namespace in gateway_mcp.sources:
+    tool_registry.register(namespace, "python", federated_tools_fetcher(namespace))
+
+
+@app.get("/tools")
+async def list_all_tools():
+    """聚合所有下游 server 的工具列表（来自缓存，不等待下游；过期的缓存在后台刷新）"""
+    servers = await tool_registry.aggregated()
+    return {"max_tools": MAX_TOOLS, "total_tools": tool_registry.total_tools(), "servers": servers}
+
 
 @app.post("/call_mcp/{mcp_name}")
 async def call_mcp_endpoint(
@@ -57,56 +130,46 @@ async def call_mcp_endpoint(
     支持多 MCP server 动态调用，自动判断 tools 总数是否超限。
     server: 指定 mcp server 名称，如 'playwright'。
     """
-    global mcp_registry
-    # 判断是否超限
-    total_tools = await get_tools_count()
-    if total_tools >= MAX_TOOLS:
-        raise HTTPException(status_code=429, detail=f"MCP tools 总数已达上限: {MAX_TOOLS}")
-
-    # 1. 外部 MCP（如 npx）
-    if server and server in MCP_CONFIG:
-        cfg = MCP_CONFIG[server]
-        # 启动 MCP 进程
-        proc = subprocess.Popen(
-            [cfg["command"]] + cfg["args"],
-            env=cfg.get("env", os.environ),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        # 假设外部 MCP 监听 127.0.0.1:9000
-        mcp_url = "http://127.0.0.1:9000/mcp"
+    # 判断是否超限（基于注册表缓存；缓存过期时在后台刷新，只有从未拉取成功时才等待下游）
+    target = server if server and server in mcp_pool else mcp_name
+    if target in tool_registry:
+        await tool_registry.get_tools(target)
+        if target not in tool_registry.admitted_servers():
+            raise HTTPException(status_code=429, detail=f"MCP tools 总数已达上限: {MAX_TOOLS}")
+
+    # 1. 外部 MCP（如 npx）: payload = {"tool": <工具名>, "arguments": {...}}
+    if server and server in mcp_pool:
+        tool = payload.get("tool")
+        if not tool:
+            raise HTTPException(status_code=400, detail="payload 缺少 tool")
         try:
-            # 获取 tools 数量
-            tools_num = await fetch_tools_from_http(mcp_url)
-            mcp_registry[server] = {'type': 'external', 'tools': tools_num, 'proc': proc}
-            # 动态调用目标 MCP
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(f"{mcp_url}/call_tool", json=payload)
-                result = resp.json()
-            return JSONResponse(content={"result": result, "server": server})
-        finally:
-            proc.terminate()
-            proc.wait()
-            mcp_registry.pop(server, None)
-    # 2. 本地 Python MCP
+            # 复用进程池中的持久会话
+            call_result = await mcp_pool.call_tool(server, tool, payload.get("arguments") or {})
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=str(e))
+        return JSONResponse(content={"result": call_result.model_dump(mode="json"), "server": server})
+    # 2. 联邦的 FastAPI 服务: payload = {"tool": <operation_id>, "arguments": {...}}
     else:
-        temp_app = FastAPI(title=f"动态 MCP-{mcp_name}")
-        mcp_server = FastApiMCP(temp_app, name=mcp_name)
-        mcp_server.mount(temp_app, mount_path="/mcp", transport="sse")
-        # 获取 tools 数量（假设 tools 都已注册）
-        tools_num = len(mcp_server.tools) if hasattr(mcp_server, 'tools') else 0
-        mcp_registry[mcp_name] = {'type': 'python', 'tools': tools_num}
-        # 实际调用（此处简化为回显）
-        result = {"mcp": mcp_name, "payload": payload}
-        del temp_app
-        del mcp_server
-        mcp_registry.pop(mcp_name, None)
+        if mcp_name not in gateway_mcp.sources:
+            raise HTTPException(status_code=404, detail=f"未知的 MCP: {mcp_name}")
+        tool = payload.get("tool")
+        if not tool:
+            raise HTTPException(status_code=400, detail="payload 缺少 tool")
+        try:
+            contents = await gateway_mcp.call_tool(
+                gateway_mcp.tool_name(mcp_name, tool), payload.get("arguments") or {}
+            )
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=str(e))
+        result = [content.model_dump() for content in contents]
         return JSONResponse(content={"result": result, "server": mcp_name})
 
+
 # 3. 直接将 MCP 服务器挂载到本 FastAPI 应用
 main_mcp = FastApiMCP(app, name="main-mcp")
 main_mcp.mount(app, mount_path="/mcp", transport="sse")
 
+
 # 4. 健康检查端点
 @app.get("/health")
 def health():
@@ -115,5 +178,5 @@ def health():
 
 if __name__ == "__main__":
     import uvicorn
+
     uvicorn.run(app, host="0.0.0.0", port=8888)
-    
\ No newline at end of file
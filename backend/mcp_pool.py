@@ -0,0 +1,343 @@
+"""
+mcp_pool.py: 外部 MCP server（如 npx playwright）的预热进程池。
+
+- 每个 server 预先启动 min_workers 个进程，按需扩容到 max_workers。
+- 端口动态分配：args 中的 "{port}" 会被替换，同时通过 PORT 环境变量传给进程。
+- 每个进程保持一个持久的 MCP SSE 会话，调用时直接复用。
+- 后台定期健康检查（MCP ping），空闲超时的进程会被停止，异常的进程会被重启。
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+import mcp.types as types
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+
+logger = logging.getLogger(__name__)
+
+
+def find_free_port() -> int:
+    """向系统申请一个空闲端口"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class MCPWorker:
+    """一个外部 MCP server 进程，以及到它的持久 MCP 会话"""
+
+    def __init__(self, name: str, cfg: Dict[str, Any], startup_timeout: float):
+        self.name = name
+        self.cfg = cfg
+        self.startup_timeout = startup_timeout
+        self.port: Optional[int] = None
+        self.proc: Optional[asyncio.subprocess.Process] = None
+        self.session: Optional[ClientSession] = None
+        self.last_used = time.monotonic()
+
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}{self.cfg.get('ssePath', '/sse')}"
+
+    @property
+    def alive(self) -> bool:
+        return (
+            self.proc is not None
+            and self.proc.returncode is None
+            and self.session is not None
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    async def start(self) -> None:
+        self.port = find_free_port()
+        args = [str(arg).replace("{port}", str(self.port)) for arg in self.cfg.get("args", [])]
+        env = {**os.environ, **self.cfg.get("env", {}), "PORT": str(self.port)}
+
+        # 输出不读取，直接丢弃，避免管道写满后子进程阻塞
+        self.proc = await asyncio.create_subprocess_exec(
+            self.cfg["command"],
+            *args,
+            env=env,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        self._task = asyncio.create_task(self._run())
+
+        # 超时覆盖整个启动过程：等待端口、建立 SSE 连接和 MCP 握手。
+        # 进程打开端口后卡在握手时，取消会话 task 并停止进程，释放占用的 max_workers 名额
+        try:
+            await asyncio.wait_for(self._ready.wait(), self.startup_timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            await self.stop()
+            raise RuntimeError(f"MCP server {self.name} 启动失败: {self.startup_timeout} 秒内未完成启动")
+        if self.session is None:
+            await self.stop()
+            raise RuntimeError(f"MCP server {self.name} 启动失败: {self._error!r}")
+        logger.info(f"MCP server {self.name} 已启动，端口 {self.port}")
+
+    async def _run(self) -> None:
+        # 会话的上下文必须在同一个 task 中进入和退出，所以由这个 task 一直持有，直到 stop()
+        try:
+            await self._wait_for_port()
+            async with sse_client(self.url) as streams:
+                async with ClientSession(*streams) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._ready.set()
+                    await self._stop.wait()
+        except Exception as e:
+            self._error = e
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def _wait_for_port(self) -> None:
+        assert self.proc is not None and self.port is not None
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.proc.returncode is not None:
+                raise RuntimeError(f"进程已退出，返回码 {self.proc.returncode}")
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", self.port)
+                writer.close()
+                return
+            except OSError:
+                await asyncio.sleep(0.1)
+        raise TimeoutError(f"端口 {self.port} 在 {self.startup_timeout} 秒内未就绪")
+
+    async def health_check(self, timeout: float) -> bool:
+        if not self.alive:
+            return False
+        assert self.session is not None
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout)
+            return True
+        except Exception:
+            return False
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, 5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+        if self.proc is not None and self.proc.returncode is None:
+            self.proc.terminate()
+            try:
+                await asyncio.wait_for(self.proc.wait(), 5)
+            except asyncio.TimeoutError:
+                self.proc.kill()
+                await self.proc.wait()
+        logger.info(f"MCP server {self.name} 已停止，端口 {self.port}")
+
+
+class MCPProcessPool:
+    """
+    外部 MCP server 的进程池。
+
+    configs 与 mcp_config.json 中 mcpServers 的条目格式相同（command、args、env），
+    另外可以用 ssePath 指定 SSE 路径（默认 /sse）。
+    """
+
+    def __init__(
+        self,
+        configs: Dict[str, Dict[str, Any]],
+        min_workers: int = 1,
+        max_workers: int = 4,
+        idle_timeout: float = 300.0,
+        health_interval: float = 30.0,
+        startup_timeout: float = 30.0,
+    ):
+        if max_workers < 1 or min_workers < 0 or min_workers > max_workers:
+            raise ValueError("需要满足 0 <= min_workers <= max_workers 且 max_workers >= 1")
+
+        self.configs = configs
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.idle_timeout = idle_timeout
+        self.health_interval = health_interval
+        self.startup_timeout = startup_timeout
+
+        # 每个 server: 所有进程（含启动中的）、空闲进程、以及等待空闲进程的条件变量
+        self._workers: Dict[str, List[MCPWorker]] = {name: [] for name in configs}
+        self._idle: Dict[str, List[MCPWorker]] = {name: [] for name in configs}
+        self._conditions: Dict[str, asyncio.Condition] = {name: asyncio.Condition() for name in configs}
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._stopping: Set[asyncio.Task] = set()
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.configs
+
+    async def start(self) -> None:
+        """预热每个 server 的 min_workers 个进程，并启动后台维护任务"""
+        await asyncio.gather(*(self._ensure_min_workers(name) for name in self.configs))
+        self._maintenance_task = asyncio.create_task(self._maintain())
+
+    async def close(self) -> None:
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+        workers = [worker for workers in self._workers.values() for worker in workers]
+        await asyncio.gather(*(worker.stop() for worker in workers), *self._stopping, return_exceptions=True)
+        for name in self.configs:
+            self._workers[name].clear()
+            self._idle[name].clear()
+
+    @asynccontextmanager
+    async def acquire(self, name: str) -> AsyncIterator[MCPWorker]:
+        """独占一个可用的进程，用完后归还"""
+        worker = await self._checkout(name)
+        try:
+            yield worker
+        finally:
+            await self._checkin(worker)
+
+    async def call_tool(self, name: str, tool: str, arguments: Dict[str, Any]) -> types.CallToolResult:
+        async with self.acquire(name) as worker:
+            assert worker.session is not None
+            return await worker.session.call_tool(tool, arguments)
+
+    async def list_tools(self, name: str) -> types.ListToolsResult:
+        async with self.acquire(name) as worker:
+            assert worker.session is not None
+            return await worker.session.list_tools()
+
+    async def _checkout(self, name: str) -> MCPWorker:
+        if name not in self.configs:
+            raise KeyError(f"未知的 MCP server: {name}")
+
+        condition = self._conditions[name]
+        async with condition:
+            while True:
+                while self._idle[name]:
+                    worker = self._idle[name].pop()
+                    if worker.alive:
+                        worker.last_used = time.monotonic()
+                        return worker
+                    self._remove(worker)
+                    self._stop_later(worker)
+
+                if len(self._workers[name]) < self.max_workers:
+                    # 先占位，再在锁外启动，避免并发请求超出 max_workers
+                    worker = MCPWorker(name, self.configs[name], self.startup_timeout)
+                    self._workers[name].append(worker)
+                    break
+
+                await condition.wait()
+
+        try:
+            await worker.start()
+        except Exception:
+            async with condition:
+                self._remove(worker)
+                condition.notify()
+            raise
+        return worker
+
+    async def _checkin(self, worker: MCPWorker) -> None:
+        condition = self._conditions[worker.name]
+        async with condition:
+            worker.last_used = time.monotonic()
+            if worker.alive:
+                self._idle[worker.name].append(worker)
+            else:
+                self._remove(worker)
+                self._stop_later(worker)
+            condition.notify()
+
+    def _stop_later(self, worker: MCPWorker) -> None:
+        # 保留 task 的引用，避免停止过程中被回收
+        task = asyncio.create_task(worker.stop())
+        self._stopping.add(task)
+        task.add_done_callback(self._stopping.discard)
+
+    def _remove(self, worker: MCPWorker) -> None:
+        if worker in self._workers[worker.name]:
+            self._workers[worker.name].remove(worker)
+        if worker in self._idle[worker.name]:
+            self._idle[worker.name].remove(worker)
+
+    async def _ensure_min_workers(self, name: str) -> None:
+        condition = self._conditions[name]
+        async with condition:
+            missing = self.min_workers - len(self._workers[name])
+            workers = [MCPWorker(name, self.configs[name], self.startup_timeout) for _ in range(missing)]
+            self._workers[name].extend(workers)
+
+        results = await asyncio.gather(*(worker.start() for worker in workers), return_exceptions=True)
+
+        async with condition:
+            for worker, result in zip(workers, results):
+                if isinstance(result, BaseException):
+                    logger.error(f"预热 MCP server {name} 失败: {result!r}")
+                    self._remove(worker)
+                else:
+                    self._idle[name].append(worker)
+            condition.notify_all()
+
+    async def _maintain(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval)
+            for name in self.configs:
+                try:
+                    await self._maintain_server(name)
+                except Exception:
+                    logger.exception(f"维护 MCP server {name} 的进程失败")
+
+    async def _maintain_server(self, name: str) -> None:
+        condition = self._conditions[name]
+
+        # 只检查空闲的进程，正在使用的进程不受影响
+        async with condition:
+            idle = list(self._idle[name])
+            self._idle[name].clear()
+
+            # 空闲超时的进程直接停止，但至少保留 min_workers 个
+            expired: List[MCPWorker] = []
+            to_check: List[MCPWorker] = []
+            now = time.monotonic()
+            for worker in idle:
+                if now - worker.last_used > self.idle_timeout and len(self._workers[name]) > self.min_workers:
+                    expired.append(worker)
+                    self._remove(worker)
+                else:
+                    to_check.append(worker)
+
+        # 进程可能要等几秒才会退出，放到后台停止，不阻塞其他 server 的维护
+        for worker in expired:
+            self._stop_later(worker)
+
+        # 并发检查，每个进程通过检查后立即归还，不必等待其他进程的检查超时
+        await asyncio.gather(*(self._check_worker(worker) for worker in to_check))
+        await self._ensure_min_workers(name)
+
+    async def _check_worker(self, worker: MCPWorker) -> None:
+        healthy = await worker.health_check(timeout=5)
+        condition = self._conditions[worker.name]
+        async with condition:
+            if healthy:
+                self._idle[worker.name].append(worker)
+            else:
+                logger.warning(f"MCP server {worker.name} 端口 {worker.port} 健康检查失败，重启")
+                self._remove(worker)
+            condition.notify()
+        if not healthy:
+            self._stop_later(worker)
@@ -0,0 +1,141 @@
+"""
+tool_registry.py: 网关的下游 MCP server 工具注册表。
+
+- 缓存每个下游 server 的完整工具列表（不只是数量），带 TTL。
+- 后台定期刷新；读取时若缓存过期，先返回旧数据，再在后台刷新（stale-while-revalidate）。
+- 同一个 server 同时只会有一个刷新请求（single-flight）。
+- 工具数量上限基于缓存计算，聚合的工具列表无需请求下游。
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+import mcp.types as types
+
+
+logger = logging.getLogger(__name__)
+
+ToolFetcher = Callable[[], Awaitable[List[types.Tool]]]
+
+
+@dataclass
+class RegistryEntry:
+    server_type: str
+    fetcher: ToolFetcher
+    tools: Optional[List[types.Tool]] = None
+    fetched_at: float = 0.0
+    error: Optional[str] = None
+    refreshing: Optional[asyncio.Task] = field(default=None, repr=False)
+
+
+class ToolRegistry:
+    def __init__(self, max_tools: int, ttl: float = 300.0, refresh_interval: float = 60.0, fetch_timeout: float = 30.0):
+        self.max_tools = max_tools
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.fetch_timeout = fetch_timeout
+        self._entries: Dict[str, RegistryEntry] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, server_type: str, fetcher: ToolFetcher) -> None:
+        """注册一个下游 server，fetcher 返回它的完整工具列表"""
+        self._entries[name] = RegistryEntry(server_type=server_type, fetcher=fetcher)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    async def start(self) -> None:
+        """首次并发拉取所有 server 的工具列表，并启动后台刷新任务"""
+        await asyncio.gather(*(self.refresh(name) for name in self._entries))
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def close(self) -> None:
+        tasks = [entry.refreshing for entry in self._entries.values() if entry.refreshing is not None]
+        if self._refresh_task is not None:
+            tasks.append(self._refresh_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def refresh(self, name: str) -> None:
+        """刷新一个 server 的工具列表。已有刷新在进行时，等待它完成而不是重复请求下游"""
+        entry = self._entries[name]
+        if entry.refreshing is None or entry.refreshing.done():
+            entry.refreshing = asyncio.create_task(self._fetch(name, entry))
+        await asyncio.shield(entry.refreshing)
+
+    async def _fetch(self, name: str, entry: RegistryEntry) -> None:
+        try:
+            tools = await asyncio.wait_for(entry.fetcher(), self.fetch_timeout)
+        except Exception as e:
+            # 保留旧的工具列表，只记录错误
+            logger.warning(f"获取 {name} 的工具列表失败: {e!r}")
+            entry.error = repr(e)
+            return
+        entry.tools = tools
+        entry.fetched_at = time.monotonic()
+        entry.error = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await asyncio.gather(*(self.refresh(name) for name in self._entries), return_exceptions=True)
+
+    def _is_stale(self, entry: RegistryEntry) -> bool:
+        return entry.tools is None or time.monotonic() - entry.fetched_at > self.ttl
+
+    def _revalidate(self, name: str, entry: RegistryEntry) -> None:
+        """缓存过期时在后台刷新，不等待结果"""
+        if self._is_stale(entry) and (entry.refreshing is None or entry.refreshing.done()):
+            entry.refreshing = asyncio.create_task(self._fetch(name, entry))
+
+    async def get_tools(self, name: str) -> List[types.Tool]:
+        """获取一个 server 的工具列表。只有从未拉取成功时才会等待下游"""
+        entry = self._entries[name]
+        if entry.tools is None:
+            await self.refresh(name)
+        else:
+            self._revalidate(name, entry)
+        return entry.tools or []
+
+    def tools_count(self, name: str) -> int:
+        tools = self._entries[name].tools
+        return len(tools) if tools is not None else 0
+
+    def total_tools(self) -> int:
+        return sum(self.tools_count(name) for name in self._entries)
+
+    def admitted_servers(self) -> Set[str]:
+        """
+        按注册顺序纳入 server，直到工具总数达到 max_tools 为止。
+        超出上限的 server 不会出现在聚合列表中，也不能被调用。
+        """
+        admitted: Set[str] = set()
+        total = 0
+        for name in self._entries:
+            count = self.tools_count(name)
+            if total + count > self.max_tools:
+                continue
+            admitted.add(name)
+            total += count
+        return admitted
+
+    async def aggregated(self) -> Dict[str, Dict]:
+        """聚合所有 server 的缓存工具列表，不等待下游。过期的 server 在后台刷新"""
+        for name, entry in self._entries.items():
+            self._revalidate(name, entry)
+        admitted = self.admitted_servers()
+        now = time.monotonic()
+        return {
+            name: {
+                "type": entry.server_type,
+                "admitted": name in admitted,
+                "tools": [tool.model_dump(mode="json", exclude_none=True) for tool in entry.tools or []],
+                "age": now - entry.fetched_at if entry.tools is not None else None,
+                "error": entry.error,
+            }
+            for name, entry in self._entries.items()
+        }
@@ -0,0 +1,347 @@
+"""
+Benchmarks of FastAPI-MCP, emitting machine-readable JSON results.
+
+Usage:
+    python -m benchmarks.run                        # All benchmarks, 10 to 10,000 routes
+    python -m benchmarks.run --routes 10,100 --output results.json
+    python -m benchmarks.run --only conversion,tools_list
+
+Measured:
+- conversion: OpenAPI schema generation, `convert_openapi_to_mcp_tools` time and peak memory, and `FastApiMCP` setup
+- tools_list: `tools/list` latency over an in-memory MCP session
+- tool_calls: tool call throughput through `FastApiMCP._execute_api_tool`
+- sse_roundtrip: `tools/call` round-trip latency over SSE, against an in-process uvicorn server
+- load: tool call throughput and latency of concurrent in-memory MCP sessions, with `fastapi_mcp.testing.run_load`
+- memory: memory retained by the converted tools, the operation map and a set up `FastApiMCP`, with and without
+  `share_schemas`
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import platform
+import socket
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Callable, Dict, List, Tuple
+
+import uvicorn
+from fastapi.openapi.utils import get_openapi
+from mcp.client.session import ClientSession
+from mcp.client.sse import sse_client
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from fastapi_mcp import FastApiMCP
+from fastapi_mcp.openapi.convert import convert_openapi_to_mcp_tools
+from fastapi_mcp.testing import ToolCallSpec, run_load
+
+from benchmarks.synthetic_app import make_synthetic_app
+
+
+DEFAULT_ROUTES = [10, 100, 1000, 10000]
+BENCHMARKS = ["conversion", "tools_list", "tool_calls", "sse_roundtrip", "load", "memory"]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    Summarize latency samples, given in seconds, in milliseconds.
+    """
+    ordered = sorted(samples)
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "min_ms": ordered[0] * 1000,
+        "p50_ms": percentile(0.50),
+        "p90_ms": percentile(0.90),
+        "p99_ms": percentile(0.99),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def measure(func: Callable[[], Any]) -> Dict[str, float]:
+    """
+    Measure the time and the peak of memory allocated by a function.
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        func()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": elapsed, "peak_memory_bytes": peak}
+
+
+def bench_conversion(routes: int, depth: int) -> Dict[str, Any]:
+    app = make_synthetic_app(routes, depth=depth)
+
+    start = time.perf_counter()
+    schema = get_openapi(title=app.title, version=app.version, routes=app.routes)
+    openapi_seconds = time.perf_counter() - start
+
+    # Timed without tracemalloc first, which slows down allocations a lot
+    start = time.perf_counter()
+    tools, _ = convert_openapi_to_mcp_tools(schema)
+    convert_seconds = time.perf_counter() - start
+
+    convert_memory = measure(lambda: convert_openapi_to_mcp_tools(schema))
+
+    start = time.perf_counter()
+    FastApiMCP(app)
+    setup_seconds = time.perf_counter() - start
+
+    return {
+        "tools": len(tools),
+        "openapi_seconds": openapi_seconds,
+        "convert_seconds": convert_seconds,
+        "convert_peak_memory_bytes": convert_memory["peak_memory_bytes"],
+        "setup_seconds": setup_seconds,
+    }
+
+
+def retained(func: Callable[[], Any]) -> Tuple[Any, int]:
+    """
+    Call a function, and measure the memory still allocated once it returns, which its result retains.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current
+
+
+def bench_memory(routes: int, depth: int) -> Dict[str, Any]:
+    app = make_synthetic_app(routes, depth=depth)
+    schema = get_openapi(title=app.title, version=app.version, routes=app.routes)
+
+    (tools, operation_map), converted_bytes = retained(lambda: convert_openapi_to_mcp_tools(schema))
+    del tools
+    _, operation_map_bytes = retained(lambda: convert_openapi_to_mcp_tools(schema)[1])
+    del operation_map
+
+    mcp, server_bytes = retained(lambda: FastApiMCP(app))
+    tool_count = len(mcp.tools)
+    del mcp
+    shared_mcp, shared_server_bytes = retained(lambda: FastApiMCP(app, share_schemas=True))
+    del shared_mcp
+
+    # Timed without tracemalloc, which slows down allocations a lot
+    start = time.perf_counter()
+    FastApiMCP(app)
+    setup_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    FastApiMCP(app, share_schemas=True)
+    shared_setup_seconds = time.perf_counter() - start
+
+    return {
+        "tools": tool_count,
+        "converted_bytes": converted_bytes,
+        "operation_map_bytes": operation_map_bytes,
+        "server_bytes": server_bytes,
+        "shared_server_bytes": shared_server_bytes,
+        "setup_seconds": setup_seconds,
+        "shared_setup_seconds": shared_setup_seconds,
+    }
+
+
+async def bench_tools_list(mcp: FastApiMCP, iterations: int) -> Dict[str, Any]:
+    samples: List[float] = []
+    async with create_connected_server_and_client_session(mcp.server) as session:
+        await session.list_tools()
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await session.list_tools()
+            samples.append(time.perf_counter() - start)
+    return {"latency": summarize(samples)}
+
+
+async def bench_tool_calls(mcp: FastApiMCP, calls: int, concurrency: int) -> Dict[str, Any]:
+    tool_name = mcp.tools[0].name
+    samples: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await mcp._execute_api_tool(
+                client=mcp._http_client,
+                tool_name=tool_name,
+                arguments={"item_id": i, "limit": 5},
+                operation_map=mcp.operation_map,
+            )
+            samples.append(time.perf_counter() - start)
+
+    await call(0)
+    samples.clear()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call(i) for i in range(calls)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "tool": tool_name,
+        "concurrency": concurrency,
+        "calls_per_second": calls / elapsed,
+        "latency": summarize(samples),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def bench_sse_roundtrip(mcp: FastApiMCP, iterations: int) -> Dict[str, Any]:
+    mcp.mount()
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(mcp.fastapi, host="127.0.0.1", port=port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    tool_name = mcp.tools[0].name
+
+    try:
+        while not server.started:
+            await asyncio.sleep(0.01)
+
+        connect_start = time.perf_counter()
+        async with sse_client(f"http://127.0.0.1:{port}/mcp") as streams:
+            async with ClientSession(*streams) as session:
+                await session.initialize()
+                connect_seconds = time.perf_counter() - connect_start
+
+                samples: List[float] = []
+                for i in range(iterations + 1):
+                    start = time.perf_counter()
+                    await session.call_tool(tool_name, {"item_id": i})
+                    samples.append(time.perf_counter() - start)
+    finally:
+        # The server-side SSE handler doesn't notice the client disconnecting, so uvicorn would wait for it
+        # forever. Its cancellation on exit is expected, so it is not logged.
+        logging.getLogger("uvicorn.error").setLevel(logging.CRITICAL)
+        server.should_exit = True
+        server.force_exit = True
+        await server_task
+
+        leftovers = asyncio.all_tasks() - {asyncio.current_task()}
+        for task in leftovers:
+            task.cancel()
+        await asyncio.gather(*leftovers, return_exceptions=True)
+
+    return {"tool": tool_name, "connect_seconds": connect_seconds, "latency": summarize(samples[1:])}
+
+
+async def bench_load(mcp: FastApiMCP, sessions: int, calls: int) -> Dict[str, Any]:
+    # Reads of the first resources, weighted equally
+    tool_mix = [
+        ToolCallSpec(name=tool.name, arguments={"item_id": 1})
+        for tool in mcp.tools[:10]
+        if tool.name.startswith("get_")
+    ]
+    result = await run_load(mcp, tool_mix, sessions=sessions, calls_per_session=max(1, calls // sessions), seed=0)
+    return {
+        "sessions": result.sessions,
+        "calls": result.calls,
+        "errors": result.errors,
+        "calls_per_second": result.calls_per_second,
+        "latency": result.overall.model_dump(),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+
+    def record(benchmark: str, routes: int, result: Dict[str, Any]) -> None:
+        results.append({"benchmark": benchmark, "routes": routes, "depth": args.depth, **result})
+        print(f"{benchmark} ({routes} routes): {json.dumps(result)}", file=sys.stderr)
+
+    for routes in args.routes:
+        if "conversion" in args.only:
+            record("conversion", routes, bench_conversion(routes, args.depth))
+        if "memory" in args.only:
+            record("memory", routes, bench_memory(routes, args.depth))
+
+        if not set(args.only) & {"tools_list", "tool_calls", "sse_roundtrip", "load"}:
+            continue
+
+        app = make_synthetic_app(routes, depth=args.depth)
+        mcp = FastApiMCP(app)
+
+        if "tools_list" in args.only:
+            record("tools_list", routes, await bench_tools_list(mcp, args.iterations))
+        if "tool_calls" in args.only:
+            record("tool_calls", routes, await bench_tool_calls(mcp, args.calls, args.concurrency))
+        if "load" in args.only:
+            record("load", routes, await bench_load(mcp, args.concurrency, args.calls))
+        if "sse_roundtrip" in args.only:
+            record("sse_roundtrip", routes, await bench_sse_roundtrip(mcp, args.iterations))
+
+    return {"environment": environment(), "results": results}
+
+
+def environment() -> Dict[str, Any]:
+    def package_version(name: str) -> str:
+        try:
+            return version(name)
+        except PackageNotFoundError:
+            return "unknown"
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "packages": {name: package_version(name) for name in ["fastapi-mcp", "mcp", "fastapi", "pydantic", "httpx"]},
+    }
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    def int_list(value: str) -> List[int]:
+        return [int(item) for item in value.split(",")]
+
+    def benchmark_list(value: str) -> List[str]:
+        names = value.split(",")
+        unknown = set(names) - set(BENCHMARKS)
+        if unknown:
+            raise argparse.ArgumentTypeError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+        return names
+
+    parser = argparse.ArgumentParser(description="Run the FastAPI-MCP benchmarks")
+    parser.add_argument("--routes", type=int_list, default=DEFAULT_ROUTES, help="Comma-separated app sizes")
+    parser.add_argument("--depth", type=int, default=3, help="Nesting depth of the models of the synthetic apps")
+    parser.add_argument("--only", type=benchmark_list, default=BENCHMARKS, help="Comma-separated benchmarks to run")
+    parser.add_argument("--iterations", type=int, default=200, help="Requests per latency benchmark")
+    parser.add_argument("--calls", type=int, default=2000, help="Tool calls of the throughput benchmark")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent tool calls of the throughput benchmark")
+    parser.add_argument("--output", help="File to write the JSON results to, instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
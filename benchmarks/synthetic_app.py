@@ -0,0 +1,86 @@
+"""
+Synthetic FastAPI apps of arbitrary size, used by the benchmarks.
+"""
+
+from typing import Any, Dict, List, Optional, Type
+
+from fastapi import FastAPI, Query
+from pydantic import BaseModel, create_model
+
+
+def make_deep_model(name: str, depth: int, fields: int = 4) -> Type[BaseModel]:
+    """
+    Create a model nested `depth` levels deep. Every level has a few scalar fields, a list and a child model.
+
+    All fields have defaults, so `Model()` is valid at every level.
+    """
+    child: Optional[Type[BaseModel]] = None
+    for level in reversed(range(depth)):
+        definitions: Dict[str, Any] = {}
+        for i in range(fields):
+            definitions[f"field_{i}"] = (Optional[str] if i % 2 else Optional[int], None)
+        definitions["tags"] = (List[str], [])
+        if child is not None:
+            definitions["child"] = (Optional[child], None)
+        child = create_model(f"{name}Level{level}", **definitions)
+
+    assert child is not None
+    return child
+
+
+def make_synthetic_app(routes: int, depth: int = 3, models: Optional[int] = None) -> FastAPI:
+    """
+    Create an app with `routes` routes, alternating between:
+    - `GET /resources{i}/{item_id}`, with path and query parameters, returning a deep model
+    - `POST /resources{i}`, taking and returning a deep model
+
+    `models` distinct deep models are shared by the routes, one for every 10 routes by default.
+    """
+    app = FastAPI(title=f"Synthetic app with {routes} routes")
+    model_count = models or max(1, routes // 10)
+    model_classes = [make_deep_model(f"Model{i}", depth) for i in range(model_count)]
+
+    for i in range(routes):
+        model = model_classes[i % model_count]
+        resource = f"resources{i // 2}"
+
+        if i % 2 == 0:
+            app.add_api_route(
+                f"/{resource}/{{item_id}}",
+                _make_get_endpoint(model),
+                methods=["GET"],
+                response_model=model,
+                operation_id=f"get_{resource}",
+                summary=f"Get an item of {resource}",
+                tags=[f"group{i % 20}"],
+            )
+        else:
+            app.add_api_route(
+                f"/{resource}",
+                _make_post_endpoint(model),
+                methods=["POST"],
+                response_model=model,
+                operation_id=f"create_{resource}",
+                summary=f"Create an item of {resource}",
+                tags=[f"group{i % 20}"],
+            )
+
+    return app
+
+
+def _make_get_endpoint(model: Type[BaseModel]):
+    async def get_item(
+        item_id: int,
+        limit: int = Query(10, description="Maximum number of results"),
+        q: Optional[str] = Query(None, description="Search query"),
+    ):
+        return model()
+
+    return get_item
+
+
+def _make_post_endpoint(model: Type[BaseModel]):
+    async def create_item(item: model):  # type: ignore[valid-type]
+        return item
+
+    return create_item
@@ -1,17 +1,21 @@
-import requests
-import subprocess
+import asyncio
 import os
-from typing import Dict, Any, Optional
-import time
+import subprocess
 import sys
-import sseclient
-import requests
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+import httpx
+
+from fastapi_mcp.discovery import discover_server, discover_servers
 
 
 def start_mcp_server(server_setting: Dict[str, Any], cwd: Optional[str] = None, port: int = 8000) -> subprocess.Popen:
     """
     通用函数：根据mcp server配置参数（如command/args/env），用subprocess启动node类mcp server。
     自动判断平台，win用cmd /c npx ...，非win用npx ...。
+    进程输出由后台线程实时打印，函数本身立即返回。
     :param server_setting: 形如 {"command":..., "args":..., "env":...}
     :param cwd: 工作目录（可选）
     :return: Popen对象
@@ -30,24 +34,43 @@ def start_mcp_server(server_setting: Dict[str, Any], cwd: Optional[str] = None,
         env=env,
         cwd=cwd,
         stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
         shell=False,
         encoding="utf-8"
     )
-    # 实时打印 MCP server 的 stdout/stderr
-    for line in iter(proc.stdout.readline, ""):
-        print(line.strip())
+
+    # 实时打印 MCP server 的 stdout/stderr，不阻塞调用方
+    def print_output():
+        assert proc.stdout is not None
+        for line in iter(proc.stdout.readline, ""):
+            print(line.strip())
+
+    threading.Thread(target=print_output, daemon=True).start()
     return proc
 
-def get_mcp_tools_count_from_openapi(mcp_url: str) -> int:
+
+async def wait_for_port(host: str, port: int, timeout: float = 30.0) -> None:
+    """等待端口可以连接，代替固定的 sleep"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise TimeoutError(f"{host}:{port} 在 {timeout} 秒内未就绪")
+
+
+async def get_mcp_tools_count_from_openapi(mcp_url: str, timeout: float = 5.0) -> int:
     # 兼容 server 末尾是否有斜杠
     url = mcp_url.rstrip("/") + "/openapi.json"
     try:
-        resp = requests.get(url, timeout=5)
-        print("openapi.json 返回：", resp.text)
-        resp.raise_for_status()
-        data = resp.json()
-    except requests.RequestException as e:
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            resp = await client.get(url)
+            resp.raise_for_status()
+            data = resp.json()
+    except httpx.HTTPError as e:
         raise ValueError(f"Failed to get MCP openapi.json: {e}")
     # 优先 windsuf/mcp 扩展字段
     if "x-windsurf-tools" in data:
@@ -57,20 +80,21 @@ def get_mcp_tools_count_from_openapi(mcp_url: str) -> int:
     else:
         raise ValueError("Unrecognized MCP openapi.json format")
 
-def get_mcp_tools_count(mcp_url: str) -> int:
+
+async def get_mcp_tools_count(mcp_url: str, timeout: float = 5.0) -> int:
     """
-    获取 MCP Server 上注册的工具数量
+    通过 HTTP 的 tools 接口获取 MCP Server 上注册的工具数量（fastapi_mcp 提供 {mount_path}/tools）
     :param mcp_url: MCP Server 根地址（如 http://127.0.0.1:8000/mcp）
     :return: 工具数量
     """
     # 兼容 server 末尾是否有斜杠
     url = mcp_url.rstrip("/") + "/tools"
     try:
-        resp = requests.get(url, timeout=5)
-        print("tools接口返回：", resp.text)  # 调试用
-        resp.raise_for_status()
-        data = resp.json()
-    except requests.RequestException as e:
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            resp = await client.get(url)
+            resp.raise_for_status()
+            data = resp.json()
+    except httpx.HTTPError as e:
         raise ValueError(f"Failed to get MCP tools count: {e}")
     if isinstance(data, dict) and "tools" in data:
         return len(data["tools"])
@@ -79,65 +103,35 @@ def get_mcp_tools_count(mcp_url: str) -> int:
     else:
         raise ValueError("Unrecognized MCP tools response format")
 
-import json
 
-def get_tools_from_sse(mcp_base_url: str, timeout: int = 15) -> int:
+async def get_tools_from_sse(mcp_sse_url: str, timeout: float = 15.0) -> int:
     """
-    连接 Playwright MCP SSE，监听工具定义事件，返回工具数量。
-    :param mcp_base_url: MCP server 基础地址，如 http://127.0.0.1:8000/mcp
+    通过 MCP 协议（SSE 传输，initialize + tools/list 握手）获取工具数量。
+    :param mcp_sse_url: MCP server 的 SSE 地址，如 http://127.0.0.1:8000/sse
     :param timeout: 最长等待秒数
     :return: 工具数量
     """
-    # 1. 获取 SSE endpoint
-    # 访问 /mcp，获取 data 字段，形如 /sse?sessionId=xxx
-    entry_resp = requests.get(mcp_base_url, timeout=5)
-    if entry_resp.status_code != 200:
-        raise RuntimeError(f"访问 {mcp_base_url} 失败: {entry_resp.status_code}")
-    # 解析 SSE endpoint
-    for line in entry_resp.text.splitlines():
-        if line.startswith("data:"):
-            sse_path = line.split("data:",1)[1].strip()
-            break
-    else:
-        raise RuntimeError("未找到 SSE endpoint")
-    # 拼接完整 SSE URL
-    if sse_path.startswith("/"):
-        base = mcp_base_url.split("/mcp")[0]
-        sse_url = base + sse_path
-    else:
-        sse_url = mcp_base_url.rstrip("/") + "/" + sse_path
-    print(f"连接 SSE: {sse_url}")
-    # 2. 监听 SSE 事件
-    resp = requests.get(sse_url, stream=True, timeout=timeout)
-    client = sseclient.SSEClient(resp)
-    start_time = time.time()
-    for event in client.events():
-        # 生产环境要注释掉
-        print(f"event: {event.event}\ndata: {event.data}")
-        try:
-            data = json.loads(event.data)
-        except Exception:
-            continue
-        # Playwright MCP 的工具定义通常在 tool/tool_list/tools 字段
-        # 兼容多种可能格式
-        if isinstance(data, dict):
-            if "tools" in data and isinstance(data["tools"], list):
-                print(f"收到 tools 事件: {data['tools']}")
-                return len(data["tools"])
-            elif "tool_list" in data and isinstance(data["tool_list"], list):
-                print(f"收到 tool_list 事件: {data['tool_list']}")
-                return len(data["tool_list"])
-            elif "tool" in data:
-                # 单个工具事件，累加
-                print(f"收到 tool 事件: {data['tool']}")
-                return 1
-        # 超时保护
-        if time.time() - start_time > timeout:
-            raise TimeoutError("等待工具事件超时")
-    raise RuntimeError("未收到工具定义事件")
+    result = await discover_server(mcp_sse_url, timeout=timeout)
+    if not result.ok:
+        raise RuntimeError(f"获取 {mcp_sse_url} 的工具失败: {result.error}")
+    return len(result.tools)
 
 
-if __name__ == "__main__":
+async def count_tools_of_servers(urls: List[str], timeout: float = 15.0) -> Dict[str, int]:
+    """
+    并发探测多个 MCP server，结果一到就打印，单个 server 超时不影响其他 server。
+    """
+    counts: Dict[str, int] = {}
+    async for result in discover_servers(urls, timeout=timeout):
+        if result.ok:
+            counts[result.url] = len(result.tools)
+            print(f"{result.url} ({result.server_name}): {len(result.tools)} 个工具，耗时 {result.elapsed:.2f}s")
+        else:
+            print(f"{result.url}: 失败 {result.error}，耗时 {result.elapsed:.2f}s")
+    return counts
+
+
+async def main():
     mcpserver_setting = {
         "playwright": {
             "command": "cmd",
@@ -153,9 +147,15 @@ if __name__ == "__main__":
     }
     mcp_port = 8000
     proc = start_mcp_server(mcpserver_setting, port=mcp_port)   # 启动 MCP 进程
-    time.sleep(5)   # 等待 MCP 进程启动
-    print(f"MCP Server 启动成功，地址：http://127.0.0.1:{mcp_port}/mcp")
-    count = get_tools_from_sse(f"http://127.0.0.1:{mcp_port}/mcp")
-    print(f"MCP 工具数量: {count}")
-    proc.terminate()    # 终止 MCP 进程
-    proc.wait()   # 等待 MCP 进程结束
+    try:
+        await wait_for_port("127.0.0.1", mcp_port)   # 等待 MCP 进程就绪
+        print(f"MCP Server 启动成功，地址：http://127.0.0.1:{mcp_port}/sse")
+        counts = await count_tools_of_servers([f"http://127.0.0.1:{mcp_port}/sse"])
+        print(f"MCP 工具数量: {counts}")
+    finally:
+        proc.terminate()    # 终止 MCP 进程
+        proc.wait()   # 等待 MCP 进程结束
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,6 +4,9 @@ FastAPI-MCP: Automatic MCP server generator for FastAPI applications.
 Created by Tadata Inc. (https://github.com/tadata-org)
 """
 
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 try:
     from importlib.metadata import version
 
@@ -12,12 +15,44 @@ except Exception:  # pragma: no cover
     # Fallback for local development
     __version__ = "0.0.0.dev0"  # pragma: no cover
 
-from .server import FastApiMCP
-from .types import AuthConfig, OAuthMetadata
+if TYPE_CHECKING:  # pragma: no cover
+    from .server import FastApiMCP
+    from .federation import FederatedMCP, MCPSource
+    from .types import AuthConfig, OAuthMetadata, ToolView
+
+
+# The public names, and the modules they are imported from on first use. Importing the server pulls in
+# httpx and the MCP server stack, which processes that only need e.g. `AuthConfig` shouldn't pay for.
+_LAZY_ATTRIBUTES = {
+    "FastApiMCP": ".server",
+    "FederatedMCP": ".federation",
+    "MCPSource": ".federation",
+    "AuthConfig": ".types",
+    "OAuthMetadata": ".types",
+    "ToolView": ".types",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    # Cache it, so `__getattr__` is only called once per name
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES])
 
 
 __all__ = [
     "FastApiMCP",
+    "FederatedMCP",
+    "MCPSource",
     "AuthConfig",
     "OAuthMetadata",
+    "ToolView",
 ]
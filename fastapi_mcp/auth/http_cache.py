@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+
+
+logger = logging.getLogger(__name__)
+
+
+_shared_client: Optional[httpx.AsyncClient] = None
+_shared_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """
+    Get the HTTP client shared by the auth helpers, so requests to the OAuth provider reuse pooled
+    connections instead of doing a new TLS handshake every time.
+
+    Pooled connections are bound to the event loop they were opened in, so a new client is created if
+    the event loop changed (e.g. between tests).
+    """
+    global _shared_client, _shared_client_loop
+
+    try:
+        loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if _shared_client is None or _shared_client.is_closed or _shared_client_loop is not loop:
+        if _shared_client is not None and not _shared_client.is_closed:
+            _close_client(_shared_client, _shared_client_loop)
+        _shared_client = httpx.AsyncClient(timeout=10.0, follow_redirects=True)
+        _shared_client_loop = loop
+
+    return _shared_client
+
+
+def _close_client(client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    """
+    Close a replaced shared client, in the event loop its connections were opened in.
+    """
+    if loop is None or loop.is_closed():
+        # Its connections can't be closed cleanly anymore, and are released with the client
+        return
+    try:
+        loop.call_soon_threadsafe(lambda: loop.create_task(client.aclose()))
+    except RuntimeError:
+        # The loop was closed meanwhile
+        pass
+
+
+def parse_cache_control(header: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Parse a `Cache-Control` header into its directives, e.g. `{"max-age": "300", "no-cache": None}`.
+    """
+    directives: Dict[str, Optional[str]] = {}
+    if not header:
+        return directives
+
+    for part in header.split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') if value else None
+    return directives
+
+
+def _seconds(value: Optional[str]) -> Optional[float]:
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+class CachedJSONDocument:
+    """
+    An in-memory cache of a JSON document fetched over HTTP, honoring the `Cache-Control` header of the
+    response.
+
+    - Fresh documents are served from memory.
+    - Stale documents are still served during the `stale-while-revalidate` window, while being refreshed
+      in the background.
+    - Concurrent requests for a missing or expired document share a single fetch.
+    - If refreshing fails, the last document is served until the stale window ends, and the refresh is
+      only retried after `retry_after` seconds, so an outage of the server doesn't cause a fetch per request.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        http_client: Optional[httpx.AsyncClient] = None,
+        default_ttl: float = 300.0,
+        default_stale_while_revalidate: float = 3600.0,
+        retry_after: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.url = url
+        self.default_ttl = default_ttl
+        self.default_stale_while_revalidate = default_stale_while_revalidate
+        self.retry_after = retry_after
+
+        self._http_client = http_client
+        self._clock = clock
+        self._document: Optional[Any] = None
+        self._fresh_until = 0.0
+        self._stale_until = 0.0
+        self._refreshing: Optional[asyncio.Task] = None
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        return self._http_client or get_shared_http_client()
+
+    async def get(self) -> Any:
+        """
+        Get the document, fetching it only if there is no usable cached version.
+        """
+        now = self._clock()
+        if self._document is not None:
+            if now < self._fresh_until:
+                return self._document
+            if now < self._stale_until:
+                self._start_refresh()
+                return self._document
+
+        return await asyncio.shield(self._start_refresh())
+
+    async def refresh(self) -> Any:
+        """
+        Fetch the document again, even if the cached version is fresh.
+        """
+        self._fresh_until = 0.0
+        return await asyncio.shield(self._start_refresh())
+
+    def _start_refresh(self) -> "asyncio.Task[Any]":
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.create_task(self._fetch())
+            # Background refreshes are never awaited, so their errors are consumed here
+            self._refreshing.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return self._refreshing
+
+    async def _fetch(self) -> Any:
+        try:
+            response = await self.http_client.get(self.url)
+            response.raise_for_status()
+            document = response.json()
+        except Exception as e:
+            now = self._clock()
+            if self._document is not None and now < self._stale_until:
+                logger.warning(f"Failed to refresh {self.url}, serving the cached version: {e}")
+                # Serve the cached version as fresh for a while, instead of fetching again on every request
+                self._fresh_until = min(now + self.retry_after, self._stale_until)
+                return self._document
+            logger.error(f"Failed to fetch {self.url}: {e}")
+            raise
+
+        ttl, stale_while_revalidate = self._lifetimes(response)
+        now = self._clock()
+        self._document = document
+        self._fresh_until = now + ttl
+        self._stale_until = now + ttl + stale_while_revalidate
+        return document
+
+    def _lifetimes(self, response: httpx.Response) -> Tuple[float, float]:
+        directives = parse_cache_control(response.headers.get("cache-control"))
+
+        # The document must not be reused without asking the server again
+        if "no-store" in directives or "no-cache" in directives:
+            return 0.0, 0.0
+
+        ttl = _seconds(directives.get("s-maxage"))
+        if ttl is None:
+            ttl = _seconds(directives.get("max-age"))
+        if ttl is None:
+            ttl = self.default_ttl
+
+        # The document may already have spent some time in a shared cache
+        ttl = max(0.0, ttl - (_seconds(response.headers.get("age")) or 0.0))
+
+        stale_while_revalidate = _seconds(directives.get("stale-while-revalidate"))
+        if stale_while_revalidate is None:
+            stale_while_revalidate = self.default_stale_while_revalidate
+
+        return ttl, stale_while_revalidate
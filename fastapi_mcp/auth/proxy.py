@@ -6,6 +6,7 @@ from typing import Optional
 import logging
 from urllib.parse import urlencode
 
+from fastapi_mcp.auth.http_cache import CachedJSONDocument
 from fastapi_mcp.types import (
     ClientRegistrationRequest,
     ClientRegistrationResponse,
@@ -85,11 +86,46 @@ def setup_oauth_metadata_proxy(
         ),
     ] = None,
     include_in_schema: Annotated[bool, Doc("Whether to include the metadata endpoint in your OpenAPI docs")] = False,
+    http_client: Annotated[
+        Optional[httpx.AsyncClient],
+        Doc(
+            """
+            Optional HTTP client to fetch the metadata with. Defaults to a client shared by the auth helpers.
+            """
+        ),
+    ] = None,
+    cache_ttl: Annotated[
+        float,
+        Doc(
+            """
+            How long in seconds to cache the metadata for, if your OAuth provider's response has no
+            `Cache-Control` max-age.
+            """
+        ),
+    ] = 300.0,
+    cache_stale_while_revalidate: Annotated[
+        float,
+        Doc(
+            """
+            How long in seconds expired metadata can still be served while it is refreshed in the background,
+            if your OAuth provider's response has no `stale-while-revalidate` directive.
+            """
+        ),
+    ] = 3600.0,
 ):
     """
     Proxy for your OAuth provider's Metadata endpoint, just adding our (fake) registration endpoint.
+
+    The metadata is cached in memory, honoring the `Cache-Control` header of your OAuth provider's response.
     """
 
+    metadata_cache = CachedJSONDocument(
+        metadata_url,
+        http_client=http_client,
+        default_ttl=cache_ttl,
+        default_stale_while_revalidate=cache_stale_while_revalidate,
+    )
+
     @app.get(
         path,
         response_model=OAuthMetadata,
@@ -101,19 +137,14 @@ def setup_oauth_metadata_proxy(
     async def oauth_metadata_proxy(request: Request):
         base_url = str(request.base_url).rstrip("/")
 
-        # Fetch your OAuth provider's OpenID Connect metadata
-        async with httpx.AsyncClient() as client:
-            response = await client.get(metadata_url)
-            if response.status_code != 200:
-                logger.error(
-                    f"Failed to fetch OAuth metadata from {metadata_url}: {response.status_code}. Response: {response.text}"
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail="Failed to fetch OAuth metadata",
-                )
-
-            oauth_metadata = response.json()
+        # Get your OAuth provider's OpenID Connect metadata, from the cache if possible
+        try:
+            oauth_metadata = dict(await metadata_cache.get())
+        except Exception:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Failed to fetch OAuth metadata",
+            )
 
         # Override the registration endpoint if provided
         if register_path:
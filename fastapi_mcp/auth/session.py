@@ -0,0 +1,128 @@
+import hashlib
+import hmac
+import inspect
+import json
+import time
+from typing import Awaitable, Callable, Optional, Sequence, Union
+
+from fastapi import HTTPException, Request, status
+
+from fastapi_mcp.types import SessionPrincipal
+
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CREDENTIAL_HEADERS = ("authorization", "cookie")
+
+
+def credentials_fingerprint(request: Request, headers: Sequence[str] = DEFAULT_CREDENTIAL_HEADERS) -> Optional[str]:
+    """
+    A hash of the credentials of a request, i.e. of the values of the given headers, to check that messages
+    posted to a session come from the client that established it, without keeping the credentials themselves
+    in memory.
+
+    `None` if the request carries none of the headers.
+    """
+    values = [[name.lower(), request.headers.get(name)] for name in headers]
+    if all(value is None for _, value in values):
+        return None
+    return hashlib.sha256(json.dumps(values).encode()).hexdigest()
+
+
+class SessionAuthenticator:
+    """
+    Binds the authenticated principal of an SSE connection request to its session, and checks the messages
+    posted to the session against it, instead of running the full auth dependencies on every message.
+
+    Messages must carry the same `credential_headers` as the connection request. Connection requests carrying
+    none of them are refused, since any client knowing the session ID could then post to the session.
+    """
+
+    def __init__(
+        self,
+        max_age: Optional[float] = None,
+        is_revoked: Optional[Callable[[SessionPrincipal], Union[bool, Awaitable[bool]]]] = None,
+        clock: Callable[[], float] = time.time,
+        credential_headers: Sequence[str] = DEFAULT_CREDENTIAL_HEADERS,
+    ):
+        self.max_age = max_age
+        self.is_revoked = is_revoked
+        self.credential_headers = tuple(credential_headers)
+        self._clock = clock
+
+    def bind(self, request: Request) -> SessionPrincipal:
+        """
+        Create the principal of a session from its connection request, after the auth dependencies ran.
+
+        Raises:
+            HTTPException: 401 if the request carries none of the credential headers
+        """
+        fingerprint = credentials_fingerprint(request, self.credential_headers)
+        if fingerprint is None:
+            logger.warning(
+                "Refused a session without credentials to bind it to, expected one of the headers: "
+                f"{', '.join(self.credential_headers)}"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Session authentication requires credentials in one of the headers: "
+                f"{', '.join(self.credential_headers)}",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        now = self._clock()
+        claims = getattr(request.state, "auth_claims", None) or {}
+
+        expires_at: Optional[float] = None
+        if self.max_age is not None:
+            expires_at = now + self.max_age
+        if isinstance(claims.get("exp"), (int, float)):
+            expires_at = min(expires_at, claims["exp"]) if expires_at is not None else claims["exp"]
+
+        return SessionPrincipal(
+            claims=claims,
+            credentials_fingerprint=fingerprint,
+            authenticated_at=now,
+            expires_at=expires_at,
+        )
+
+    async def check(self, principal: Optional[SessionPrincipal], request: Request) -> None:
+        """
+        Check a message posted to a session.
+
+        Raises:
+            HTTPException: 401 if the session is not authenticated, expired or revoked, 403 if the message was
+                sent with other credentials than the session was established with.
+        """
+        if principal is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Session is not authenticated",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        fingerprint = credentials_fingerprint(request, self.credential_headers)
+        if fingerprint is None or not hmac.compare_digest(principal.credentials_fingerprint, fingerprint):
+            logger.warning("Rejected a message sent with other credentials than its session")
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Session belongs to other credentials")
+
+        if principal.expires_at is not None and self._clock() >= principal.expires_at:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Session expired",
+                headers={"WWW-Authenticate": 'Bearer error="invalid_token"'},
+            )
+
+        if self.is_revoked is not None:
+            revoked = self.is_revoked(principal)
+            if inspect.isawaitable(revoked):
+                revoked = await revoked
+            if revoked:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Session revoked",
+                    headers={"WWW-Authenticate": 'Bearer error="invalid_token"'},
+                )
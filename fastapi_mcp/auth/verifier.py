@@ -0,0 +1,208 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
+from typing_extensions import Annotated, Doc
+
+import httpx
+from fastapi import HTTPException, Request, status
+
+from fastapi_mcp.auth.http_cache import CachedJSONDocument
+
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class TokenVerificationError(Exception):
+    """
+    Raised when a bearer token is invalid.
+    """
+
+
+def _import_jwt() -> Any:
+    try:
+        import jwt
+    except ImportError as e:  # pragma: no cover
+        raise ImportError(
+            "JWTVerifier requires PyJWT with the cryptography backend, from the 'jwt' extra of fastapi-mcp. "
+            "Install it with: pip install 'fastapi-mcp[jwt]'"
+        ) from e
+    return jwt
+
+
+class JWTVerifier:
+    """
+    Verify JWT bearer tokens locally, using the signing keys published by the issuer in its JWKS.
+
+    - The JWKS is fetched once, and cached according to its `Cache-Control` header.
+    - A token signed with a key that is not in the cached JWKS (e.g. after a key rotation) triggers a refresh
+      of the JWKS, at most once every `jwks_min_refresh_interval` seconds.
+    - The claims of valid tokens are cached until the tokens expire, so verifying the same token again only
+      costs a dictionary lookup.
+
+    Can be used directly as a FastAPI dependency, or through `AuthConfig(token_verifier=...)`. The claims of
+    the verified token are stored in `request.state.auth_claims`.
+    """
+
+    def __init__(
+        self,
+        jwks_url: Annotated[
+            str, Doc("The URL of the issuer's JWKS, e.g. `https://tenant.auth0.com/.well-known/jwks.json`")
+        ],
+        issuer: Annotated[Optional[str], Doc("The expected `iss` claim. Not checked if not provided.")] = None,
+        audience: Annotated[
+            Optional[Union[str, Sequence[str]]], Doc("The expected `aud` claim. Not checked if not provided.")
+        ] = None,
+        algorithms: Annotated[Sequence[str], Doc("The accepted signing algorithms")] = ("RS256",),
+        leeway: Annotated[float, Doc("Leeway in seconds when checking the expiration and not-before claims")] = 0.0,
+        max_cached_tokens: Annotated[int, Doc("Maximum number of verified tokens to keep the claims of")] = 10_000,
+        max_cache_ttl: Annotated[
+            float, Doc("Maximum time in seconds to cache the claims of a token, even if it expires later")
+        ] = 3600.0,
+        jwks_min_refresh_interval: Annotated[
+            float, Doc("Minimum time in seconds between refreshes of the JWKS caused by unknown keys")
+        ] = 60.0,
+        http_client: Annotated[
+            Optional[httpx.AsyncClient],
+            Doc("Optional HTTP client to fetch the JWKS with. Defaults to a client shared by the auth helpers."),
+        ] = None,
+        clock: Annotated[Callable[[], float], Doc("Returns the current UNIX time. Useful for tests.")] = time.time,
+    ):
+        self.issuer = issuer
+        self.audience = audience
+        self.algorithms = [algorithms] if isinstance(algorithms, str) else list(algorithms)
+        self.leeway = leeway
+        self.max_cached_tokens = max_cached_tokens
+        self.max_cache_ttl = max_cache_ttl
+        self.jwks_min_refresh_interval = jwks_min_refresh_interval
+
+        self._clock = clock
+        self._jwks = CachedJSONDocument(jwks_url, http_client=http_client, default_ttl=3600.0)
+        self._jwks_document: Optional[Any] = None
+        self._keys: Dict[Optional[str], Any] = {}
+        self._last_forced_refresh = float("-inf")
+
+        # token -> (claims, cache expiration time), in least recently used order
+        self._claims_cache: OrderedDict[str, Tuple[Dict[str, Any], float]] = OrderedDict()
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a token, and get its claims.
+
+        Raises:
+            TokenVerificationError: If the token is invalid
+        """
+        now = self._clock()
+
+        cached = self._claims_cache.get(token)
+        if cached is not None:
+            claims, cached_until = cached
+            if now < cached_until:
+                self._claims_cache.move_to_end(token)
+                return claims
+            del self._claims_cache[token]
+
+        jwt = _import_jwt()
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError as e:
+            raise TokenVerificationError(f"Invalid token: {e}") from e
+
+        key = await self._get_signing_key(header.get("kid"))
+
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=self.algorithms,
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=self.leeway,
+                options={"verify_aud": self.audience is not None, "verify_iss": self.issuer is not None},
+            )
+        except jwt.PyJWTError as e:
+            raise TokenVerificationError(f"Invalid token: {e}") from e
+
+        cached_until = now + self.max_cache_ttl
+        if "exp" in claims:
+            cached_until = min(cached_until, float(claims["exp"]) + self.leeway)
+        self._claims_cache[token] = (claims, cached_until)
+        if len(self._claims_cache) > self.max_cached_tokens:
+            self._claims_cache.popitem(last=False)
+
+        return claims
+
+    def invalidate(self, token: str) -> None:
+        """
+        Forget the cached claims of a token, e.g. after it was revoked.
+        """
+        self._claims_cache.pop(token, None)
+
+    async def __call__(self, request: Request) -> Dict[str, Any]:
+        authorization = request.headers.get("authorization", "")
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Missing bearer token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        try:
+            claims = await self.verify(token.strip())
+        except TokenVerificationError as e:
+            logger.debug(f"Rejected token: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token",
+                headers={"WWW-Authenticate": 'Bearer error="invalid_token"'},
+            )
+
+        request.state.auth_claims = claims
+        return claims
+
+    async def _get_signing_key(self, kid: Optional[str]) -> Any:
+        keys = await self._get_keys(force_refresh=False)
+        key = self._find_key(keys, kid)
+
+        # The issuer may have rotated its keys since the JWKS was cached. Refreshing is rate limited, so
+        # tokens with made-up key IDs can't be used to flood the issuer with requests.
+        if key is None and self._clock() - self._last_forced_refresh >= self.jwks_min_refresh_interval:
+            self._last_forced_refresh = self._clock()
+            keys = await self._get_keys(force_refresh=True)
+            key = self._find_key(keys, kid)
+
+        if key is None:
+            raise TokenVerificationError(f"Unknown signing key: {kid}")
+        return key
+
+    @staticmethod
+    def _find_key(keys: Dict[Optional[str], Any], kid: Optional[str]) -> Any:
+        if kid is None and len(keys) == 1:
+            return next(iter(keys.values()))
+        return keys.get(kid)
+
+    async def _get_keys(self, force_refresh: bool) -> Dict[Optional[str], Any]:
+        try:
+            document = await (self._jwks.refresh() if force_refresh else self._jwks.get())
+        except Exception as e:
+            raise TokenVerificationError(f"Failed to fetch the JWKS: {e}") from e
+
+        # Keys are only parsed again when the JWKS changed
+        if document is not self._jwks_document:
+            self._keys = self._parse_keys(document)
+            self._jwks_document = document
+        return self._keys
+
+    def _parse_keys(self, document: Any) -> Dict[Optional[str], Any]:
+        jwt = _import_jwt()
+        keys: Dict[Optional[str], Any] = {}
+        for jwk in document.get("keys", []) if isinstance(document, dict) else []:
+            if jwk.get("use", "sig") != "sig":
+                continue
+            try:
+                keys[jwk.get("kid")] = jwt.PyJWK(jwk).key
+            except jwt.PyJWTError as e:
+                logger.warning(f"Ignoring unusable key {jwk.get('kid')} in the JWKS: {e}")
+        return keys
@@ -0,0 +1,183 @@
+import asyncio
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import anyio
+
+import mcp.types as types
+
+from fastapi_mcp.openapi.index import OperationIndex
+from fastapi_mcp.openapi.operation import OperationRecord
+from fastapi_mcp.search import SEARCH_META_TOOLS, ToolSearchIndex
+from fastapi_mcp.types import ToolView
+from fastapi_mcp.utils.tool_list_cache import ToolListCache, tools_content_hash
+
+
+class ToolCatalog:
+    """
+    A snapshot of everything derived from converting a FastAPI app into MCP tools: the tools, the
+    operations they map to, the index of all the operations of the app, the optional tool search index,
+    and the cached `tools/list` responses.
+
+    A catalog is never modified after it is built. `FastApiMCP` swaps the whole catalog in a single
+    assignment, so request handlers never see tools and operations coming from two different conversions.
+    """
+
+    def __init__(
+        self,
+        tools: List[types.Tool],
+        operation_map: Dict[str, OperationRecord],
+        index: OperationIndex,
+        page_size: Optional[int] = None,
+        search_index: Optional[ToolSearchIndex] = None,
+        views: Optional[Dict[str, ToolView]] = None,
+        pooled_view: Optional[ToolView] = None,
+    ):
+        self.tools = tools
+        self.operation_map = operation_map
+        self.index = index
+        self.search_index = search_index
+        self.views = views or {}
+        # The operations whose calls are offloaded to the worker pool, if not all of them
+        self.pooled_operations = self._select_view_operations(pooled_view) if pooled_view is not None else None
+
+        # With tool search, clients only get the search meta-tools, and find the actual tools through them
+        self.listed_tools = SEARCH_META_TOOLS if search_index is not None else tools
+        self.tools_cache = ToolListCache(self.listed_tools, page_size=page_size)
+
+        self._page_size = page_size
+        self._view_catalogs: Dict[str, "ToolCatalog"] = {}
+        self._tools_hash: Optional[str] = None
+
+    @property
+    def content_hash(self) -> str:
+        """A hash of the listed tools, which are only the search meta-tools with tool search."""
+        return self.tools_cache.content_hash
+
+    @property
+    def tools_hash(self) -> str:
+        """A hash of all the tools, including the ones only reachable through tool search."""
+        if self._tools_hash is None:
+            if self.search_index is None:
+                self._tools_hash = self.content_hash
+            else:
+                self._tools_hash = tools_content_hash(self.tools)
+        return self._tools_hash
+
+    def view(self, name: str) -> "ToolCatalog":
+        """
+        Get the catalog of the tools in a view.
+
+        View catalogs reuse the tools already converted for this catalog, and are built on first use, then
+        cached for the lifetime of this catalog.
+        """
+        view_catalog = self._view_catalogs.get(name)
+        if view_catalog is not None:
+            return view_catalog
+
+        if name not in self.views:
+            raise KeyError(f"Unknown tool view: {name}")
+
+        selected = self._select_view_operations(self.views[name])
+        tools = [tool for tool in self.tools if tool.name in selected]
+        operation_map = {
+            tool_name: operation for tool_name, operation in self.operation_map.items() if tool_name in selected
+        }
+        search_index = ToolSearchIndex(tools, self.index) if self.search_index is not None else None
+
+        view_catalog = ToolCatalog(
+            tools, operation_map, self.index, page_size=self._page_size, search_index=search_index
+        )
+        self._view_catalogs[name] = view_catalog
+        return view_catalog
+
+    def _select_view_operations(self, view: ToolView) -> set[str]:
+        selected = self.index.select(
+            include_operations=view.include_operations,
+            exclude_operations=view.exclude_operations,
+            include_tags=view.include_tags,
+            exclude_tags=view.exclude_tags,
+        )
+        if selected is None:
+            selected = self.index.operation_ids
+
+        if view.methods is not None:
+            selected &= self.index.with_methods(view.methods)
+        if view.path_prefix is not None:
+            selected &= self.index.with_path_prefix(view.path_prefix)
+
+        return selected
+
+
+class CatalogBuild:
+    """
+    A build of a tool catalog, running in its own thread.
+
+    Async callers wait for it on an event, and sync callers on a thread event, so waiting for a long build
+    doesn't hold a thread of the anyio worker pool, which sync endpoints and dependencies of the app need.
+    """
+
+    def __init__(self, build: Callable[[], ToolCatalog], name: str = "fastapi_mcp_build"):
+        self._build = build
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, anyio.Event]] = []
+        self.catalog: Optional[ToolCatalog] = None
+        self.error: Optional[BaseException] = None
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def _run(self) -> None:
+        try:
+            self.catalog = self._build()
+        except BaseException as e:
+            self.error = e
+
+        with self._lock:
+            self._done.set()
+            waiters, self._waiters = self._waiters, []
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The loop of the waiter is closed, so nobody is waiting anymore
+                pass
+
+    async def wait(self) -> ToolCatalog:
+        """
+        Wait for the build to finish, without blocking the event loop or a worker thread.
+
+        Raises:
+            Exception: The error the build failed with
+        """
+        with self._lock:
+            if self._done.is_set():
+                return self._result()
+            event = anyio.Event()
+            self._waiters.append((asyncio.get_running_loop(), event))
+        await event.wait()
+        return self._result()
+
+    def wait_sync(self, timeout: Optional[float] = None) -> ToolCatalog:
+        """
+        Block until the build is finished.
+
+        Raises:
+            TimeoutError: If the build is still running after `timeout` seconds
+            Exception: The error the build failed with
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"The MCP tools are still being built after {timeout} seconds")
+        return self._result()
+
+    def _result(self) -> ToolCatalog:
+        if self.error is not None:
+            raise self.error
+        assert self.catalog is not None
+        return self.catalog
@@ -0,0 +1,194 @@
+import importlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import typer
+from fastapi import FastAPI
+from rich.console import Console
+from rich.table import Table
+from typing_extensions import Annotated
+
+from fastapi_mcp.manifest import ToolManifest
+
+
+app = typer.Typer(
+    name="fastapi-mcp",
+    help="Export and inspect the MCP tools of a FastAPI app.",
+    no_args_is_help=True,
+    add_completion=False,
+)
+
+console = Console()
+
+AppArgument = Annotated[str, typer.Argument(metavar="APP", help="The FastAPI app to convert, as 'module:attribute'.")]
+FactoryOption = Annotated[
+    bool, typer.Option("--factory", help="Treat the attribute as a function that creates the app, and call it.")
+]
+AppDirOption = Annotated[
+    Path, typer.Option("--app-dir", help="Directory to import the module from. Defaults to the current directory.")
+]
+DescribeAllResponsesOption = Annotated[
+    bool, typer.Option("--describe-all-responses", help="Include all possible response schemas in tool descriptions.")
+]
+DescribeFullResponseSchemaOption = Annotated[
+    bool, typer.Option("--describe-full-response-schema", help="Include full response schemas in tool descriptions.")
+]
+LimitOption = Annotated[Optional[int], typer.Option("--limit", "-n", help="Only show the first N tools.")]
+
+
+def import_app(app_path: str, factory: bool = False, app_dir: Optional[Path] = None) -> FastAPI:
+    """
+    Import a FastAPI app from a 'module:attribute' path.
+    """
+    module_name, _, attribute = app_path.partition(":")
+    if not module_name or not attribute:
+        raise typer.BadParameter(f"Expected 'module:attribute', got {app_path!r}", param_hint="APP")
+
+    sys.path.insert(0, os.fspath(app_dir or Path.cwd()))
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        raise typer.BadParameter(f"Could not import module {module_name!r}: {e}", param_hint="APP")
+    finally:
+        sys.path.pop(0)
+
+    try:
+        instance = getattr(module, attribute)
+    except AttributeError:
+        raise typer.BadParameter(f"Module {module_name!r} has no attribute {attribute!r}", param_hint="APP")
+
+    if factory:
+        instance = instance()
+    if not isinstance(instance, FastAPI):
+        raise typer.BadParameter(f"{app_path!r} is not a FastAPI app", param_hint="APP")
+    return instance
+
+
+def convert_app(
+    app_path: str,
+    factory: bool,
+    app_dir: Optional[Path],
+    describe_all_responses: bool = False,
+    describe_full_response_schema: bool = False,
+) -> Tuple[ToolManifest, Dict[str, float], float]:
+    """
+    Import and convert an app, returning the manifest, the conversion time of each operation, and the
+    total conversion time, including generating the OpenAPI schema.
+    """
+    fastapi_app = import_app(app_path, factory=factory, app_dir=app_dir)
+    timings: Dict[str, float] = {}
+    start = time.perf_counter()
+    manifest = ToolManifest.from_app(
+        fastapi_app,
+        describe_all_responses=describe_all_responses,
+        describe_full_response_schema=describe_full_response_schema,
+        timings=timings,
+    )
+    return manifest, timings, time.perf_counter() - start
+
+
+def _json_size(value: object) -> int:
+    return len(json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode())
+
+
+@app.command()
+def export(
+    app_path: AppArgument,
+    output: Annotated[Path, typer.Option("--output", "-o", help="File to write the manifest to.")] = Path(
+        "mcp-tools.json"
+    ),
+    factory: FactoryOption = False,
+    app_dir: AppDirOption = Path("."),
+    describe_all_responses: DescribeAllResponsesOption = False,
+    describe_full_response_schema: DescribeFullResponseSchemaOption = False,
+) -> None:
+    """
+    Convert an app and write its tool manifest, for `FastApiMCP(app, manifest=...)` to load at startup.
+    """
+    manifest, _, elapsed = convert_app(
+        app_path, factory, app_dir, describe_all_responses, describe_full_response_schema
+    )
+    manifest.save(output)
+    console.print(
+        f"Wrote {len(manifest.tools)} tools to [bold]{output}[/bold] "
+        f"({output.stat().st_size:,} bytes, converted in {elapsed * 1000:.0f}ms)"
+    )
+
+
+@app.command()
+def inspect(
+    app_path: AppArgument,
+    factory: FactoryOption = False,
+    app_dir: AppDirOption = Path("."),
+    describe_all_responses: DescribeAllResponsesOption = False,
+    describe_full_response_schema: DescribeFullResponseSchemaOption = False,
+    limit: LimitOption = None,
+) -> None:
+    """
+    Show the size of the description and input schema of each tool, largest first.
+    """
+    manifest, _, _ = convert_app(app_path, factory, app_dir, describe_all_responses, describe_full_response_schema)
+
+    rows: List[Tuple[str, int, int]] = [
+        (tool.name, len((tool.description or "").encode()), _json_size(tool.inputSchema)) for tool in manifest.tools
+    ]
+    rows.sort(key=lambda row: row[1] + row[2], reverse=True)
+
+    table = Table(title=f"{len(rows)} tools of {manifest.title}")
+    table.add_column("Tool")
+    table.add_column("Description bytes", justify="right")
+    table.add_column("Schema bytes", justify="right")
+    table.add_column("Total bytes", justify="right")
+    for name, description_size, schema_size in rows[:limit]:
+        table.add_row(name, f"{description_size:,}", f"{schema_size:,}", f"{description_size + schema_size:,}")
+    console.print(table)
+
+    total = _json_size([tool.model_dump(mode="json", exclude_none=True) for tool in manifest.tools])
+    console.print(f"Total size of the tools in a tools/list response: {total:,} bytes")
+
+
+@app.command()
+def profile(
+    app_path: AppArgument,
+    factory: FactoryOption = False,
+    app_dir: AppDirOption = Path("."),
+    describe_all_responses: DescribeAllResponsesOption = False,
+    describe_full_response_schema: DescribeFullResponseSchemaOption = False,
+    limit: LimitOption = 20,
+) -> None:
+    """
+    Show the conversion time of each operation, slowest first.
+    """
+    manifest, timings, elapsed = convert_app(
+        app_path, factory, app_dir, describe_all_responses, describe_full_response_schema
+    )
+
+    operations = {operation.operation_id: operation for operation in manifest.operations}
+    rows = sorted(timings.items(), key=lambda item: item[1], reverse=True)
+
+    table = Table(title=f"Conversion time of the {len(rows)} operations of {manifest.title}")
+    table.add_column("Operation")
+    table.add_column("Route")
+    table.add_column("Time (ms)", justify="right")
+    for operation_id, seconds in rows[:limit]:
+        operation = operations[operation_id]
+        table.add_row(operation_id, f"{operation.method.upper()} {operation.path}", f"{seconds * 1000:.2f}")
+    console.print(table)
+
+    converting = sum(timings.values())
+    console.print(
+        f"Converted in {elapsed * 1000:.1f}ms: {converting * 1000:.1f}ms converting the operations, "
+        f"{(elapsed - converting) * 1000:.1f}ms generating the OpenAPI schema and indexing the operations"
+    )
+
+
+def main() -> None:
+    app()
+
+
+if __name__ == "__main__":
+    main()
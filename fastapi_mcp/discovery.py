@@ -0,0 +1,134 @@
+import asyncio
+import sys
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Literal, Optional, Set
+
+import anyio
+import mcp.types as types
+from mcp.client.session import ClientSession
+from mcp.client.sse import sse_client
+from pydantic import BaseModel
+
+from fastapi_mcp.types import BaseType
+
+if sys.version_info < (3, 11):  # pragma: no cover
+    from exceptiongroup import BaseExceptionGroup
+
+
+# Servers returning more pages than this are assumed to be looping on their cursors
+MAX_TOOL_PAGES = 1000
+
+
+class DiscoveryResult(BaseType):
+    url: str
+    server_name: Optional[str] = None
+    server_version: Optional[str] = None
+    tools: List[types.Tool] = []
+    error: Optional[str] = None
+    elapsed: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class _ListToolsPageRequest(BaseModel):
+    # `mcp.types.ListToolsRequest` has no way to send `params.cursor`, so the request is built by hand
+    method: Literal["tools/list"] = "tools/list"
+    params: Dict[str, Any]
+
+
+def _describe_error(error: BaseException) -> str:
+    # Transport errors come wrapped in exception groups by the task groups of the MCP client
+    while isinstance(error, BaseExceptionGroup) and len(error.exceptions) == 1:
+        error = error.exceptions[0]
+    return f"{type(error).__name__}: {error}"
+
+
+async def list_all_tools(session: ClientSession) -> List[types.Tool]:
+    """
+    Get all the tools of an initialized MCP session, following `nextCursor` across pages.
+    """
+    result = await session.list_tools()
+    tools = list(result.tools)
+    seen_cursors: Set[str] = set()
+
+    while result.nextCursor is not None and result.nextCursor not in seen_cursors:
+        if len(seen_cursors) >= MAX_TOOL_PAGES:
+            raise RuntimeError(f"More than {MAX_TOOL_PAGES} pages of tools")
+        seen_cursors.add(result.nextCursor)
+
+        result = await session.send_request(
+            _ListToolsPageRequest(params={"cursor": result.nextCursor}),  # type: ignore[arg-type]
+            types.ListToolsResult,
+        )
+        tools.extend(result.tools)
+
+    return tools
+
+
+async def discover_server(
+    url: str,
+    timeout: float = 10.0,
+    headers: Optional[Dict[str, Any]] = None,
+) -> DiscoveryResult:
+    """
+    Connect to an MCP server over SSE, do the `initialize` handshake, and list all its tools.
+
+    Never raises: errors, including the timeout being reached, are reported in the result.
+    """
+    start = time.perf_counter()
+    server_name: Optional[str] = None
+    server_version: Optional[str] = None
+    tools: List[types.Tool] = []
+    error: Optional[str] = None
+
+    try:
+        with anyio.fail_after(timeout):
+            async with sse_client(url, headers=headers, timeout=timeout) as streams:
+                async with ClientSession(*streams) as session:
+                    init_result = await session.initialize()
+                    server_name = init_result.serverInfo.name
+                    server_version = init_result.serverInfo.version
+                    tools = await list_all_tools(session)
+    except TimeoutError:
+        error = f"Timed out after {timeout} seconds"
+    except Exception as e:
+        error = _describe_error(e)
+
+    return DiscoveryResult(
+        url=url,
+        server_name=server_name,
+        server_version=server_version,
+        tools=tools,
+        error=error,
+        elapsed=time.perf_counter() - start,
+    )
+
+
+async def discover_servers(
+    urls: Iterable[str],
+    timeout: float = 10.0,
+    max_concurrency: int = 32,
+    headers: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[DiscoveryResult]:
+    """
+    Discover the tools of many MCP servers concurrently, yielding results as soon as they arrive.
+
+    Each server gets its own timeout, so a slow or unreachable server doesn't delay the others.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def probe(url: str) -> DiscoveryResult:
+        async with semaphore:
+            return await discover_server(url, timeout=timeout, headers=headers)
+
+    tasks = [asyncio.ensure_future(probe(url)) for url in urls]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        # The caller may stop iterating early
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,329 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from typing_extensions import Annotated, Doc
+
+import httpx
+import mcp.types as types
+from fastapi import APIRouter, FastAPI
+from fastapi.openapi.utils import get_openapi
+
+from fastapi_mcp.catalog import ToolCatalog
+from fastapi_mcp.openapi.convert import convert_openapi_to_mcp_tools
+from fastapi_mcp.openapi.index import IndexedOperation, OperationIndex
+from fastapi_mcp.openapi.operation import OperationRecord
+from fastapi_mcp.server import FastApiMCP
+from fastapi_mcp.types import NamePattern
+
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+_NAMESPACE_RE = re.compile(r"^[A-Za-z0-9_-]+$")
+
+# Options of `FastApiMCP` that apply to the operations of a single app. Operations are filtered per source instead.
+_UNSUPPORTED_OPTIONS = {"include_operations", "exclude_operations", "include_tags", "exclude_tags", "manifest"}
+
+
+class MCPSource:
+    """
+    A FastAPI app or router (called in-process), or a remote API (called over HTTP), whose operations are
+    exposed as tools by a `FederatedMCP` server, under a namespace.
+    """
+
+    def __init__(
+        self,
+        namespace: Annotated[
+            str,
+            Doc("Namespace of the tools of this source. Tool names are prefixed with it."),
+        ],
+        app: Annotated[
+            Optional[FastAPI | APIRouter],
+            Doc("The FastAPI app or APIRouter to call in-process. Cannot be used with base_url."),
+        ] = None,
+        base_url: Annotated[
+            Optional[str],
+            Doc("Base URL of a remote API to call over HTTP. Cannot be used with app."),
+        ] = None,
+        openapi_url: Annotated[
+            str,
+            Doc("Path of the OpenAPI schema of the remote API, relative to base_url"),
+        ] = "/openapi.json",
+        openapi_schema: Annotated[
+            Optional[Dict[str, Any]],
+            Doc("The OpenAPI schema of the remote API, if it should not be fetched from openapi_url"),
+        ] = None,
+        http_client: Annotated[
+            Optional[httpx.AsyncClient],
+            Doc("Optional custom HTTP client to use for API calls to this source"),
+        ] = None,
+        timeout: Annotated[
+            float,
+            Doc("Timeout in seconds of the default HTTP client, and of fetching the OpenAPI schema"),
+        ] = 10.0,
+        include_operations: Annotated[
+            Optional[Sequence[NamePattern]],
+            Doc("Operation IDs of this source to include as tools. Cannot be used with exclude_operations."),
+        ] = None,
+        exclude_operations: Annotated[
+            Optional[Sequence[NamePattern]],
+            Doc("Operation IDs of this source to exclude from the tools. Cannot be used with include_operations."),
+        ] = None,
+        include_tags: Annotated[
+            Optional[Sequence[NamePattern]],
+            Doc("Tags of this source to include as tools. Cannot be used with exclude_tags."),
+        ] = None,
+        exclude_tags: Annotated[
+            Optional[Sequence[NamePattern]],
+            Doc("Tags of this source to exclude from the tools. Cannot be used with include_tags."),
+        ] = None,
+        forward_authorization: Annotated[
+            bool,
+            Doc(
+                """
+                Whether to send the `Authorization` header of the MCP client along with the calls to this
+                source. Only enable it for sources that should see the credentials of the gateway's clients.
+                """
+            ),
+        ] = False,
+    ):
+        if not _NAMESPACE_RE.match(namespace):
+            raise ValueError(f"Invalid namespace: {namespace!r}. Only letters, digits, '_' and '-' are allowed.")
+
+        if (app is None) == (base_url is None):
+            raise ValueError("Exactly one of app and base_url is required")
+
+        if include_operations is not None and exclude_operations is not None:
+            raise ValueError("Cannot specify both include_operations and exclude_operations")
+
+        if include_tags is not None and exclude_tags is not None:
+            raise ValueError("Cannot specify both include_tags and exclude_tags")
+
+        # A router can only be called once it is part of an app, so it gets one of its own
+        if isinstance(app, APIRouter):
+            router_app = FastAPI()
+            router_app.include_router(app)
+            app = router_app
+
+        self.namespace = namespace
+        self.app = app
+        self.base_url = base_url.rstrip("/") if base_url is not None else None
+        self.openapi_url = openapi_url
+        self.openapi_schema = openapi_schema
+        self.timeout = timeout
+        self.include_operations = include_operations
+        self.exclude_operations = exclude_operations
+        self.include_tags = include_tags
+        self.exclude_tags = exclude_tags
+        self.forward_authorization = forward_authorization
+
+        # Created once, and shared by all the calls to this source
+        if http_client is not None:
+            self.http_client = http_client
+        elif self.app is not None:
+            self.http_client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=self.app, raise_app_exceptions=False),
+                base_url="http://apiserver",
+                timeout=timeout,
+            )
+        else:
+            self.http_client = httpx.AsyncClient(base_url=self.base_url or "", timeout=timeout)
+
+    def get_openapi_schema(self) -> Dict[str, Any]:
+        """
+        Get the OpenAPI schema of the source, fetching it if it is a remote API.
+        """
+        if self.app is not None:
+            return get_openapi(
+                title=self.app.title,
+                version=self.app.version,
+                openapi_version=self.app.openapi_version,
+                description=self.app.description,
+                routes=self.app.routes,
+            )
+
+        if self.openapi_schema is not None:
+            return self.openapi_schema
+
+        response = httpx.get(f"{self.base_url}{self.openapi_url}", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+
+class FederatedMCP(FastApiMCP):
+    """
+    Create a single MCP server from several FastAPI apps, routers or remote APIs.
+
+    Each tool is named `<namespace><separator><operation ID>`. The operations of every source are converted
+    once per catalog build, and every source keeps its own HTTP client for the lifetime of the server.
+    In the operation index (used by tool views and tool search), operations are tagged with their
+    namespace, and their paths are prefixed with `/<namespace>`, as if every source was mounted there.
+    """
+
+    def __init__(
+        self,
+        fastapi: Annotated[
+            FastAPI,
+            Doc("The FastAPI application to mount the MCP server to. Its own routes are not exposed as tools."),
+        ],
+        sources: Annotated[
+            Sequence[MCPSource],
+            Doc("The sources to expose the operations of as tools"),
+        ],
+        separator: Annotated[
+            str,
+            Doc("Separator between the namespace and the operation ID in tool names"),
+        ] = "__",
+        **kwargs: Annotated[
+            Any,
+            Doc(
+                """
+                Other options of `FastApiMCP`, e.g. `tool_views`, `metrics` or `background_warmup`. Operations
+                and tags are filtered per source, with the options of `MCPSource`.
+                """
+            ),
+        ],
+    ):
+        if not separator:
+            raise ValueError("separator cannot be empty")
+
+        unsupported = sorted(_UNSUPPORTED_OPTIONS & kwargs.keys())
+        if unsupported:
+            raise ValueError(
+                f"{', '.join(unsupported)} cannot be used with FederatedMCP. "
+                "Filter operations and tags per source, with the options of MCPSource."
+            )
+
+        self._separator = separator
+        self._sources: Dict[str, MCPSource] = {}
+        # The last successful conversion of each source, used when it can't be converted again
+        self._source_results: Dict[
+            str, Tuple[List[types.Tool], Dict[str, OperationRecord], List[IndexedOperation]]
+        ] = {}
+        self._unavailable_sources: set[str] = set()
+        for source in sources:
+            if separator in source.namespace:
+                raise ValueError(f"Namespace {source.namespace!r} cannot contain the separator {separator!r}")
+            if source.namespace in self._sources:
+                raise ValueError(f"Duplicate namespace: {source.namespace!r}")
+            self._sources[source.namespace] = source
+
+        super().__init__(fastapi, **kwargs)
+
+    @property
+    def sources(self) -> Dict[str, MCPSource]:
+        """The sources of the server, by namespace."""
+        return self._sources
+
+    @property
+    def unavailable_sources(self) -> set[str]:
+        """The namespaces of the sources that could not be converted in the last build of the tools."""
+        return set(self._unavailable_sources)
+
+    def tool_name(self, namespace: str, operation_id: str) -> str:
+        """
+        Get the name of the tool of an operation of a source.
+        """
+        return f"{namespace}{self._separator}{operation_id}"
+
+    async def call_tool(
+        self,
+        name: Annotated[str, Doc("The namespaced name of the tool to call")],
+        arguments: Annotated[Dict[str, Any], Doc("The arguments for the tool")],
+    ) -> List[Union[types.TextContent, types.ImageContent, types.EmbeddedResource]]:
+        """
+        Call a tool directly, without an MCP session. Useful for gateways that expose tools over plain HTTP.
+        """
+        await self.warmup(self._warmup_timeout)
+        return await self._execute_api_tool(
+            client=self._get_tool_client(name),
+            tool_name=name,
+            arguments=arguments,
+            operation_map=self._catalog.operation_map,
+        )
+
+    def _get_tool_client(self, tool_name: str) -> httpx.AsyncClient:
+        source = self._sources.get(tool_name.split(self._separator, 1)[0])
+        return source.http_client if source is not None else self._http_client
+
+    def _forwards_authorization(self, tool_name: str) -> bool:
+        source = self._sources.get(tool_name.split(self._separator, 1)[0])
+        return source is not None and source.forward_authorization
+
+    def _convert_source(
+        self, source: MCPSource
+    ) -> Tuple[List[types.Tool], Dict[str, OperationRecord], List[IndexedOperation]]:
+        """
+        Convert the selected operations of a source to namespaced tools.
+        """
+        openapi_schema = source.get_openapi_schema()
+
+        index = OperationIndex(openapi_schema)
+        operation_ids = index.select(
+            include_operations=source.include_operations,
+            exclude_operations=source.exclude_operations,
+            include_tags=source.include_tags,
+            exclude_tags=source.exclude_tags,
+        )
+
+        tools, operation_map = convert_openapi_to_mcp_tools(
+            openapi_schema,
+            describe_all_responses=self._describe_all_responses,
+            describe_full_response_schema=self._describe_full_response_schema,
+            operation_ids=operation_ids,
+        )
+
+        namespace = source.namespace
+        namespaced_tools = [tool.model_copy(update={"name": self.tool_name(namespace, tool.name)}) for tool in tools]
+        namespaced_operation_map = {
+            self.tool_name(namespace, operation_id): operation for operation_id, operation in operation_map.items()
+        }
+        namespaced_operations = [
+            IndexedOperation(
+                self.tool_name(namespace, operation.operation_id),
+                f"/{namespace}{operation.path}",
+                operation.method,
+                (namespace, *operation.tags),
+            )
+            for operation in index.operations.values()
+        ]
+        return namespaced_tools, namespaced_operation_map, namespaced_operations
+
+    def _load_source(
+        self, source: MCPSource
+    ) -> Tuple[List[types.Tool], Dict[str, OperationRecord], List[IndexedOperation]]:
+        """
+        Convert a source, falling back to its last successful conversion, or to no tools, if it fails, e.g.
+        because a remote API is down, so one source can't prevent the others from being served.
+        """
+        try:
+            result = self._convert_source(source)
+        except Exception:
+            previous = self._source_results.get(source.namespace)
+            logger.exception(
+                f"Failed to load the tools of source {source.namespace!r}, "
+                + ("keeping its previous tools" if previous is not None else "skipping it")
+            )
+            self._unavailable_sources.add(source.namespace)
+            return previous if previous is not None else ([], {}, [])
+
+        self._source_results[source.namespace] = result
+        self._unavailable_sources.discard(source.namespace)
+        return result
+
+    def _build_catalog(self) -> ToolCatalog:
+        tools: List[types.Tool] = []
+        operation_map: Dict[str, OperationRecord] = {}
+        operations: List[IndexedOperation] = []
+
+        # Fetching the schemas of remote sources is I/O bound, so sources are converted concurrently
+        with ThreadPoolExecutor(max_workers=min(16, len(self._sources) or 1)) as executor:
+            for source_tools, source_operation_map, source_operations in executor.map(
+                self._load_source, self._sources.values()
+            ):
+                tools.extend(source_tools)
+                operation_map.update(source_operation_map)
+                operations.extend(source_operations)
+
+        return self._make_catalog(tools, operation_map, OperationIndex.from_operations(operations))
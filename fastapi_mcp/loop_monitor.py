@@ -0,0 +1,216 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import logging
+
+from fastapi_mcp.metrics import MetricsRegistry
+
+
+logger = logging.getLogger(__name__)
+
+# Activity reported for stalls that happened while no tool call or message was being handled
+UNKNOWN_ACTIVITY = "unknown"
+
+
+class _Stall:
+    __slots__ = ("tick", "activity")
+
+    def __init__(self, tick: float, activity: str):
+        self.tick = tick
+        self.activity = activity
+
+
+class EventLoopMonitor:
+    """
+    Measures the lag of the asyncio event loop that runs the MCP server, and reports what blocked it.
+
+    A task sleeps for `interval` in a loop, and the lag is how late it wakes up. A watchdog thread checks
+    that the task keeps waking up: when the loop is blocked for more than `threshold`, it samples the stack
+    of the event loop thread and the tool call or message being handled, and logs them, while the loop is
+    still blocked. Lag samples and stalls are recorded in `metrics`, if set.
+
+    The monitor is started by `FastApiMCP` the first time it handles a session or a request, as it needs
+    a running event loop. It can also be started with `start()`, e.g. in the lifespan of the app.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        threshold: float = 0.1,
+        metrics: Optional[MetricsRegistry] = None,
+        sample_stacks: bool = True,
+    ):
+        if interval <= 0 or threshold <= 0:
+            raise ValueError("interval and threshold must be positive")
+
+        self.interval = interval
+        self.threshold = threshold
+        self.metrics = metrics
+        self.sample_stacks = sample_stacks
+
+        self.samples = 0
+        self.max_lag = 0.0
+        self.stalls = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+        # Start of the current sleep of the monitor task, read by the watchdog thread
+        self._tick: Optional[float] = None
+        self._stall: Optional[_Stall] = None
+        # The activity of each task currently handling a tool call or a message. Updated by the event loop
+        # thread and read by the watchdog thread, under the lock.
+        self._activities: Dict[asyncio.Task, str] = {}
+        self._activities_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """
+        Start monitoring the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self.running and self._loop is loop:
+            return
+        self.stop()
+
+        self._loop = loop
+        self._loop_thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+        self._task = loop.create_task(self._measure_lag(), name="fastapi_mcp_loop_monitor")
+        self._watchdog = threading.Thread(
+            target=self._watch, args=(self._stopped,), name="fastapi_mcp_loop_watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        """
+        Stop monitoring. The monitor can be started again afterwards.
+        """
+        self._stopped.set()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        self._tick = None
+        self._stall = None
+
+    @contextmanager
+    def activity(self, name: str) -> Iterator[None]:
+        """
+        Mark the current task as handling `name`, e.g. `tools/call:get_item`, so stalls of the event loop
+        happening meanwhile are attributed to it.
+        """
+        try:
+            task: Optional[asyncio.Task] = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is None:
+            yield
+            return
+
+        with self._activities_lock:
+            previous = self._activities.get(task)
+            self._activities[task] = name
+        try:
+            yield
+        finally:
+            with self._activities_lock:
+                if previous is None:
+                    self._activities.pop(task, None)
+                else:
+                    self._activities[task] = previous
+
+    async def _measure_lag(self) -> None:
+        try:
+            while True:
+                tick = time.perf_counter()
+                self._tick = tick
+                await asyncio.sleep(self.interval)
+                lag = max(0.0, time.perf_counter() - tick - self.interval)
+
+                activity = None
+                if lag >= self.threshold:
+                    stall, self._stall = self._stall, None
+                    if stall is not None and stall.tick == tick:
+                        activity = stall.activity
+                    else:
+                        # The watchdog didn't catch it in the act, e.g. because it was barely over the threshold
+                        activity = UNKNOWN_ACTIVITY
+                        logger.warning(f"Event loop was blocked for {lag * 1000:.0f}ms")
+                self._record(lag, activity)
+        finally:
+            # Also stops the watchdog when the loop is closed without calling `stop()`
+            self._tick = None
+            self._stopped.set()
+
+    def _record(self, lag: float, stall_activity: Optional[str]) -> None:
+        self.samples += 1
+        self.max_lag = max(self.max_lag, lag)
+        if stall_activity is not None:
+            self.stalls += 1
+        if self.metrics is not None:
+            self.metrics.loop_lag(lag, stall_activity)
+
+    def _watch(self, stopped: threading.Event) -> None:
+        # Check often enough to catch the loop while it is still blocked
+        period = min(self.interval, self.threshold) / 2
+        while not stopped.wait(period):
+            try:
+                self._check_stall()
+            except Exception:
+                # Keep watching: a failed report must not silently end the monitoring
+                logger.exception("Failed to check the event loop for stalls")
+
+    def _check_stall(self) -> None:
+        tick = self._tick
+        if tick is None:
+            return
+        blocked_for = time.perf_counter() - tick - self.interval
+        if blocked_for < self.threshold:
+            return
+        stall = self._stall
+        if stall is not None and stall.tick == tick:
+            return  # Already reported
+
+        activity, in_flight = self._current_activity()
+        stack = self._sample_stack() if self.sample_stacks else ""
+        self._stall = _Stall(tick, activity)
+        logger.warning(
+            f"Event loop blocked for more than {blocked_for * 1000:.0f}ms while handling {activity}"
+            + (f" (in flight: {', '.join(in_flight)})" if activity == UNKNOWN_ACTIVITY and in_flight else "")
+            + (f", stack of the event loop thread:\n{stack}" if stack else "")
+        )
+
+    def _current_activity(self) -> Tuple[str, List[str]]:
+        """
+        Get the activity of the task being run by the event loop, and the activities of all the tasks.
+        """
+        with self._activities_lock:
+            activities = dict(self._activities)
+        in_flight = sorted(set(activities.values()))
+        if self._loop is None:
+            return UNKNOWN_ACTIVITY, in_flight
+        try:
+            # Reading the task currently run by the loop from another thread is racy, but it is only used
+            # for reporting, and the loop is blocked anyway
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        # The blocking code may run in a task of its own, e.g. spawned by a middleware, and then the
+        # activities in flight are the best hint
+        activity = activities.get(task) if task is not None else None
+        return activity or UNKNOWN_ACTIVITY, in_flight
+
+    def _sample_stack(self) -> str:
+        frame = sys._current_frames().get(self._loop_thread_id) if self._loop_thread_id is not None else None
+        return "".join(traceback.format_stack(frame)) if frame is not None else ""
@@ -0,0 +1,156 @@
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Union
+
+import mcp.types as types
+from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
+from pydantic import field_serializer, field_validator
+
+from fastapi_mcp import __version__
+from fastapi_mcp.openapi.convert import convert_openapi_to_mcp_tools
+from fastapi_mcp.openapi.index import IndexedOperation, OperationIndex
+from fastapi_mcp.openapi.operation import OperationRecord
+from fastapi_mcp.types import BaseType
+
+
+# Bumped when the format of the manifest changes in a way older versions can't load
+MANIFEST_FORMAT_VERSION = 2
+
+
+class ManifestOperation(BaseType):
+    operation_id: str
+    path: str
+    method: str
+    tags: List[str] = []
+
+
+class ToolManifest(BaseType):
+    """
+    The tools converted from a FastAPI app, saved to a file so `FastApiMCP` can load them at startup
+    instead of converting the app again.
+
+    All the operations of the app are converted, so the operation and tag filters of `FastApiMCP` can still
+    be applied when loading the manifest.
+    """
+
+    format_version: int = MANIFEST_FORMAT_VERSION
+    generator_version: str
+    title: str
+    describe_all_responses: bool
+    describe_full_response_schema: bool
+    tools: List[types.Tool]
+    operation_map: Dict[str, OperationRecord]
+    operations: List[ManifestOperation]
+
+    @field_validator("operation_map", mode="before")
+    @classmethod
+    def validate_operation_map(cls, v: Any) -> Any:
+        if isinstance(v, dict):
+            return {
+                name: OperationRecord.from_dict(operation) if isinstance(operation, dict) else operation
+                for name, operation in v.items()
+            }
+        return v
+
+    @field_serializer("operation_map")
+    def serialize_operation_map(self, operation_map: Dict[str, OperationRecord]) -> Dict[str, Dict[str, Any]]:
+        return {name: operation.to_dict() for name, operation in operation_map.items()}
+
+    @classmethod
+    def from_app(
+        cls,
+        app: FastAPI,
+        describe_all_responses: bool = False,
+        describe_full_response_schema: bool = False,
+        timings: Optional[Dict[str, float]] = None,
+    ) -> "ToolManifest":
+        """
+        Convert all the operations of a FastAPI app.
+
+        Args:
+            app: The FastAPI app
+            describe_all_responses: Whether to include all possible response schemas in tool descriptions
+            describe_full_response_schema: Whether to include full response schema in tool descriptions
+            timings: If given, filled with the conversion time of each operation, in seconds
+        """
+        openapi_schema = get_openapi(
+            title=app.title,
+            version=app.version,
+            openapi_version=app.openapi_version,
+            description=app.description,
+            routes=app.routes,
+        )
+        index = OperationIndex(openapi_schema)
+
+        tools: List[types.Tool] = []
+        operation_map: Dict[str, OperationRecord] = {}
+        for operation_id, operation_schema in _split_operations(openapi_schema, index).items():
+            # Converting a schema with a single operation in it costs the same as converting this operation
+            # in the whole schema, and gives its time
+            start = time.perf_counter()
+            operation_tools, operation_operation_map = convert_openapi_to_mcp_tools(
+                operation_schema,
+                describe_all_responses=describe_all_responses,
+                describe_full_response_schema=describe_full_response_schema,
+            )
+            if timings is not None:
+                timings[operation_id] = time.perf_counter() - start
+
+            tools.extend(operation_tools)
+            operation_map.update(operation_operation_map)
+
+        return cls(
+            generator_version=__version__,
+            title=app.title,
+            describe_all_responses=describe_all_responses,
+            describe_full_response_schema=describe_full_response_schema,
+            tools=tools,
+            operation_map=operation_map,
+            operations=[
+                ManifestOperation(
+                    operation_id=operation.operation_id,
+                    path=operation.path,
+                    method=operation.method,
+                    tags=list(operation.tags),
+                )
+                for operation in index.operations.values()
+            ],
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "ToolManifest":
+        with open(path, "rb") as f:
+            data = json.loads(f.read())
+
+        format_version = data.get("format_version") if isinstance(data, dict) else None
+        if format_version != MANIFEST_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported tool manifest format version {format_version!r} in {os.fspath(path)!r}, "
+                f"expected {MANIFEST_FORMAT_VERSION}. Export the manifest again with this version of fastapi-mcp."
+            )
+        return cls.model_validate(data)
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.model_dump_json(by_alias=True))
+
+    def index(self) -> OperationIndex:
+        return OperationIndex.from_operations(
+            IndexedOperation(operation.operation_id, operation.path, operation.method, tuple(operation.tags))
+            for operation in self.operations
+        )
+
+
+def _split_operations(openapi_schema: Dict[str, Any], index: OperationIndex) -> Dict[str, Dict[str, Any]]:
+    """
+    Split an OpenAPI schema into schemas with a single operation each, sharing the components.
+    """
+    return {
+        operation_id: {
+            **openapi_schema,
+            "paths": {operation.path: {operation.method: openapi_schema["paths"][operation.path][operation.method]}},
+        }
+        for operation_id, operation in index.operations.items()
+    }
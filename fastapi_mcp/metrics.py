@@ -0,0 +1,215 @@
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence
+
+
+# Upper bounds in seconds of the buckets of the latency histograms
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Upper bounds in seconds of the buckets of the event loop lag histogram
+DEFAULT_LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class ToolMetrics:
+    """
+    The metrics of a single tool.
+
+    Updates are plain attribute increments without any lock: they are all done from the event loop thread,
+    and a scrape reading a counter while another one is being updated is fine for monotonic counters.
+    """
+
+    __slots__ = (
+        "calls",
+        "errors",
+        "in_flight",
+        "latency_buckets",
+        "latency_sum",
+        "request_bytes",
+        "response_bytes",
+    )
+
+    def __init__(self, bucket_count: int):
+        self.calls = 0
+        self.errors: Dict[str, int] = {}
+        self.in_flight = 0
+        # Non-cumulative counts per bucket, the last one being +Inf
+        self.latency_buckets = [0] * (bucket_count + 1)
+        self.latency_sum = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+
+class MetricsRegistry:
+    """
+    Per-tool and per-transport metrics of an MCP server, exposed in the Prometheus text format.
+
+    Tools are only registered once they are called with a name known to the server, so the number of
+    series can't be inflated by clients calling made-up tools.
+    """
+
+    def __init__(self, latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS, namespace: str = "fastapi_mcp"):
+        self.latency_buckets = tuple(sorted(latency_buckets))
+        self.namespace = namespace
+        self.tools: Dict[str, ToolMetrics] = {}
+
+        self.active_sessions = 0
+        self.messages_received = 0
+        self.message_bytes_received = 0
+        self.message_errors = 0
+
+        self.loop_lag_buckets = [0] * (len(DEFAULT_LOOP_LAG_BUCKETS) + 1)
+        self.loop_lag_sum = 0.0
+        self.loop_lag_count = 0
+        self.loop_lag_max = 0.0
+        self.loop_stalls: Dict[str, int] = {}
+
+    def tool(self, tool_name: str) -> ToolMetrics:
+        metrics = self.tools.get(tool_name)
+        if metrics is None:
+            metrics = self.tools[tool_name] = ToolMetrics(len(self.latency_buckets))
+        return metrics
+
+    def call_started(self, tool_name: str) -> float:
+        """
+        Record the start of a tool call, and get its start time to pass to `call_finished`.
+        """
+        self.tool(tool_name).in_flight += 1
+        return time.perf_counter()
+
+    def call_finished(self, tool_name: str, started_at: float, response: Optional[Any]) -> None:
+        """
+        Record the end of a tool call, given the HTTP response of the API, or `None` if the request failed.
+        """
+        duration = time.perf_counter() - started_at
+        metrics = self.tool(tool_name)
+
+        metrics.in_flight -= 1
+        metrics.calls += 1
+        metrics.latency_sum += duration
+        metrics.latency_buckets[bisect_left(self.latency_buckets, duration)] += 1
+
+        if response is None:
+            metrics.errors["exception"] = metrics.errors.get("exception", 0) + 1
+            return
+
+        status_code = getattr(response, "status_code", 0)
+        if status_code >= 400:
+            status = str(status_code)
+            metrics.errors[status] = metrics.errors.get(status, 0) + 1
+
+        request = getattr(response, "request", None)
+        if request is not None:
+            metrics.request_bytes += len(getattr(request, "content", b""))
+        metrics.response_bytes += len(getattr(response, "content", b""))
+
+    def session_opened(self) -> None:
+        self.active_sessions += 1
+
+    def session_closed(self) -> None:
+        self.active_sessions -= 1
+
+    def message_received(self, size: int, error: bool = False) -> None:
+        self.messages_received += 1
+        self.message_bytes_received += size
+        if error:
+            self.message_errors += 1
+
+    def loop_lag(self, lag: float, stall_activity: Optional[str] = None) -> None:
+        """
+        Record a sample of the event loop lag, and the activity it is attributed to if it is a stall.
+        """
+        self.loop_lag_count += 1
+        self.loop_lag_sum += lag
+        self.loop_lag_max = max(self.loop_lag_max, lag)
+        self.loop_lag_buckets[bisect_left(DEFAULT_LOOP_LAG_BUCKETS, lag)] += 1
+        if stall_activity is not None:
+            self.loop_stalls[stall_activity] = self.loop_stalls.get(stall_activity, 0) + 1
+
+    def render_prometheus(self) -> str:
+        """
+        Render all the metrics in the Prometheus text exposition format.
+        """
+        ns = self.namespace
+        lines: List[str] = []
+
+        def metric(name: str, metric_type: str, help_text: str) -> str:
+            lines.append(f"# HELP {ns}_{name} {help_text}")
+            lines.append(f"# TYPE {ns}_{name} {metric_type}")
+            return f"{ns}_{name}"
+
+        tools = sorted(self.tools.items())
+
+        name = metric("tool_calls_total", "counter", "Number of completed tool calls.")
+        lines.extend(f'{name}{{tool="{_escape(tool)}"}} {m.calls}' for tool, m in tools)
+
+        name = metric("tool_errors_total", "counter", "Number of failed tool calls, by HTTP status code.")
+        for tool, m in tools:
+            lines.extend(
+                f'{name}{{tool="{_escape(tool)}",status="{status}"}} {count}'
+                for status, count in sorted(m.errors.items())
+            )
+
+        name = metric("tool_in_flight", "gauge", "Number of tool calls in progress.")
+        lines.extend(f'{name}{{tool="{_escape(tool)}"}} {m.in_flight}' for tool, m in tools)
+
+        name = metric("tool_latency_seconds", "histogram", "Latency of tool calls, including the API request.")
+        for tool, m in tools:
+            label = f'tool="{_escape(tool)}"'
+            cumulative = 0
+            for bound, count in zip(self.latency_buckets, m.latency_buckets):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{label},le="{_format_float(bound)}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{label},le="+Inf"}} {m.calls}')
+            lines.append(f"{name}_sum{{{label}}} {_format_float(m.latency_sum)}")
+            lines.append(f"{name}_count{{{label}}} {m.calls}")
+
+        name = metric("tool_request_bytes_total", "counter", "Size of the API request bodies sent by tool calls.")
+        lines.extend(f'{name}{{tool="{_escape(tool)}"}} {m.request_bytes}' for tool, m in tools)
+
+        name = metric("tool_response_bytes_total", "counter", "Size of the API response bodies received by tool calls.")
+        lines.extend(f'{name}{{tool="{_escape(tool)}"}} {m.response_bytes}' for tool, m in tools)
+
+        name = metric("sessions_active", "gauge", "Number of connected MCP sessions.")
+        lines.append(f"{name} {self.active_sessions}")
+
+        name = metric("messages_received_total", "counter", "Number of messages posted to MCP sessions.")
+        lines.append(f"{name} {self.messages_received}")
+
+        name = metric("message_bytes_received_total", "counter", "Size of the messages posted to MCP sessions.")
+        lines.append(f"{name} {self.message_bytes_received}")
+
+        name = metric("message_errors_total", "counter", "Number of messages that could not be parsed.")
+        lines.append(f"{name} {self.message_errors}")
+
+        if self.loop_lag_count:
+            name = metric("event_loop_lag_seconds", "histogram", "Lag of the event loop, sampled continuously.")
+            cumulative = 0
+            for bound, count in zip(DEFAULT_LOOP_LAG_BUCKETS, self.loop_lag_buckets):
+                cumulative += count
+                lines.append(f'{name}_bucket{{le="{_format_float(bound)}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{le="+Inf"}} {self.loop_lag_count}')
+            lines.append(f"{name}_sum {_format_float(self.loop_lag_sum)}")
+            lines.append(f"{name}_count {self.loop_lag_count}")
+
+            name = metric("event_loop_lag_max_seconds", "gauge", "Highest lag of the event loop.")
+            lines.append(f"{name} {_format_float(self.loop_lag_max)}")
+
+            name = metric(
+                "event_loop_stalls_total", "counter", "Number of times the event loop was blocked, by activity."
+            )
+            lines.extend(
+                f'{name}{{activity="{_escape(activity)}"}} {count}'
+                for activity, count in sorted(self.loop_stalls.items())
+            )
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
@@ -1,9 +1,10 @@
 import json
 import logging
-from typing import Any, Dict, List, Tuple
+from typing import Any, Collection, Dict, List, Optional, Tuple
 
 import mcp.types as types
 
+from .operation import OperationRecord
 from .utils import (
     clean_schema_for_display,
     generate_example_from_schema,
@@ -18,7 +19,8 @@ def convert_openapi_to_mcp_tools(
     openapi_schema: Dict[str, Any],
     describe_all_responses: bool = False,
     describe_full_response_schema: bool = False,
-) -> Tuple[List[types.Tool], Dict[str, Dict[str, Any]]]:
+    operation_ids: Optional[Collection[str]] = None,
+) -> Tuple[List[types.Tool], Dict[str, OperationRecord]]:
     """
     Convert OpenAPI operations to MCP tools.
 
@@ -26,20 +28,18 @@ def convert_openapi_to_mcp_tools(
         openapi_schema: The OpenAPI schema
         describe_all_responses: Whether to include all possible response schemas in tool descriptions
         describe_full_response_schema: Whether to include full response schema in tool descriptions
+        operation_ids: If provided, only convert the operations with these IDs
 
     Returns:
         A tuple containing:
         - A list of MCP tools
         - A mapping of operation IDs to operation details for HTTP execution
     """
-    # Resolve all references in the schema at once
-    resolved_openapi_schema = resolve_schema_references(openapi_schema, openapi_schema)
-
     tools = []
-    operation_map = {}
+    operation_map: Dict[str, OperationRecord] = {}
 
     # Process each path in the OpenAPI schema
-    for path, path_item in resolved_openapi_schema.get("paths", {}).items():
+    for path, path_item in openapi_schema.get("paths", {}).items():
         for method, operation in path_item.items():
             # Skip non-HTTP methods
             if method not in ["get", "post", "put", "delete", "patch"]:
@@ -52,13 +52,15 @@ def convert_openapi_to_mcp_tools(
                 logger.warning(f"Skipping operation with no operationId: {operation}")
                 continue
 
+            # Skip operations that were not selected, before doing any work on them
+            if operation_ids is not None and operation_id not in operation_ids:
+                continue
+
+            # Resolve the references of this operation only
+            operation = resolve_schema_references(operation, openapi_schema)
+
             # Save operation details for later HTTP calls
-            operation_map[operation_id] = {
-                "path": path,
-                "method": method,
-                "parameters": operation.get("parameters", []),
-                "request_body": operation.get("requestBody", {}),
-            }
+            operation_map[operation_id] = OperationRecord.from_operation(operation_id, path, method, operation)
 
             summary = operation.get("summary", "")
             description = operation.get("description", "")
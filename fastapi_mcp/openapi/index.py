@@ -0,0 +1,184 @@
+import fnmatch
+import re
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from fastapi_mcp.types import NamePattern
+
+
+HTTP_METHODS = ["get", "post", "put", "delete", "patch"]
+
+
+class IndexedOperation(NamedTuple):
+    operation_id: str
+    path: str
+    method: str
+    tags: Tuple[str, ...]
+
+
+def _is_glob(pattern: str) -> bool:
+    return any(char in pattern for char in "*?[")
+
+
+def name_matches(name: str, pattern: NamePattern) -> bool:
+    """
+    Check whether a name (an operation ID or a tag) matches a pattern.
+
+    A pattern can be:
+    - A string, matched exactly, or as a glob if it contains any of `*`, `?` or `[`
+    - A compiled regular expression, matched with `fullmatch()`
+    - A predicate, called with the name
+    """
+    if isinstance(pattern, str):
+        if _is_glob(pattern):
+            return fnmatch.fnmatchcase(name, pattern)
+        return name == pattern
+    if isinstance(pattern, re.Pattern):
+        return pattern.fullmatch(name) is not None
+    if callable(pattern):
+        return bool(pattern(name))
+    raise TypeError(f"Invalid name pattern: {pattern!r}")
+
+
+class OperationIndex:
+    """
+    An index of the operations of an OpenAPI schema by operation ID, tag, method and path.
+
+    Building it only walks the operations of the (unresolved) schema, so it is much cheaper than converting
+    them to tools. It is used to select the operations to convert before doing any conversion work.
+    """
+
+    def __init__(self, openapi_schema: Dict[str, Any]):
+        self.operations: Dict[str, IndexedOperation] = {}
+        self.by_tag: Dict[str, List[str]] = {}
+        self.by_method: Dict[str, List[str]] = {}
+
+        for path, path_item in openapi_schema.get("paths", {}).items():
+            for method, operation in path_item.items():
+                if method not in HTTP_METHODS:
+                    continue
+
+                operation_id = operation.get("operationId")
+                if not operation_id:
+                    continue
+
+                self._add(IndexedOperation(operation_id, path, method, tuple(operation.get("tags", []))))
+
+        self._sort()
+
+    @classmethod
+    def from_operations(cls, operations: Iterable[IndexedOperation]) -> "OperationIndex":
+        """
+        Build an index from already indexed operations, e.g. to merge the indexes of several apps.
+        """
+        index = cls({})
+        for operation in operations:
+            index._add(operation)
+        index._sort()
+        return index
+
+    def _add(self, operation: IndexedOperation) -> None:
+        self.operations[operation.operation_id] = operation
+        self.by_method.setdefault(operation.method, []).append(operation.operation_id)
+        for tag in operation.tags:
+            self.by_tag.setdefault(tag, []).append(operation.operation_id)
+
+    def _sort(self) -> None:
+        # Sorted by path, for prefix lookups
+        self._by_path = sorted((operation.path, operation.operation_id) for operation in self.operations.values())
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def __contains__(self, operation_id: object) -> bool:
+        return operation_id in self.operations
+
+    @property
+    def operation_ids(self) -> Set[str]:
+        return set(self.operations)
+
+    def match_operations(self, patterns: Iterable[NamePattern]) -> Set[str]:
+        """
+        Get the IDs of the operations whose ID matches any of the patterns.
+        """
+        # Exact names are looked up directly, only the other patterns need a scan
+        exact: Set[str] = set()
+        others: List[NamePattern] = []
+        for pattern in patterns:
+            if isinstance(pattern, str) and not _is_glob(pattern):
+                exact.add(pattern)
+            else:
+                others.append(pattern)
+
+        matched = exact & self.operations.keys()
+        if others:
+            matched.update(
+                operation_id
+                for operation_id in self.operations
+                if any(name_matches(operation_id, pattern) for pattern in others)
+            )
+        return matched
+
+    def match_tags(self, patterns: Iterable[NamePattern]) -> Set[str]:
+        """
+        Get the IDs of the operations with at least one tag matching any of the patterns.
+        """
+        patterns = list(patterns)
+        matched: Set[str] = set()
+        for tag, operation_ids in self.by_tag.items():
+            if any(name_matches(tag, pattern) for pattern in patterns):
+                matched.update(operation_ids)
+        return matched
+
+    def with_methods(self, methods: Iterable[str]) -> Set[str]:
+        """
+        Get the IDs of the operations using any of the given HTTP methods.
+        """
+        matched: Set[str] = set()
+        for method in methods:
+            matched.update(self.by_method.get(method.lower(), []))
+        return matched
+
+    def with_path_prefix(self, prefix: str) -> Set[str]:
+        """
+        Get the IDs of the operations whose path starts with the given prefix.
+        """
+        matched: Set[str] = set()
+        for i in range(bisect_left(self._by_path, (prefix, "")), len(self._by_path)):
+            path, operation_id = self._by_path[i]
+            if not path.startswith(prefix):
+                break
+            matched.add(operation_id)
+        return matched
+
+    def select(
+        self,
+        include_operations: Optional[Iterable[NamePattern]] = None,
+        exclude_operations: Optional[Iterable[NamePattern]] = None,
+        include_tags: Optional[Iterable[NamePattern]] = None,
+        exclude_tags: Optional[Iterable[NamePattern]] = None,
+    ) -> Optional[Set[str]]:
+        """
+        Select operations by operation ID and tag filters.
+
+        Operations matching either the operation ID filter or the tag filter are selected.
+
+        Returns:
+            The IDs of the selected operations, or None if no filter was given (meaning all operations)
+        """
+        if include_operations is None and exclude_operations is None and include_tags is None and exclude_tags is None:
+            return None
+
+        selected: Set[str] = set()
+
+        if include_operations is not None:
+            selected.update(self.match_operations(include_operations))
+        elif exclude_operations is not None:
+            selected.update(self.operation_ids - self.match_operations(exclude_operations))
+
+        if include_tags is not None:
+            selected.update(self.match_tags(include_tags))
+        elif exclude_tags is not None:
+            selected.update(self.operation_ids - self.match_tags(exclude_tags))
+
+        return selected
@@ -0,0 +1,67 @@
+from typing import Any, Dict, Hashable, List, Tuple
+
+
+class SchemaInterner:
+    """
+    Deduplicates structurally identical JSON values, so that e.g. the schema of a model used by many
+    operations is held in memory once, and shared by the input schemas of all their tools.
+
+    `intern()` returns new objects built from canonical children, and never modifies the values it is given.
+    The objects it returns may be shared between tools, so they must not be modified either.
+    """
+
+    def __init__(self) -> None:
+        self._table: Dict[Tuple[Hashable, ...], Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def intern(self, value: Any) -> Any:
+        """
+        Get the canonical object structurally equal to a JSON value.
+        """
+        value_type = type(value)
+        if value_type is dict:
+            return self._intern_dict(value)
+        if value_type is list:
+            return self._intern_list(value)
+        return value
+
+    def _intern_dict(self, value: Dict[str, Any]) -> Dict[str, Any]:
+        # Key order is part of the structure, since it shows in the serialized schemas
+        items: List[Tuple[str, Any]] = []
+        table_key: List[Hashable] = [dict]
+        for key, item in value.items():
+            item_type = type(item)
+            if item_type is dict or item_type is list:
+                # Canonical containers are kept alive by the table, so their ids identify their structure
+                item = self.intern(item)
+                table_key.append((key, id(item)))
+            else:
+                # Scalars are compared by type too, as 1, 1.0 and True are equal but serialize differently
+                table_key.append((key, item_type, item))
+            items.append((key, item))
+
+        frozen_key = tuple(table_key)
+        canonical = self._table.get(frozen_key)
+        if canonical is None:
+            canonical = self._table[frozen_key] = dict(items)
+        return canonical
+
+    def _intern_list(self, value: List[Any]) -> List[Any]:
+        elements: List[Any] = []
+        table_key: List[Hashable] = [list]
+        for item in value:
+            item_type = type(item)
+            if item_type is dict or item_type is list:
+                item = self.intern(item)
+                table_key.append(id(item))
+            else:
+                table_key.append((item_type, item))
+            elements.append(item)
+
+        frozen_key = tuple(table_key)
+        canonical = self._table.get(frozen_key)
+        if canonical is None:
+            canonical = self._table[frozen_key] = elements
+        return canonical
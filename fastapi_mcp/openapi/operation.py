@@ -0,0 +1,99 @@
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+
+class ParameterRecord(NamedTuple):
+    name: str
+    location: str
+    style: Optional[str] = None
+    explode: Optional[bool] = None
+
+
+class OperationRecord:
+    """
+    What calling an operation needs: its path template, method, the location of its parameters, and the
+    media type of its body.
+
+    Unlike the resolved operation it is made from, it doesn't hold any schema, so keeping one per tool is
+    cheap. Records are immutable, so they can be shared between catalogs.
+
+    `record["path"]` and `record["method"]` are supported, like with the dicts `operation_map` used to hold.
+    """
+
+    __slots__ = ("operation_id", "path", "method", "parameters", "body_media_type")
+
+    operation_id: str
+    path: str
+    method: str
+    parameters: Tuple[ParameterRecord, ...]
+    body_media_type: Optional[str]
+
+    def __init__(
+        self,
+        operation_id: str,
+        path: str,
+        method: str,
+        parameters: Tuple[ParameterRecord, ...] = (),
+        body_media_type: Optional[str] = None,
+    ):
+        object.__setattr__(self, "operation_id", operation_id)
+        object.__setattr__(self, "path", path)
+        object.__setattr__(self, "method", method)
+        object.__setattr__(self, "parameters", tuple(parameters))
+        object.__setattr__(self, "body_media_type", body_media_type)
+
+    @classmethod
+    def from_operation(cls, operation_id: str, path: str, method: str, operation: Dict[str, Any]) -> "OperationRecord":
+        """
+        Make the record of an OpenAPI operation.
+        """
+        parameters = tuple(
+            ParameterRecord(param["name"], param["in"], param.get("style"), param.get("explode"))
+            for param in operation.get("parameters", [])
+            if param.get("name") is not None and param.get("in") is not None
+        )
+        content = (operation.get("requestBody") or {}).get("content") or {}
+        return cls(operation_id, path, method, parameters, next(iter(content), None))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getitem__(self, key: str) -> Any:
+        if key in ("path", "method"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def _key(self) -> Tuple[Any, ...]:
+        return (self.operation_id, self.path, self.method, self.parameters, self.body_media_type)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, OperationRecord):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return f"OperationRecord({self.operation_id!r}, {self.method.upper()} {self.path!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "operation_id": self.operation_id,
+            "path": self.path,
+            "method": self.method,
+            "parameters": [param._asdict() for param in self.parameters],
+            "body_media_type": self.body_media_type,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OperationRecord":
+        return cls(
+            data["operation_id"],
+            data["path"],
+            data["method"],
+            tuple(ParameterRecord(**param) for param in data.get("parameters", [])),
+            data.get("body_media_type"),
+        )
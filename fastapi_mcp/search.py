@@ -0,0 +1,158 @@
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import mcp.types as types
+
+from fastapi_mcp.openapi.index import OperationIndex
+
+
+SEARCH_TOOLS_TOOL_NAME = "search_tools"
+CALL_TOOL_TOOL_NAME = "call_tool"
+
+SEARCH_TOOLS_TOOL = types.Tool(
+    name=SEARCH_TOOLS_TOOL_NAME,
+    description=(
+        "Search the available API tools by keywords. Returns the best matching tools, with their names, "
+        "descriptions and input schemas. Use `call_tool` to call one of them."
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "query": {"type": "string", "title": "query", "description": "Keywords describing what you want to do"},
+            "limit": {
+                "type": "integer",
+                "title": "limit",
+                "description": "Maximum number of tools to return",
+                "default": 5,
+            },
+        },
+        "required": ["query"],
+        "title": "search_toolsArguments",
+    },
+)
+
+CALL_TOOL_TOOL = types.Tool(
+    name=CALL_TOOL_TOOL_NAME,
+    description="Call one of the API tools found with `search_tools`, by name.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "name": {"type": "string", "title": "name", "description": "The name of the tool to call"},
+            "arguments": {
+                "type": "object",
+                "title": "arguments",
+                "description": "The arguments of the tool, matching its input schema",
+                "default": {},
+            },
+        },
+        "required": ["name"],
+        "title": "call_toolArguments",
+    },
+)
+
+SEARCH_META_TOOLS = [SEARCH_TOOLS_TOOL, CALL_TOOL_TOOL]
+
+_TOKEN_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+_WORD_RE = re.compile(r"[^\W_]+")
+# Han, Hiragana and Katakana characters, written without spaces between words
+_CJK_RE = re.compile(r"([\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+)")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase terms, breaking up snake_case, kebab-case, camelCase and paths.
+
+    Words with non-ASCII letters are kept whole. Chinese and Japanese text is split into overlapping pairs of
+    characters, so that queries match the words it contains.
+    """
+    if text.isascii():
+        return [token.lower() for token in _TOKEN_RE.findall(text)]
+
+    tokens: List[str] = []
+    for word in _WORD_RE.findall(text):
+        # Splitting on a capturing group puts the CJK runs at odd positions
+        for position, part in enumerate(_CJK_RE.split(word)):
+            if not part:
+                continue
+            if position % 2:
+                tokens.extend([part[i : i + 2] for i in range(len(part) - 1)] or [part])
+            elif part.isascii():
+                tokens.extend(token.lower() for token in _TOKEN_RE.findall(part))
+            else:
+                tokens.append(part.lower())
+    return tokens
+
+
+class ToolSearchIndex:
+    """
+    A BM25 inverted index over tools, for keyword search.
+
+    Each tool is indexed by its name, the first line of its description (usually the endpoint summary),
+    the tags of its operation and the names of its parameters. Names and tags are weighted higher than
+    the rest, since they are the most specific.
+    """
+
+    def __init__(
+        self,
+        tools: Sequence[types.Tool],
+        index: Optional[OperationIndex] = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.tools = list(tools)
+
+        # term -> [(document number, term frequency)]
+        frequencies: Dict[str, List[Tuple[int, int]]] = {}
+        doc_lengths: List[int] = []
+
+        for doc, tool in enumerate(self.tools):
+            term_counts = Counter(self._document_terms(tool, index))
+            doc_lengths.append(sum(term_counts.values()))
+            for term, count in term_counts.items():
+                frequencies.setdefault(term, []).append((doc, count))
+
+        # The index is immutable, so the full BM25 score of each (term, document) pair is computed upfront,
+        # and a search only has to add them up.
+        avg_doc_length = sum(doc_lengths) / len(doc_lengths) if doc_lengths else 0.0
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+        for term, postings in frequencies.items():
+            idf = math.log(1 + (len(self.tools) - len(postings) + 0.5) / (len(postings) + 0.5))
+            self._postings[term] = [
+                (doc, idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * doc_lengths[doc] / avg_doc_length)))
+                for doc, tf in postings
+            ]
+
+    @staticmethod
+    def _document_terms(tool: types.Tool, index: Optional[OperationIndex]) -> Iterable[str]:
+        name_terms = tokenize(tool.name)
+        yield from name_terms
+        yield from name_terms
+
+        if index is not None and tool.name in index.operations:
+            operation = index.operations[tool.name]
+            for tag in operation.tags:
+                tag_terms = tokenize(tag)
+                yield from tag_terms
+                yield from tag_terms
+            yield from tokenize(operation.path)
+
+        if tool.description:
+            yield from tokenize(tool.description.split("\n", 1)[0])
+
+        for param_name in tool.inputSchema.get("properties", {}):
+            yield from tokenize(param_name)
+
+    def search(self, query: str, limit: int = 5) -> List[types.Tool]:
+        """
+        Get the tools best matching the query, best first.
+        """
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            for doc, score in self._postings.get(term, ()):
+                scores[doc] = scores.get(doc, 0.0) + score
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [self.tools[doc] for doc, _ in best]
@@ -1,28 +1,113 @@
 import json
+import os
+import time
+import inspect
+import threading
+import anyio
 import httpx
-from typing import Dict, Optional, Any, List, Union, Callable, Awaitable, Iterable, Literal, Sequence
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import (
+    Dict,
+    Optional,
+    Any,
+    AsyncIterator,
+    List,
+    Tuple,
+    Union,
+    Callable,
+    Awaitable,
+    Iterable,
+    Literal,
+    Sequence,
+)
 from typing_extensions import Annotated, Doc
 
-from fastapi import FastAPI, Request, APIRouter, params
+from fastapi import FastAPI, Request, Response, APIRouter, Depends, HTTPException, params
 from fastapi.openapi.utils import get_openapi
-from mcp.server.lowlevel.server import Server
+from fastapi.responses import JSONResponse
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from mcp.server.lowlevel.server import Server, NotificationOptions
+from mcp.shared.exceptions import McpError
 import mcp.types as types
 
+from fastapi_mcp.auth.session import SessionAuthenticator
+from fastapi_mcp.catalog import CatalogBuild, ToolCatalog
+from fastapi_mcp.loop_monitor import EventLoopMonitor
+from fastapi_mcp.manifest import ToolManifest
+from fastapi_mcp.metrics import PROMETHEUS_CONTENT_TYPE, MetricsRegistry
 from fastapi_mcp.openapi.convert import convert_openapi_to_mcp_tools
+from fastapi_mcp.openapi.index import OperationIndex
+from fastapi_mcp.openapi.intern import SchemaInterner
+from fastapi_mcp.openapi.operation import OperationRecord
+from fastapi_mcp.search import CALL_TOOL_TOOL_NAME, SEARCH_TOOLS_TOOL_NAME, ToolSearchIndex
+from fastapi_mcp.tracing import TRACE_CONTEXT_PARAM, SpanContext, Tracer
 from fastapi_mcp.transport.sse import FastApiSseTransport
-from fastapi_mcp.types import HTTPRequestInfo, AuthConfig
+from fastapi_mcp.types import HTTPRequestInfo, AuthConfig, NamePattern, ToolView, WorkerPoolConfig
+from fastapi_mcp.worker_pool import ToolWorkerPool
+from fastapi_mcp.utils.pagination import get_request_cursor
 
 import logging
 
 
 logger = logging.getLogger(__name__)
 
+# Name of the experimental client capability that clients can use to ask for a tool view on initialization,
+# e.g. `{"fastapi-mcp/toolView": {"name": "readonly"}}`
+TOOL_VIEW_CAPABILITY = "fastapi-mcp/toolView"
+
+# The tool view chosen when the session was connected. Handlers of the session's requests run in tasks
+# spawned by `Server.run()`, so they inherit it.
+_session_tool_view: ContextVar[Optional[str]] = ContextVar("fastapi_mcp_session_tool_view", default=None)
+
 
 class LowlevelMCPServer(Server):
+    tracer: Optional[Tracer] = None
+    loop_monitor: Optional[EventLoopMonitor] = None
+
+    async def _handle_request(self, message, req, session, lifespan_context, raise_exceptions):
+        """
+        Mark the request as the activity of its task, so the event loop monitor, if set, can attribute
+        stalls of the event loop to it.
+
+        Overrides a private method of `mcp.server.lowlevel.server.Server`, checked against mcp 1.6. Its
+        signature has to be checked again when upgrading mcp: `test_loop_monitor.py` fails if it changes.
+        """
+        if self.loop_monitor is None:
+            return await super()._handle_request(message, req, session, lifespan_context, raise_exceptions)
+
+        activity = req.method
+        if isinstance(req, types.CallToolRequest):
+            activity = f"{activity}:{req.params.name}"
+
+        self.loop_monitor.start()
+        with self.loop_monitor.activity(activity):
+            return await super()._handle_request(message, req, session, lifespan_context, raise_exceptions)
+
+    def list_tools(self):
+        """
+        A near-direct copy of `mcp.server.lowlevel.server.Server.list_tools()`, except that it passes the
+        pagination cursor of the request to the tool list handler, and lets the handler return a full
+        `ListToolsResult` so it can set `nextCursor`.
+        """
+
+        def decorator(func: Callable[[Optional[str]], Awaitable[types.ListToolsResult]]):
+            logger.debug("Registering handler for ListToolsRequest")
+
+            async def handler(req: types.ListToolsRequest):
+                result = await func(get_request_cursor(req))
+                return types.ServerResult(result)
+
+            self.request_handlers[types.ListToolsRequest] = handler
+            return func
+
+        return decorator
+
     def call_tool(self):
         """
         A near-direct copy of `mcp.server.lowlevel.server.Server.call_tool()`, except that it looks for
-        the original HTTP request info in the MCP message, and passes it to the tool call handler.
+        the original HTTP request info in the MCP message, and passes it to the tool call handler, and that
+        it traces the call if a tracer is set.
         """
 
         def decorator(
@@ -34,6 +119,25 @@ class LowlevelMCPServer(Server):
             logger.debug("Registering handler for CallToolRequest")
 
             async def handler(req: types.CallToolRequest):
+                if self.tracer is None:
+                    return await call(req)
+
+                # The trace context was injected in `FastApiSseTransport.handle_fastapi_post_message()`
+                trace_context = getattr(req.params, TRACE_CONTEXT_PARAM, None) or {}
+                parent = SpanContext.from_traceparent(trace_context.get("traceparent"))
+                if parent is not None and isinstance(trace_context.get("received_at"), (int, float)):
+                    self.tracer.record_span("mcp.queue_wait", trace_context["received_at"], time.time(), parent)
+
+                with self.tracer.start_span(
+                    "mcp.tool.dispatch", parent=parent, attributes={"mcp.tool.name": req.params.name}
+                ) as span:
+                    result = await call(req)
+                    if isinstance(result.root, types.CallToolResult) and result.root.isError:
+                        content = result.root.content[0] if result.root.content else None
+                        span.set_error(content.text if isinstance(content, types.TextContent) else "Tool error")
+                    return result
+
+            async def call(req: types.CallToolRequest) -> types.ServerResult:
                 try:
                     # Pull the original HTTP request info from the MCP message. It was injected in
                     # `FastApiSseTransport.handle_fastapi_post_message()`
@@ -94,25 +198,208 @@ class FastApiMCP:
             ),
         ] = None,
         include_operations: Annotated[
-            Optional[List[str]],
-            Doc("List of operation IDs to include as MCP tools. Cannot be used with exclude_operations."),
+            Optional[Sequence[NamePattern]],
+            Doc(
+                """
+                List of operation IDs to include as MCP tools. Cannot be used with exclude_operations.
+
+                Each item can be an exact operation ID, a glob (e.g. `"get_*"`), a compiled
+                regular expression, or a predicate that takes the operation ID and returns a bool.
+                """
+            ),
         ] = None,
         exclude_operations: Annotated[
-            Optional[List[str]],
-            Doc("List of operation IDs to exclude from MCP tools. Cannot be used with include_operations."),
+            Optional[Sequence[NamePattern]],
+            Doc(
+                """
+                List of operation IDs to exclude from MCP tools. Cannot be used with include_operations.
+
+                Each item can be an exact operation ID, a glob (e.g. `"get_*"`), a compiled
+                regular expression, or a predicate that takes the operation ID and returns a bool.
+                """
+            ),
         ] = None,
         include_tags: Annotated[
-            Optional[List[str]],
-            Doc("List of tags to include as MCP tools. Cannot be used with exclude_tags."),
+            Optional[Sequence[NamePattern]],
+            Doc(
+                """
+                List of tags to include as MCP tools. Cannot be used with exclude_tags.
+
+                Each item can be an exact tag, a glob (e.g. `"admin*"`), a compiled
+                regular expression, or a predicate that takes the tag and returns a bool.
+                """
+            ),
         ] = None,
         exclude_tags: Annotated[
-            Optional[List[str]],
-            Doc("List of tags to exclude from MCP tools. Cannot be used with include_tags."),
+            Optional[Sequence[NamePattern]],
+            Doc(
+                """
+                List of tags to exclude from MCP tools. Cannot be used with include_tags.
+
+                Each item can be an exact tag, a glob (e.g. `"admin*"`), a compiled
+                regular expression, or a predicate that takes the tag and returns a bool.
+                """
+            ),
         ] = None,
         auth_config: Annotated[
             Optional[AuthConfig],
             Doc("Configuration for MCP authentication"),
         ] = None,
+        tools_page_size: Annotated[
+            Optional[int],
+            Doc(
+                """
+                Maximum number of tools to return in a single `tools/list` response.
+
+                If set, the tool list is sorted by tool name and paginated using cursors, as allowed by
+                the MCP spec. If not set, all tools are returned in a single response.
+                """
+            ),
+        ] = None,
+        tool_search: Annotated[
+            bool,
+            Doc(
+                """
+                Whether to expose only two meta-tools, `search_tools` and `call_tool`, instead of all the tools.
+
+                MCP clients tend to degrade when given more than a few dozen tools. With this option, the
+                client searches the tools by keywords (using a local BM25 index over tool names, summaries,
+                tags and parameter names), and calls the ones it needs through `call_tool`.
+                """
+            ),
+        ] = False,
+        tool_views: Annotated[
+            Optional[Dict[str, ToolView]],
+            Doc(
+                """
+                Named subsets of the tools, that can be exposed to some sessions only.
+
+                All the views share the tools converted once for this server. A session uses the view
+                returned by `tool_view_resolver` if any, or else the view named in the `view` query
+                parameter of the connection URL, or else the view named in the `fastapi-mcp/toolView`
+                experimental capability sent by the client on initialization. Sessions without a view
+                get all the tools.
+                """
+            ),
+        ] = None,
+        tool_view_resolver: Annotated[
+            Optional[Callable[[Request], Union[Optional[str], Awaitable[Optional[str]]]]],
+            Doc(
+                """
+                Optional function (sync or async) that gets the connection request, and returns the name of
+                the tool view to use for the session, or None to let the client choose.
+
+                Use it to select the view from the auth claims that your auth dependencies attached to
+                the request (e.g. in `request.state`). A view chosen here cannot be overridden by the client.
+                """
+            ),
+        ] = None,
+        metrics: Annotated[
+            Union[bool, MetricsRegistry],
+            Doc(
+                """
+                Whether to record per-tool metrics (calls, errors by status code, latency histograms, request
+                and response bytes, calls in progress) and session metrics, and serve them in the Prometheus
+                text format at `{mount_path}/metrics`.
+
+                Pass a `MetricsRegistry` to share the metrics of several MCP servers, or to customize the
+                latency buckets.
+                """
+            ),
+        ] = False,
+        tracer: Annotated[
+            Optional[Tracer],
+            Doc(
+                """
+                Optional tracer to record spans of the handling of MCP messages: the receipt of the message,
+                the time it waited to be handled, the dispatch of tool calls, and the API requests they make.
+
+                The trace context is read from the `traceparent` header of the messages, and forwarded to the
+                API in the `traceparent` header of its requests.
+                """
+            ),
+        ] = None,
+        loop_monitor: Annotated[
+            Union[bool, EventLoopMonitor],
+            Doc(
+                """
+                Whether to monitor the lag of the event loop, and log the stack of the event loop thread and
+                the request being handled when something blocks it for too long, e.g. a sync endpoint called
+                from an async one, or heavy schema work.
+
+                Lag samples and stalls are recorded in the metrics of the server, if enabled. Pass an
+                `EventLoopMonitor` to customize the sampling interval and the stall threshold.
+                """
+            ),
+        ] = False,
+        worker_pool: Annotated[
+            Optional[WorkerPoolConfig],
+            Doc(
+                """
+                Optional pool of worker threads to run tool calls on, instead of the event loop that serves
+                the MCP sessions, so slow or blocking endpoints don't stall the sessions. Each worker runs
+                its own event loop and HTTP client.
+
+                Only the calls made with the default HTTP client of the server are offloaded.
+                """
+            ),
+        ] = None,
+        lazy: Annotated[
+            bool,
+            Doc(
+                """
+                Whether to defer generating the OpenAPI schema and converting it into tools until they are
+                first needed, e.g. by the first `tools/list` or `tools/call` request, or until `warmup()` is
+                called, instead of doing it when the MCP server is created.
+
+                This makes creating the MCP server cheap, e.g. for CLI tools, tests or workers that import the
+                module defining it without serving MCP.
+                """
+            ),
+        ] = False,
+        background_warmup: Annotated[
+            bool,
+            Doc(
+                """
+                Whether to build the tools in a background thread started by `mount()`, so the rest of the
+                app starts, and can answer health checks, while they are being built. Implies `lazy`.
+
+                `GET {mount_path}/ready` answers 503 until the tools are built, and MCP requests arriving
+                before wait for the build, up to `warmup_timeout`.
+                """
+            ),
+        ] = False,
+        warmup_timeout: Annotated[
+            Optional[float],
+            Doc(
+                """
+                Maximum time in seconds that requests wait for the tools to be built in lazy mode, before
+                failing. No limit if `None`.
+                """
+            ),
+        ] = 30.0,
+        manifest: Annotated[
+            Optional[Union[str, os.PathLike, ToolManifest]],
+            Doc(
+                """
+                Optional tool manifest, or path to a manifest file, exported with `fastapi-mcp export`. The
+                tools are loaded from it instead of converting the FastAPI app, which makes startup fast for
+                large apps. The operation and tag filters still apply.
+
+                The manifest must be exported again whenever the endpoints of the app change.
+                """
+            ),
+        ] = None,
+        share_schemas: Annotated[
+            bool,
+            Doc(
+                """
+                Whether to hold the subschemas that the input schemas of several tools have in common, like
+                the schema of a model used by many endpoints, once in memory. Saves memory on large apps, at
+                the cost of a slower build of the tools.
+                """
+            ),
+        ] = False,
     ):
         # Validate operation and tag filtering options
         if include_operations is not None and exclude_operations is not None:
@@ -121,8 +408,11 @@ class FastApiMCP:
         if include_tags is not None and exclude_tags is not None:
             raise ValueError("Cannot specify both include_tags and exclude_tags")
 
-        self.operation_map: Dict[str, Dict[str, Any]]
-        self.tools: List[types.Tool]
+        if tools_page_size is not None and tools_page_size < 1:
+            raise ValueError("tools_page_size must be a positive integer")
+
+        self._tool_views = {name: ToolView.model_validate(view) for name, view in (tool_views or {}).items()}
+
         self.server: Server
 
         self.fastapi = fastapi
@@ -137,19 +427,356 @@ class FastApiMCP:
         self._include_tags = include_tags
         self._exclude_tags = exclude_tags
         self._auth_config = auth_config
+        self._tools_page_size = tools_page_size
+        self._tool_search = tool_search
+        self._tool_view_resolver = tool_view_resolver
+        self._manifest = manifest
+        self._share_schemas = share_schemas
+        self._lazy = lazy or background_warmup
+        self._background_warmup = background_warmup
+        self._warmup_timeout = warmup_timeout
+        self._warmup_error: Optional[BaseException] = None
+        self._built_catalog: Optional[ToolCatalog] = None
+        self._catalog_build: Optional[CatalogBuild] = None
+        self._catalog_lock = threading.Lock()
+        self._tracer = tracer
+        self._metrics: Optional[MetricsRegistry] = (
+            metrics if isinstance(metrics, MetricsRegistry) else MetricsRegistry() if metrics else None
+        )
+        self._loop_monitor: Optional[EventLoopMonitor] = (
+            loop_monitor if isinstance(loop_monitor, EventLoopMonitor) else EventLoopMonitor() if loop_monitor else None
+        )
+        if self._loop_monitor is not None and self._loop_monitor.metrics is None:
+            self._loop_monitor.metrics = self._metrics
 
         if self._auth_config:
             self._auth_config = self._auth_config.model_validate(self._auth_config)
 
-        self._http_client = http_client or httpx.AsyncClient(
+        self._http_client = http_client or self._create_asgi_client()
+
+        self._worker_pool_config = WorkerPoolConfig.model_validate(worker_pool) if worker_pool else None
+        self._worker_pool: Optional[ToolWorkerPool] = None
+        if self._worker_pool_config is not None:
+            self._worker_pool = ToolWorkerPool(
+                client_factory=self._worker_pool_config.client_factory or self._create_asgi_client,
+                workers=self._worker_pool_config.workers,
+                max_queue=self._worker_pool_config.max_queue,
+            )
+        # Apps whose lifespan shuts the worker pool down
+        self._worker_pool_apps: List[FastAPI] = []
+
+        # Write streams of the currently connected sessions, used to broadcast notifications
+        self._session_writers: set[MemoryObjectSendStream[types.JSONRPCMessage]] = set()
+
+        self.setup_server()
+
+    @property
+    def tools(self) -> List[types.Tool]:
+        """The MCP tools currently exposed by the server."""
+        return self._catalog.tools
+
+    @property
+    def operation_map(self) -> Dict[str, OperationRecord]:
+        """A mapping from tool names to the details of the operations they call."""
+        return self._catalog.operation_map
+
+    @property
+    def metrics(self) -> Optional[MetricsRegistry]:
+        """The metrics of the server, if enabled."""
+        return self._metrics
+
+    @property
+    def worker_pool(self) -> Optional[ToolWorkerPool]:
+        """The pool of worker threads that tool calls are offloaded to, if enabled."""
+        return self._worker_pool
+
+    @property
+    def loop_monitor(self) -> Optional[EventLoopMonitor]:
+        """The event loop monitor of the server, if enabled."""
+        return self._loop_monitor
+
+    @property
+    def _catalog(self) -> ToolCatalog:
+        catalog = self._built_catalog
+        if catalog is None:
+            # Lazy mode. Async code paths call `warmup()` first, so the build doesn't block the event loop
+            catalog = self._ensure_catalog()
+        return catalog
+
+    @_catalog.setter
+    def _catalog(self, catalog: ToolCatalog) -> None:
+        self._built_catalog = catalog
+
+    def _start_catalog_build(self) -> CatalogBuild:
+        """
+        Start building the catalog in a thread, unless a build is already running, and return the build.
+        """
+        with self._catalog_lock:
+            build = self._catalog_build
+            if build is None:
+                build = self._catalog_build = CatalogBuild(self._run_catalog_build)
+                build.start()
+            return build
+
+    def _run_catalog_build(self) -> ToolCatalog:
+        try:
+            self._built_catalog = self._build_catalog()
+            self._warmup_error = None
+            return self._built_catalog
+        except Exception as e:
+            # Reported by the readiness endpoint until a build succeeds
+            self._warmup_error = e
+            logger.exception("Failed to build the MCP tools")
+            raise
+        finally:
+            # Once done, the built catalog is used, or the next caller tries again after a failure
+            with self._catalog_lock:
+                self._catalog_build = None
+
+    def _ensure_catalog(self, timeout: Optional[float] = None) -> ToolCatalog:
+        """
+        Build the catalog if it isn't built yet, blocking until it is. Concurrent callers wait for a single build.
+
+        Raises:
+            TimeoutError: If the tools are still being built after `timeout` seconds
+        """
+        catalog = self._built_catalog
+        if catalog is not None:
+            return catalog
+        return self._start_catalog_build().wait_sync(timeout)
+
+    async def warmup(self, timeout: Optional[float] = None) -> None:
+        """
+        Build the tools now, in a separate thread, if they aren't built yet.
+
+        Only needed in lazy mode, e.g. in the lifespan of the app, so the first MCP request doesn't pay for
+        the conversion. Waiting for the build doesn't block the event loop, nor a thread of the worker pool.
+
+        Raises:
+            TimeoutError: If the tools are still being built after `timeout` seconds
+        """
+        if self._built_catalog is not None:
+            return
+
+        build = self._start_catalog_build()
+        try:
+            with anyio.fail_after(timeout):
+                await build.wait()
+        except TimeoutError:
+            raise TimeoutError(f"The MCP tools are still being built after {timeout} seconds") from None
+
+    async def _wait_for_tools(self) -> None:
+        """
+        Wait for the tools to be built, up to the warmup timeout, before handling a request that needs them.
+        """
+        try:
+            await self.warmup(self._warmup_timeout)
+        except TimeoutError as e:
+            raise McpError(types.ErrorData(code=types.INTERNAL_ERROR, message=str(e)))
+
+    @property
+    def ready(self) -> bool:
+        """Whether the tools are built, so requests are handled without waiting."""
+        return self._built_catalog is not None
+
+    def _start_background_warmup(self) -> None:
+        # Requests arriving before the build is done wait for it, without holding any thread
+        self._warmup_error = None
+        self._start_catalog_build()
+
+    def setup_server(self) -> None:
+        if self._lazy:
+            # Rebuilt when next needed
+            self._built_catalog = None
+        else:
+            # Swap the whole catalog at once, so handlers never see a mix of old and new tools
+            self._catalog = self._build_catalog()
+
+        mcp_server: LowlevelMCPServer = LowlevelMCPServer(self.name, self.description)
+        mcp_server.tracer = self._tracer
+        mcp_server.loop_monitor = self._loop_monitor
+
+        @mcp_server.list_tools()
+        async def handle_list_tools(cursor: Optional[str] = None) -> types.ListToolsResult:
+            await self._wait_for_tools()
+            return self._session_catalog().tools_cache.get_page(cursor)
+
+        @mcp_server.call_tool()
+        async def handle_call_tool(
+            name: str, arguments: Dict[str, Any], http_request_info: Optional[HTTPRequestInfo] = None
+        ) -> List[Union[types.TextContent, types.ImageContent, types.EmbeddedResource]]:
+            await self._wait_for_tools()
+            catalog = self._session_catalog()
+
+            if catalog.search_index is not None:
+                if name == SEARCH_TOOLS_TOOL_NAME:
+                    return self._search_tools(catalog.search_index, arguments)
+                if name == CALL_TOOL_TOOL_NAME:
+                    if not isinstance(arguments.get("name"), str):
+                        raise ValueError(f"'name' is required when using {CALL_TOOL_TOOL_NAME}")
+                    name, arguments = arguments["name"], arguments.get("arguments") or {}
+
+            return await self._execute_api_tool(
+                client=self._get_tool_client(name),
+                tool_name=name,
+                arguments=arguments,
+                operation_map=catalog.operation_map,
+                http_request_info=http_request_info,
+            )
+
+        self.server = mcp_server
+
+    def _session_catalog(self) -> ToolCatalog:
+        """
+        Get the catalog of the tools exposed to the session of the request being handled.
+        """
+        catalog = self._catalog
+
+        view_name = _session_tool_view.get()
+        if view_name is None:
+            client_params = self.server.request_context.session.client_params
+            experimental = client_params.capabilities.experimental if client_params else None
+            if experimental and TOOL_VIEW_CAPABILITY in experimental:
+                view_name = experimental[TOOL_VIEW_CAPABILITY].get("name")
+
+        if view_name is None:
+            return catalog
+
+        try:
+            return catalog.view(view_name)
+        except KeyError:
+            raise McpError(types.ErrorData(code=types.INVALID_PARAMS, message=f"Unknown tool view: {view_name}"))
+
+    async def _resolve_tool_view(self, request: Request) -> Optional[str]:
+        """
+        Get the name of the tool view requested for a connection, from the tool view resolver or the
+        `view` query parameter.
+        """
+        view_name: Optional[str] = None
+        if self._tool_view_resolver is not None:
+            resolved = self._tool_view_resolver(request)
+            view_name = await resolved if inspect.isawaitable(resolved) else resolved
+
+        if view_name is None:
+            view_name = request.query_params.get("view")
+
+        if view_name is not None and view_name not in self._tool_views:
+            raise HTTPException(status_code=400, detail=f"Unknown tool view: {view_name}")
+
+        return view_name
+
+    def _create_asgi_client(self) -> httpx.AsyncClient:
+        """
+        Create an HTTP client that calls the FastAPI app in-process.
+        """
+        return httpx.AsyncClient(
             transport=httpx.ASGITransport(app=self.fastapi, raise_app_exceptions=False),
             base_url=self._base_url,
             timeout=10.0,
         )
 
-        self.setup_server()
+    def _is_pooled(self, tool_name: str, client: httpx.AsyncClient) -> bool:
+        """
+        Whether a tool call is offloaded to the worker pool.
+        """
+        if self._worker_pool is None or client is not self._http_client:
+            return False
+        pooled_operations = self._catalog.pooled_operations
+        return pooled_operations is None or tool_name in pooled_operations
+
+    def _get_tool_client(self, tool_name: str) -> httpx.AsyncClient:
+        """
+        Get the HTTP client to call the API of a tool with.
+        """
+        return self._http_client
+
+    def _forwards_authorization(self, tool_name: str) -> bool:
+        """
+        Whether to send the `Authorization` header of the MCP client along with the API call of a tool.
+        """
+        return True
+
+    def _search_tools(
+        self, search_index: ToolSearchIndex, arguments: Dict[str, Any]
+    ) -> List[Union[types.TextContent, types.ImageContent, types.EmbeddedResource]]:
+        """
+        Handle a call to the `search_tools` meta-tool.
+        """
+        query = arguments.get("query")
+        if not isinstance(query, str):
+            raise ValueError(f"'query' is required when using {SEARCH_TOOLS_TOOL_NAME}")
+
+        limit = max(1, min(int(arguments.get("limit") or 5), 50))
+        results = [
+            {"name": tool.name, "description": tool.description, "inputSchema": tool.inputSchema}
+            for tool in search_index.search(query, limit=limit)
+        ]
+        return [types.TextContent(type="text", text=json.dumps(results, indent=2, ensure_ascii=False))]
+
+    async def refresh_tools(self) -> bool:
+        """
+        Rebuild the tools from the current routes of the FastAPI app, while the server is running.
+
+        The conversion runs in a worker thread, and the new tools replace the old ones atomically. If the
+        tool list changed, all connected sessions are sent a `notifications/tools/list_changed`
+        notification, so clients can fetch the new tool list without reconnecting.
+
+        Returns:
+            Whether the tool list changed
+        """
+        previous = self._built_catalog
+
+        def build() -> Tuple[ToolCatalog, bool]:
+            catalog = self._build_catalog()
+            # Compare all the tools, not only the listed ones, which are the same meta-tools with tool search.
+            # Hashing serializes all the tools, so it is done here rather than on the event loop.
+            changed = previous is None or catalog.tools_hash != previous.tools_hash
+            return catalog, changed
+
+        catalog, changed = await anyio.to_thread.run_sync(build)
+        self._catalog = catalog
+
+        if not changed:
+            return False
+
+        await self.notify_tools_changed()
+        return True
+
+    async def notify_tools_changed(
+        self,
+        timeout: Annotated[
+            float, Doc("Maximum time in seconds to wait for each session to accept the notification")
+        ] = 5.0,
+    ) -> None:
+        """
+        Send a `notifications/tools/list_changed` notification to all connected sessions, concurrently.
+        """
+        writers = list(self._session_writers)
+        if not writers:
+            return
+
+        logger.debug(f"Notifying {len(writers)} sessions that the tool list changed")
+
+        # The same message object is shared by all sessions
+        notification = types.JSONRPCMessage(
+            types.JSONRPCNotification(jsonrpc="2.0", method="notifications/tools/list_changed")
+        )
+
+        async def send(writer: MemoryObjectSendStream[types.JSONRPCMessage]) -> None:
+            with anyio.move_on_after(timeout):
+                try:
+                    await writer.send(notification)
+                except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+                    self._session_writers.discard(writer)
+
+        async with anyio.create_task_group() as tg:
+            for writer in writers:
+                tg.start_soon(send, writer)
+
+    def _build_catalog(self) -> ToolCatalog:
+        if self._manifest is not None:
+            return self._load_catalog(self._manifest)
 
-    def setup_server(self) -> None:
         openapi_schema = get_openapi(
             title=self.fastapi.title,
             version=self.fastapi.version,
@@ -158,34 +785,101 @@ class FastApiMCP:
             routes=self.fastapi.routes,
         )
 
-        all_tools, self.operation_map = convert_openapi_to_mcp_tools(
+        # Select operations based on operation IDs and tags, so only those get converted
+        index = OperationIndex(openapi_schema)
+        operation_ids = index.select(
+            include_operations=self._include_operations,
+            exclude_operations=self._exclude_operations,
+            include_tags=self._include_tags,
+            exclude_tags=self._exclude_tags,
+        )
+
+        tools, operation_map = convert_openapi_to_mcp_tools(
             openapi_schema,
             describe_all_responses=self._describe_all_responses,
             describe_full_response_schema=self._describe_full_response_schema,
+            operation_ids=operation_ids,
         )
 
-        # Filter tools based on operation IDs and tags
-        self.tools = self._filter_tools(all_tools, openapi_schema)
-
-        mcp_server: LowlevelMCPServer = LowlevelMCPServer(self.name, self.description)
+        return self._make_catalog(tools, operation_map, index)
 
-        @mcp_server.list_tools()
-        async def handle_list_tools() -> List[types.Tool]:
-            return self.tools
+    def _load_catalog(self, manifest: Union[str, os.PathLike, ToolManifest]) -> ToolCatalog:
+        """
+        Build the catalog from the tools of a manifest, instead of converting the app.
+        """
+        if not isinstance(manifest, ToolManifest):
+            manifest = ToolManifest.load(manifest)
 
-        @mcp_server.call_tool()
-        async def handle_call_tool(
-            name: str, arguments: Dict[str, Any], http_request_info: Optional[HTTPRequestInfo] = None
-        ) -> List[Union[types.TextContent, types.ImageContent, types.EmbeddedResource]]:
-            return await self._execute_api_tool(
-                client=self._http_client,
-                tool_name=name,
-                arguments=arguments,
-                operation_map=self.operation_map,
-                http_request_info=http_request_info,
+        if (manifest.describe_all_responses, manifest.describe_full_response_schema) != (
+            self._describe_all_responses,
+            self._describe_full_response_schema,
+        ):
+            raise ValueError(
+                "The tool manifest was exported with different describe_all_responses or "
+                "describe_full_response_schema options than the MCP server's"
             )
 
-        self.server = mcp_server
+        index = manifest.index()
+        operation_ids = index.select(
+            include_operations=self._include_operations,
+            exclude_operations=self._exclude_operations,
+            include_tags=self._include_tags,
+            exclude_tags=self._exclude_tags,
+        )
+        if operation_ids is None:
+            return self._make_catalog(manifest.tools, manifest.operation_map, index)
+
+        tools = [tool for tool in manifest.tools if tool.name in operation_ids]
+        operation_map = {name: operation for name, operation in manifest.operation_map.items() if name in operation_ids}
+        return self._make_catalog(tools, operation_map, index)
+
+    def _make_catalog(
+        self, tools: List[types.Tool], operation_map: Dict[str, OperationRecord], index: OperationIndex
+    ) -> ToolCatalog:
+        if self._share_schemas:
+            interner = SchemaInterner()
+            tools = [tool.model_copy(update={"inputSchema": interner.intern(tool.inputSchema)}) for tool in tools]
+
+        search_index = ToolSearchIndex(tools, index) if self._tool_search else None
+
+        # The tool list only changes here, so this is also where the cached responses get invalidated
+        return ToolCatalog(
+            tools,
+            operation_map,
+            index,
+            page_size=self._tools_page_size,
+            search_index=search_index,
+            views=self._tool_views,
+            pooled_view=self._worker_pool_config.tools if self._worker_pool_config is not None else None,
+        )
+
+    async def _run_session(
+        self,
+        reader: MemoryObjectReceiveStream[types.JSONRPCMessage | Exception],
+        writer: MemoryObjectSendStream[types.JSONRPCMessage],
+        tool_view: Optional[str] = None,
+    ) -> None:
+        """
+        Run an MCP session over the given streams, until the client disconnects.
+        """
+        if self._loop_monitor is not None:
+            self._loop_monitor.start()
+
+        self._session_writers.add(writer)
+        tool_view_token = _session_tool_view.set(tool_view)
+        try:
+            await self.server.run(
+                reader,
+                writer,
+                self.server.create_initialization_options(
+                    notification_options=NotificationOptions(tools_changed=True),
+                    experimental_capabilities={},
+                ),
+                raise_exceptions=False,
+            )
+        finally:
+            _session_tool_view.reset(tool_view_token)
+            self._session_writers.discard(writer)
 
     def _register_mcp_connection_endpoint_sse(
         self,
@@ -196,13 +890,9 @@ class FastApiMCP:
     ):
         @router.get(mount_path, include_in_schema=False, operation_id="mcp_connection", dependencies=dependencies)
         async def handle_mcp_connection(request: Request):
-            async with transport.connect_sse(request.scope, request.receive, request._send) as (reader, writer):
-                await self.server.run(
-                    reader,
-                    writer,
-                    self.server.create_initialization_options(notification_options=None, experimental_capabilities={}),
-                    raise_exceptions=False,
-                )
+            tool_view = await self._resolve_tool_view(request)
+            async with transport.connect_fastapi_sse(request) as (reader, writer):
+                await self._run_session(reader, writer, tool_view=tool_view)
 
     def _register_mcp_messages_endpoint_sse(
         self,
@@ -211,15 +901,82 @@ class FastApiMCP:
         mount_path: str,
         dependencies: Optional[Sequence[params.Depends]],
     ):
+        # With session auth, the dependencies already ran when the session was established
         @router.post(
             f"{mount_path}/messages/",
             include_in_schema=False,
             operation_id="mcp_messages",
-            dependencies=dependencies,
+            dependencies=None if transport.session_authenticator else dependencies,
         )
         async def handle_post_message(request: Request):
             return await transport.handle_fastapi_post_message(request)
 
+    def _register_mcp_tools_endpoint(
+        self,
+        router: FastAPI | APIRouter,
+        mount_path: str,
+        dependencies: Optional[Sequence[params.Depends]],
+    ):
+        """
+        Serve the cached `tools/list` result over plain HTTP, with an ETag derived from the tool list
+        content hash, so clients and proxies can cheaply detect an unchanged tool list.
+        """
+
+        @router.get(f"{mount_path}/tools", include_in_schema=False, operation_id="mcp_tools", dependencies=dependencies)
+        async def handle_list_tools(request: Request, cursor: Optional[str] = None):
+            tool_view = await self._resolve_tool_view(request)
+            try:
+                await self.warmup(self._warmup_timeout)
+            except TimeoutError as e:
+                raise HTTPException(status_code=503, detail=str(e))
+            catalog = self._catalog.view(tool_view) if tool_view is not None else self._catalog
+            tools_cache = catalog.tools_cache
+            headers = {"ETag": tools_cache.etag, "Cache-Control": "no-cache"}
+
+            if_none_match = request.headers.get("if-none-match")
+            if if_none_match and tools_cache.etag in [tag.strip() for tag in if_none_match.split(",")]:
+                return Response(status_code=304, headers=headers)
+
+            try:
+                content = tools_cache.get_page_bytes(cursor)
+            except McpError as e:
+                raise HTTPException(status_code=400, detail=e.error.message)
+
+            return Response(content=content, media_type="application/json", headers=headers)
+
+    def _register_mcp_metrics_endpoint(
+        self,
+        router: FastAPI | APIRouter,
+        mount_path: str,
+        metrics: MetricsRegistry,
+        dependencies: Optional[Sequence[params.Depends]],
+    ):
+        @router.get(
+            f"{mount_path}/metrics", include_in_schema=False, operation_id="mcp_metrics", dependencies=dependencies
+        )
+        async def handle_metrics():
+            return Response(content=metrics.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    def _register_mcp_readiness_endpoint(
+        self,
+        router: FastAPI | APIRouter,
+        mount_path: str,
+    ):
+        """
+        Serve a readiness probe, that succeeds once the tools are built. It doesn't need auth, as it only
+        exposes the number of tools.
+        """
+
+        @router.get(f"{mount_path}/ready", include_in_schema=False, operation_id="mcp_ready")
+        async def handle_ready():
+            catalog = self._built_catalog
+            if catalog is not None:
+                return JSONResponse({"ready": True, "tools": len(catalog.tools)})
+
+            if self._warmup_error is not None:
+                return JSONResponse({"ready": False, "error": "Failed to build the tools"}, status_code=503)
+            return JSONResponse({"ready": False}, status_code=503)
+
     def _register_mcp_endpoints_sse(
         self,
         router: FastAPI | APIRouter,
@@ -273,6 +1030,15 @@ class FastApiMCP:
                         client_secret=self._auth_config.client_secret,
                     )
 
+    def _get_auth_dependencies(self) -> Optional[Sequence[params.Depends]]:
+        if not self._auth_config:
+            return None
+
+        dependencies = list(self._auth_config.dependencies or [])
+        if self._auth_config.token_verifier is not None:
+            dependencies.insert(0, Depends(self._auth_config.token_verifier))
+        return dependencies or None
+
     def _setup_auth(self):
         if self._auth_config:
             if self._auth_config.version == "2025-03-26":
@@ -337,9 +1103,24 @@ class FastApiMCP:
 
         messages_path = f"{base_path}{mount_path}/messages/"
 
-        sse_transport = FastApiSseTransport(messages_path)
+        session_authenticator = None
+        if self._auth_config and self._auth_config.session_auth:
+            session_authenticator = SessionAuthenticator(
+                max_age=self._auth_config.session_max_age,
+                is_revoked=self._auth_config.is_session_revoked,
+                credential_headers=self._auth_config.session_credential_headers,
+            )
+
+        sse_transport = FastApiSseTransport(
+            messages_path, session_authenticator=session_authenticator, metrics=self._metrics, tracer=self._tracer
+        )
+
+        dependencies = self._get_auth_dependencies()
 
-        dependencies = self._auth_config.dependencies if self._auth_config else None
+        self._register_mcp_tools_endpoint(router, mount_path, dependencies)
+        self._register_mcp_readiness_endpoint(router, mount_path)
+        if self._metrics is not None:
+            self._register_mcp_metrics_endpoint(router, mount_path, self._metrics, dependencies)
 
         if transport == "sse":
             self._register_mcp_endpoints_sse(router, sse_transport, mount_path, dependencies)
@@ -356,14 +1137,43 @@ class FastApiMCP:
         if isinstance(router, APIRouter):
             self.fastapi.include_router(router)
 
+        if self._background_warmup and self._built_catalog is None:
+            self._start_background_warmup()
+
+        if self._worker_pool is not None:
+            self._shutdown_worker_pool_with(router if isinstance(router, FastAPI) else self.fastapi)
+
         logger.info(f"MCP server listening at {mount_path}")
 
+    def _shutdown_worker_pool_with(self, app: FastAPI) -> None:
+        """
+        Shut the worker pool down when the lifespan of the app serving the MCP server ends, so its threads and
+        their HTTP clients don't outlive the app. Works with both `lifespan` and shutdown event handlers.
+        """
+        pool = self._worker_pool
+        if pool is None or any(hooked is app for hooked in self._worker_pool_apps):
+            return
+        self._worker_pool_apps.append(app)
+
+        lifespan_context = app.router.lifespan_context
+
+        @asynccontextmanager
+        async def lifespan(app: Any) -> AsyncIterator[Any]:
+            try:
+                async with lifespan_context(app) as state:
+                    yield state
+            finally:
+                # Waits for the calls the workers are running, so it doesn't block the event loop
+                await anyio.to_thread.run_sync(pool.shutdown)
+
+        app.router.lifespan_context = lifespan
+
     async def _execute_api_tool(
         self,
         client: Annotated[httpx.AsyncClient, Doc("httpx client to use in API calls")],
         tool_name: Annotated[str, Doc("The name of the tool to execute")],
         arguments: Annotated[Dict[str, Any], Doc("The arguments for the tool")],
-        operation_map: Annotated[Dict[str, Dict[str, Any]], Doc("A mapping from tool names to operation details")],
+        operation_map: Annotated[Dict[str, OperationRecord], Doc("A mapping from tool names to operation details")],
         http_request_info: Annotated[
             Optional[HTTPRequestInfo],
             Doc("HTTP request info to forward to the actual API call"),
@@ -379,35 +1189,23 @@ class FastApiMCP:
             raise Exception(f"Unknown tool: {tool_name}")
 
         operation = operation_map[tool_name]
-        path: str = operation["path"]
-        method: str = operation["method"]
-        parameters: List[Dict[str, Any]] = operation.get("parameters", [])
+        path = operation.path
+        method = operation.method
         arguments = arguments.copy() if arguments else {}  # Deep copy arguments to avoid mutating the original
 
-        for param in parameters:
-            if param.get("in") == "path" and param.get("name") in arguments:
-                param_name = param.get("name", None)
-                if param_name is None:
-                    raise ValueError(f"Parameter name is None for parameter: {param}")
-                path = path.replace(f"{{{param_name}}}", str(arguments.pop(param_name)))
-
         query = {}
-        for param in parameters:
-            if param.get("in") == "query" and param.get("name") in arguments:
-                param_name = param.get("name", None)
-                if param_name is None:
-                    raise ValueError(f"Parameter name is None for parameter: {param}")
-                query[param_name] = arguments.pop(param_name)
-
         headers = {}
-        for param in parameters:
-            if param.get("in") == "header" and param.get("name") in arguments:
-                param_name = param.get("name", None)
-                if param_name is None:
-                    raise ValueError(f"Parameter name is None for parameter: {param}")
-                headers[param_name] = arguments.pop(param_name)
-
-        if http_request_info and http_request_info.headers:
+        for param in operation.parameters:
+            if param.name not in arguments:
+                continue
+            if param.location == "path":
+                path = path.replace(f"{{{param.name}}}", str(arguments.pop(param.name)))
+            elif param.location == "query":
+                query[param.name] = arguments.pop(param.name)
+            elif param.location == "header":
+                headers[param.name] = arguments.pop(param.name)
+
+        if http_request_info and http_request_info.headers and self._forwards_authorization(tool_name):
             if "Authorization" in http_request_info.headers:
                 headers["Authorization"] = http_request_info.headers["Authorization"]
             elif "authorization" in http_request_info.headers:
@@ -415,9 +1213,22 @@ class FastApiMCP:
 
         body = arguments if arguments else None
 
+        pooled = self._is_pooled(tool_name, client)
+        metrics = self._metrics
+        started_at = metrics.call_started(tool_name) if metrics is not None else 0.0
+        response = None
         try:
             logger.debug(f"Making {method.upper()} request to {path}")
-            response = await self._request(client, method, path, query, headers, body)
+            try:
+                if self._tracer is None:
+                    response = await self._request(client, method, path, query, headers, body, pooled)
+                else:
+                    response = await self._traced_request(
+                        client, method, path, operation.path, query, headers, body, pooled
+                    )
+            finally:
+                if metrics is not None:
+                    metrics.call_finished(tool_name, started_at, response)
 
             # TODO: Better typing for the AsyncClientProtocol. It should return a ResponseProtocol that has a json() method that returns a dict/list/etc.
             try:
@@ -445,6 +1256,29 @@ class FastApiMCP:
             logger.exception(f"Error calling {tool_name}")
             raise e
 
+    async def _traced_request(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        path: str,
+        route: str,
+        query: Dict[str, Any],
+        headers: Dict[str, str],
+        body: Optional[Any],
+        pooled: bool = False,
+    ) -> Any:
+        assert self._tracer is not None
+        attributes = {"http.request.method": method.upper(), "http.route": route, "url.path": path}
+        with self._tracer.start_span("mcp.upstream.request", attributes=attributes) as span:
+            # Propagate the trace to the API, so its own spans are children of this one
+            headers = {**headers, "traceparent": span.context.to_traceparent()}
+            response = await self._request(client, method, path, query, headers, body, pooled)
+            status_code = getattr(response, "status_code", None)
+            span.set_attribute("http.response.status_code", status_code)
+            if status_code is not None and status_code >= 500:
+                span.set_error(f"HTTP {status_code}")
+            return response
+
     async def _request(
         self,
         client: httpx.AsyncClient,
@@ -453,7 +1287,15 @@ class FastApiMCP:
         query: Dict[str, Any],
         headers: Dict[str, str],
         body: Optional[Any],
+        pooled: bool = False,
     ) -> Any:
+        if pooled:
+            assert self._worker_pool is not None
+            # Made by the worker, with its own client, in its own event loop
+            return await self._worker_pool.run(
+                lambda worker_client: self._request(worker_client, method, path, query, headers, body)
+            )
+
         if method.lower() == "get":
             return await client.get(path, params=query, headers=headers)
         elif method.lower() == "post":
@@ -466,67 +1308,3 @@ class FastApiMCP:
             return await client.patch(path, params=query, headers=headers, json=body)
         else:
             raise ValueError(f"Unsupported HTTP method: {method}")
-
-    def _filter_tools(self, tools: List[types.Tool], openapi_schema: Dict[str, Any]) -> List[types.Tool]:
-        """
-        Filter tools based on operation IDs and tags.
-
-        Args:
-            tools: List of tools to filter
-            openapi_schema: The OpenAPI schema
-
-        Returns:
-            Filtered list of tools
-        """
-        if (
-            self._include_operations is None
-            and self._exclude_operations is None
-            and self._include_tags is None
-            and self._exclude_tags is None
-        ):
-            return tools
-
-        operations_by_tag: Dict[str, List[str]] = {}
-        for path, path_item in openapi_schema.get("paths", {}).items():
-            for method, operation in path_item.items():
-                if method not in ["get", "post", "put", "delete", "patch"]:
-                    continue
-
-                operation_id = operation.get("operationId")
-                if not operation_id:
-                    continue
-
-                tags = operation.get("tags", [])
-                for tag in tags:
-                    if tag not in operations_by_tag:
-                        operations_by_tag[tag] = []
-                    operations_by_tag[tag].append(operation_id)
-
-        operations_to_include = set()
-
-        if self._include_operations is not None:
-            operations_to_include.update(self._include_operations)
-        elif self._exclude_operations is not None:
-            all_operations = {tool.name for tool in tools}
-            operations_to_include.update(all_operations - set(self._exclude_operations))
-
-        if self._include_tags is not None:
-            for tag in self._include_tags:
-                operations_to_include.update(operations_by_tag.get(tag, []))
-        elif self._exclude_tags is not None:
-            excluded_operations = set()
-            for tag in self._exclude_tags:
-                excluded_operations.update(operations_by_tag.get(tag, []))
-
-            all_operations = {tool.name for tool in tools}
-            operations_to_include.update(all_operations - excluded_operations)
-
-        filtered_tools = [tool for tool in tools if tool.name in operations_to_include]
-
-        if filtered_tools:
-            filtered_operation_ids = {tool.name for tool in filtered_tools}
-            self.operation_map = {
-                op_id: details for op_id, details in self.operation_map.items() if op_id in filtered_operation_ids
-            }
-
-        return filtered_tools
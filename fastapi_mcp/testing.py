@@ -0,0 +1,189 @@
+import random
+import statistics
+import time
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Union
+
+import anyio
+import mcp.types as types
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from mcp.client.session import ClientSession, MessageHandlerFnT
+from mcp.shared.memory import create_client_server_memory_streams
+
+from fastapi_mcp.server import FastApiMCP
+from fastapi_mcp.types import BaseType, HTTPRequestInfo
+
+
+async def _inject_request_info(
+    client_messages: MemoryObjectReceiveStream[types.JSONRPCMessage],
+    server_write: MemoryObjectSendStream[types.JSONRPCMessage],
+    headers: Dict[str, str],
+) -> None:
+    # Does what `FastApiSseTransport.handle_fastapi_post_message()` does for messages posted over HTTP
+    async with client_messages:
+        async for message in client_messages:
+            params = getattr(message.root, "params", None)
+            if params is not None:
+                params["_http_request_info"] = HTTPRequestInfo(
+                    method="POST",
+                    path="/mcp/messages/",
+                    headers=headers,
+                    cookies={},
+                    query_params={},
+                    body=message.model_dump_json(by_alias=True, exclude_none=True),
+                ).model_dump(mode="json")
+            await server_write.send(message)
+
+
+@asynccontextmanager
+async def connect_in_memory(
+    mcp: FastApiMCP,
+    tool_view: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+    read_timeout_seconds: Optional[timedelta] = None,
+    message_handler: Optional[MessageHandlerFnT] = None,
+) -> AsyncIterator[ClientSession]:
+    """
+    Connect an initialized MCP client session to an MCP server through memory streams.
+
+    The session is run by the server like an SSE session, so tool views and notifications work the same.
+
+    Args:
+        mcp: The MCP server to connect to
+        tool_view: The tool view of the session, as if chosen when connecting
+        headers: HTTP headers to attach to every message, as if posted over HTTP. The `Authorization` header
+            is forwarded to the API by tool calls.
+        read_timeout_seconds: Timeout of the requests of the client
+        message_handler: Handler of the notifications sent by the server
+    """
+    async with create_client_server_memory_streams() as (client_streams, server_streams):
+        client_read, client_write = client_streams
+        server_read, server_write = server_streams
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(mcp._run_session, server_read, server_write, tool_view)
+
+            if headers is not None:
+                relay_write, relay_read = anyio.create_memory_object_stream[types.JSONRPCMessage](1)
+                tg.start_soon(_inject_request_info, relay_read, client_write, headers)
+                client_write = relay_write
+
+            try:
+                async with ClientSession(
+                    read_stream=client_read,
+                    write_stream=client_write,
+                    read_timeout_seconds=read_timeout_seconds,
+                    message_handler=message_handler,
+                ) as session:
+                    await session.initialize()
+                    yield session
+            finally:
+                tg.cancel_scope.cancel()
+
+
+class ToolCallSpec(BaseType):
+    """
+    A tool call of the mix of a load test.
+    """
+
+    name: str
+    arguments: Union[Dict[str, Any], Callable[[random.Random], Dict[str, Any]]] = {}
+    weight: float = 1.0
+
+    def make_arguments(self, rng: random.Random) -> Dict[str, Any]:
+        return self.arguments(rng) if callable(self.arguments) else dict(self.arguments)
+
+
+class LatencyStats(BaseType):
+    calls: int
+    errors: int
+    mean_ms: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+
+    @classmethod
+    def from_samples(cls, samples: Sequence[float], errors: int) -> "LatencyStats":
+        ordered = sorted(samples) or [0.0]
+
+        def percentile(p: float) -> float:
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+        return cls(
+            calls=len(samples),
+            errors=errors,
+            mean_ms=statistics.fmean(ordered) * 1000,
+            p50_ms=percentile(0.50),
+            p90_ms=percentile(0.90),
+            p99_ms=percentile(0.99),
+            max_ms=ordered[-1] * 1000,
+        )
+
+
+class LoadTestResult(BaseType):
+    sessions: int
+    calls: int
+    errors: int
+    elapsed: float
+    overall: LatencyStats
+    tools: Dict[str, LatencyStats]
+
+    @property
+    def calls_per_second(self) -> float:
+        return self.calls / self.elapsed if self.elapsed else 0.0
+
+
+async def run_load(
+    mcp: FastApiMCP,
+    tool_mix: Sequence[ToolCallSpec],
+    sessions: int = 10,
+    calls_per_session: int = 100,
+    tool_view: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+    seed: Optional[int] = None,
+) -> LoadTestResult:
+    """
+    Simulate concurrent MCP sessions, each calling tools picked from the mix according to their weights, one
+    at a time like an MCP client does, and measure the latency of the calls.
+
+    Calls returning an error result, or raising, are counted as errors.
+    """
+    if not tool_mix:
+        raise ValueError("tool_mix cannot be empty")
+
+    rng = random.Random(seed)
+    weights = [spec.weight for spec in tool_mix]
+    samples: Dict[str, List[float]] = {spec.name: [] for spec in tool_mix}
+    errors: Dict[str, int] = {spec.name: 0 for spec in tool_mix}
+
+    async def run_session(session_rng: random.Random) -> None:
+        async with connect_in_memory(mcp, tool_view=tool_view, headers=headers) as session:
+            for spec in session_rng.choices(tool_mix, weights=weights, k=calls_per_session):
+                arguments = spec.make_arguments(session_rng)
+                start = time.perf_counter()
+                try:
+                    result = await session.call_tool(spec.name, arguments)
+                    failed = result.isError
+                except Exception:
+                    failed = True
+                samples[spec.name].append(time.perf_counter() - start)
+                errors[spec.name] += failed
+
+    start = time.perf_counter()
+    async with anyio.create_task_group() as tg:
+        for _ in range(sessions):
+            tg.start_soon(run_session, random.Random(rng.random()))
+    elapsed = time.perf_counter() - start
+
+    all_samples = [sample for tool_samples in samples.values() for sample in tool_samples]
+    total_errors = sum(errors.values())
+    return LoadTestResult(
+        sessions=sessions,
+        calls=len(all_samples),
+        errors=total_errors,
+        elapsed=elapsed,
+        overall=LatencyStats.from_samples(all_samples, total_errors),
+        tools={name: LatencyStats.from_samples(samples[name], errors[name]) for name in samples},
+    )
@@ -0,0 +1,181 @@
+import random
+import re
+from abc import ABC, abstractmethod
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+# Name of the key of the MCP message params that carries the trace context from the transport to the handlers
+TRACE_CONTEXT_PARAM = "_trace_context"
+
+_TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("fastapi_mcp_current_span", default=None)
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    trace_id: str
+    span_id: str
+
+    def to_traceparent(self) -> str:
+        """
+        Format the context as a W3C `traceparent` header.
+        """
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    @classmethod
+    def from_traceparent(cls, header: Optional[str]) -> Optional["SpanContext"]:
+        """
+        Parse a W3C `traceparent` header, returning `None` if it is missing or invalid.
+        """
+        match = _TRACEPARENT_PATTERN.match(header.strip().lower()) if header else None
+        if match is None or set(match.group(1)) == {"0"} or set(match.group(2)) == {"0"}:
+            return None
+        return cls(trace_id=match.group(1), span_id=match.group(2))
+
+
+@dataclass
+class Span:
+    name: str
+    context: SpanContext
+    parent_id: Optional[str] = None
+    start_time: float = field(default_factory=time.time)
+    end_time: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        return self.end_time - self.start_time if self.end_time is not None else None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, error: Any) -> None:
+        self.status = "error"
+        self.error = str(error)
+
+
+class SpanExporter(ABC):
+    """
+    Receives the finished spans of a `Tracer`. Subclass it to send spans to your tracing backend.
+
+    `export()` is called synchronously when a span ends, so it should only queue the span.
+    """
+
+    @abstractmethod
+    def export(self, span: Span) -> None:
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    """
+    Keeps the finished spans in memory. Useful for tests.
+    """
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def get_finished_spans(self, name: Optional[str] = None) -> List[Span]:
+        return [span for span in self.spans if name is None or span.name == name]
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+
+class LoggingSpanExporter(SpanExporter):
+    """
+    Logs the finished spans at debug level.
+    """
+
+    def export(self, span: Span) -> None:
+        logger.debug(
+            f"Span {span.name} ({span.context.trace_id}/{span.context.span_id}) took "
+            f"{(span.duration or 0) * 1000:.2f}ms, status={span.status}, attributes={span.attributes}"
+        )
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Tracer:
+    """
+    Creates spans for the steps of handling MCP messages, and passes them to an exporter when they end.
+    """
+
+    def __init__(self, exporter: SpanExporter):
+        self.exporter = exporter
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        return _current_span.get()
+
+    def _new_span(self, name: str, parent: Optional[SpanContext], attributes: Optional[Dict[str, Any]]) -> Span:
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current is not None else None
+        trace_id = parent.trace_id if parent is not None else _new_id(128)
+        return Span(
+            name=name,
+            context=SpanContext(trace_id=trace_id, span_id=_new_id(64)),
+            parent_id=parent.span_id if parent is not None else None,
+            attributes=dict(attributes or {}),
+        )
+
+    def _end(self, span: Span, end_time: Optional[float] = None) -> None:
+        span.end_time = end_time if end_time is not None else time.time()
+        try:
+            self.exporter.export(span)
+        except Exception:
+            logger.exception(f"Failed to export span {span.name}")
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[SpanContext] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Span]:
+        """
+        Start a span, that is the current span until the end of the block, and a child of `parent` if given,
+        or else of the current span. Exceptions raised in the block mark the span as failed.
+        """
+        span = self._new_span(name, parent, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self._end(span)
+
+    def record_span(
+        self,
+        name: str,
+        start_time: float,
+        end_time: float,
+        parent: Optional[SpanContext] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Span:
+        """
+        Record a span that already ended, e.g. the time a message waited in a queue.
+        """
+        span = self._new_span(name, parent, attributes)
+        span.start_time = start_time
+        self._end(span, end_time)
+        return span
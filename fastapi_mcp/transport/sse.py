@@ -1,20 +1,85 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from uuid import UUID
 import logging
-from typing import Union
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
-from anyio.streams.memory import MemoryObjectSendStream
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
 from fastapi import Request, Response, BackgroundTasks, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 from mcp.server.sse import SseServerTransport
-from mcp.types import JSONRPCMessage, JSONRPCError, ErrorData
-from fastapi_mcp.types import HTTPRequestInfo
+from mcp.types import JSONRPCMessage, JSONRPCRequest, JSONRPCError, ErrorData
+from fastapi_mcp.auth.session import SessionAuthenticator
+from fastapi_mcp.metrics import MetricsRegistry
+from fastapi_mcp.tracing import TRACE_CONTEXT_PARAM, SpanContext, Tracer
+from fastapi_mcp.types import HTTPRequestInfo, SessionPrincipal
 
 
 logger = logging.getLogger(__name__)
 
 
+# The IDs of the sessions created by `connect_sse` in the current context
+_created_sessions: ContextVar[Optional[List[UUID]]] = ContextVar("fastapi_mcp_created_sessions", default=None)
+
+
+class _SessionWriters(Dict[UUID, Any]):
+    """
+    `SseServerTransport.connect_sse` doesn't expose the ID of the session it creates, so it is recorded when
+    the session is registered.
+    """
+
+    def __setitem__(self, session_id: UUID, writer: Any) -> None:
+        super().__setitem__(session_id, writer)
+        created = _created_sessions.get()
+        if created is not None:
+            created.append(session_id)
+
+
 class FastApiSseTransport(SseServerTransport):
+    def __init__(
+        self,
+        endpoint: str,
+        session_authenticator: Optional[SessionAuthenticator] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        tracer: Optional[Tracer] = None,
+    ):
+        super().__init__(endpoint)
+        self._read_stream_writers = _SessionWriters()
+        self._session_principals: Dict[UUID, SessionPrincipal] = {}
+        self.session_authenticator = session_authenticator
+        self.metrics = metrics
+        self.tracer = tracer
+
+    @asynccontextmanager
+    async def connect_fastapi_sse(
+        self, request: Request
+    ) -> AsyncIterator[Tuple[MemoryObjectReceiveStream, MemoryObjectSendStream]]:
+        """
+        Establish an SSE session for a FastAPI request, binding the authenticated principal of the request to
+        the session if a session authenticator is set.
+        """
+        principal = self.session_authenticator.bind(request) if self.session_authenticator else None
+
+        created: List[UUID] = []
+        token = _created_sessions.set(created)
+        try:
+            async with self.connect_sse(request.scope, request.receive, request._send) as streams:
+                if principal is not None:
+                    self._session_principals.update((session_id, principal) for session_id in created)
+                if self.metrics is not None:
+                    self.metrics.session_opened()
+                try:
+                    yield streams
+                finally:
+                    for session_id in created:
+                        self._session_principals.pop(session_id, None)
+                    if self.metrics is not None:
+                        self.metrics.session_closed()
+        finally:
+            _created_sessions.reset(token)
+
     async def handle_fastapi_post_message(self, request: Request) -> Response:
         """
         A reimplementation of the handle_post_message method of SseServerTransport
@@ -33,7 +98,16 @@ class FastApiSseTransport(SseServerTransport):
         tracing tools like Sentry, which had destructive effects on the request object
         when using the original implementation.
         """
+        if self.tracer is None:
+            return await self._handle_fastapi_post_message(request)
+
+        parent = SpanContext.from_traceparent(request.headers.get("traceparent"))
+        with self.tracer.start_span("mcp.message.receive", parent=parent) as span:
+            response = await self._handle_fastapi_post_message(request)
+            span.set_attribute("http.status_code", response.status_code)
+            return response
 
+    async def _handle_fastapi_post_message(self, request: Request) -> Response:
         logger.debug("Handling POST message SSE")
 
         session_id_param = request.query_params.get("session_id")
@@ -53,12 +127,26 @@ class FastApiSseTransport(SseServerTransport):
             logger.warning(f"Could not find session for ID: {session_id}")
             raise HTTPException(status_code=404, detail="Could not find session")
 
+        # The full auth dependencies ran when the session was established, only check the session binding
+        if self.session_authenticator is not None:
+            await self.session_authenticator.check(self._session_principals.get(session_id), request)
+
         body = await request.body()
         logger.debug(f"Received JSON: {body.decode()}")
 
         try:
             message = JSONRPCMessage.model_validate_json(body)
 
+            # Older versions of the `mcp` package read the pagination cursor from the top level of the
+            # request instead of from `params`, where the spec puts it. Mirror it so both work.
+            if (
+                isinstance(message.root, JSONRPCRequest)
+                and message.root.method == "tools/list"
+                and message.root.params is not None
+                and "cursor" in message.root.params
+            ):
+                setattr(message.root, "cursor", message.root.params["cursor"])
+
             # HACK to inject the HTTP request info into the MCP message,
             # so we can use it for auth.
             # It is then used in our custom `LowlevelMCPServer.call_tool()` decorator.
@@ -72,9 +160,21 @@ class FastApiSseTransport(SseServerTransport):
                     body=body.decode(),
                 ).model_dump(mode="json")
 
+                # Pass the trace context to the handlers, so they can measure how long the message was queued
+                span = Tracer.current_span()
+                if span is not None:
+                    span.set_attribute("mcp.session_id", session_id.hex)
+                    span.set_attribute("mcp.method", getattr(message.root, "method", None))
+                    message.root.params[TRACE_CONTEXT_PARAM] = {
+                        "traceparent": span.context.to_traceparent(),
+                        "received_at": time.time(),
+                    }
+
             logger.debug(f"Validated client message: {message}")
         except ValidationError as err:
             logger.error(f"Failed to parse message: {err}")
+            if self.metrics is not None:
+                self.metrics.message_received(len(body), error=True)
             # Create background task to send error
             background_tasks = BackgroundTasks()
             background_tasks.add_task(self._send_message_safely, writer, err)
@@ -85,6 +185,9 @@ class FastApiSseTransport(SseServerTransport):
             logger.error(f"Error processing request body: {e}")
             raise HTTPException(status_code=400, detail="Invalid request body")
 
+        if self.metrics is not None:
+            self.metrics.message_received(len(body))
+
         # Create background task to send message
         background_tasks = BackgroundTasks()
         background_tasks.add_task(self._send_message_safely, writer, message)
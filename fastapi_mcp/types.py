@@ -1,5 +1,5 @@
 import time
-from typing import Any, Dict, Annotated, Union, Optional, Sequence, Literal, List
+from typing import Any, Awaitable, Callable, Dict, Annotated, Pattern, Union, Optional, Sequence, Literal, List
 from typing_extensions import Doc
 from pydantic import (
     BaseModel,
@@ -14,6 +14,9 @@ from fastapi import params
 
 StrHttpUrl = Annotated[Union[str, HttpUrl], HttpUrl]
 
+# An exact name or a glob, a compiled regular expression, or a predicate
+NamePattern = Union[str, Pattern[str], Callable[[str], bool]]
+
 
 class BaseType(BaseModel):
     model_config = ConfigDict(extra="ignore", arbitrary_types_allowed=True)
@@ -169,6 +172,27 @@ class OAuthMetadata(BaseType):
 OAuthMetadataDict = Annotated[Union[Dict[str, Any], OAuthMetadata], OAuthMetadata]
 
 
+class SessionPrincipal(BaseType):
+    """
+    The authenticated principal bound to an MCP session when it was established.
+    """
+
+    claims: Annotated[
+        Dict[str, Any],
+        Doc(
+            "The auth claims of the connection request, as set in `request.state.auth_claims` by the auth dependencies"
+        ),
+    ] = {}
+    credentials_fingerprint: Annotated[
+        str,
+        Doc("A hash of the credentials the session was established with, which later messages must match"),
+    ]
+    authenticated_at: Annotated[float, Doc("When the session was authenticated, as a UNIX timestamp")]
+    expires_at: Annotated[
+        Optional[float], Doc("When the session stops being valid, as a UNIX timestamp. `None` if it never expires.")
+    ] = None
+
+
 class AuthConfig(BaseType):
     version: Annotated[
         Literal["2025-03-26"],
@@ -208,6 +232,86 @@ class AuthConfig(BaseType):
         ),
     ] = None
 
+    token_verifier: Annotated[
+        Optional[Callable[..., Any]],
+        Doc(
+            """
+            A FastAPI dependency that verifies the bearer token of every request, and raises a 401 error if it is
+            missing or invalid. It runs before `dependencies`.
+
+            Use `fastapi_mcp.auth.verifier.JWTVerifier` to verify JWTs locally against the issuer's JWKS, without
+            calling the OAuth provider on every request.
+
+            Example:
+            ```python
+            from fastapi_mcp.auth.verifier import JWTVerifier
+
+            mcp = FastApiMCP(
+                app,
+                auth_config=AuthConfig(
+                    token_verifier=JWTVerifier(
+                        jwks_url="https://your-tenant.auth0.com/.well-known/jwks.json",
+                        issuer="https://your-tenant.auth0.com/",
+                        audience="https://your-api",
+                    ),
+                ),
+            )
+            ```
+            """
+        ),
+    ] = None
+
+    session_auth: Annotated[
+        bool,
+        Doc(
+            """
+            Whether to authenticate SSE sessions once, when they are established, instead of on every message.
+
+            If `True`, the `token_verifier` and `dependencies` only run on the SSE connection request. The
+            authenticated principal is bound to the session, and messages posted to the session are only checked
+            for carrying the same `session_credential_headers`, for the expiration of the principal, and against
+            `is_session_revoked`.
+
+            Clients that refresh their token during a session have to reconnect with the new one.
+            """
+        ),
+    ] = False
+
+    session_credential_headers: Annotated[
+        List[str],
+        Doc(
+            """
+            The request headers carrying the credentials that the auth dependencies read, when `session_auth` is
+            `True`, e.g. `["x-api-key"]` for an API key. Messages posted to a session must carry the same values
+            as its connection request, and connection requests carrying none of them are refused with a 401
+            error.
+            """
+        ),
+    ] = ["authorization", "cookie"]
+
+    session_max_age: Annotated[
+        Optional[float],
+        Doc(
+            """
+            Maximum lifetime of an authenticated session in seconds, when `session_auth` is `True`.
+
+            Sessions also expire with the `exp` claim of their principal, if any.
+            """
+        ),
+    ] = None
+
+    is_session_revoked: Annotated[
+        Optional[Callable[[SessionPrincipal], Union[bool, Awaitable[bool]]]],
+        Doc(
+            """
+            A sync or async function called on every message posted to a session when `session_auth` is `True`,
+            returning `True` if the session's principal was revoked, e.g. because the user logged out.
+
+            It runs on every message, so it should be cheap, e.g. a lookup in an in-memory deny list.
+            """
+        ),
+    ] = None
+
     issuer: Annotated[
         Optional[str],
         Doc(
@@ -353,8 +457,15 @@ class AuthConfig(BaseType):
 
     @model_validator(mode="after")
     def validate_required_fields(self):
-        if self.custom_oauth_metadata is None and self.issuer is None and not self.dependencies:
-            raise ValueError("at least one of 'issuer', 'custom_oauth_metadata' or 'dependencies' is required")
+        if (
+            self.custom_oauth_metadata is None
+            and self.issuer is None
+            and not self.dependencies
+            and self.token_verifier is None
+        ):
+            raise ValueError(
+                "at least one of 'issuer', 'custom_oauth_metadata', 'dependencies' or 'token_verifier' is required"
+            )
 
         if self.setup_proxies:
             if self.client_id is None:
@@ -366,6 +477,103 @@ class AuthConfig(BaseType):
         return self
 
 
+class ToolView(BaseType):
+    """
+    A subset of the tools of an MCP server, that can be exposed to some sessions only.
+
+    The filters are combined: a tool is part of the view if it passes all the given filters.
+    """
+
+    include_operations: Annotated[
+        Optional[List[NamePattern]],
+        Doc("Operation IDs to include in the view. Cannot be used with exclude_operations."),
+    ] = None
+
+    exclude_operations: Annotated[
+        Optional[List[NamePattern]],
+        Doc("Operation IDs to exclude from the view. Cannot be used with include_operations."),
+    ] = None
+
+    include_tags: Annotated[
+        Optional[List[NamePattern]],
+        Doc("Tags to include in the view. Cannot be used with exclude_tags."),
+    ] = None
+
+    exclude_tags: Annotated[
+        Optional[List[NamePattern]],
+        Doc("Tags to exclude from the view. Cannot be used with include_tags."),
+    ] = None
+
+    methods: Annotated[
+        Optional[List[str]],
+        Doc('HTTP methods of the operations to include in the view, e.g. `["GET"]` for a read-only view.'),
+    ] = None
+
+    path_prefix: Annotated[
+        Optional[str],
+        Doc("Only include operations whose path starts with this prefix."),
+    ] = None
+
+    @model_validator(mode="after")
+    def validate_filters(self):
+        if self.include_operations is not None and self.exclude_operations is not None:
+            raise ValueError("Cannot specify both include_operations and exclude_operations")
+
+        if self.include_tags is not None and self.exclude_tags is not None:
+            raise ValueError("Cannot specify both include_tags and exclude_tags")
+
+        return self
+
+
+class WorkerPoolConfig(BaseType):
+    """
+    Configuration of the pool of worker threads that tool calls are offloaded to, so slow or blocking
+    endpoints don't stall the event loop that serves the MCP sessions.
+
+    Each worker runs its own event loop, with its own HTTP client to call the API.
+    """
+
+    workers: Annotated[
+        int,
+        Doc("Number of worker threads"),
+    ] = 2
+
+    max_queue: Annotated[
+        int,
+        Doc(
+            """
+            Maximum number of tool calls running or waiting in the pool. Calls beyond it fail right away
+            instead of piling up.
+            """
+        ),
+    ] = 64
+
+    tools: Annotated[
+        Optional[ToolView],
+        Doc("The tools whose calls are offloaded to the pool. Defaults to all the tools."),
+    ] = None
+
+    client_factory: Annotated[
+        Optional[Callable[[], Any]],
+        Doc(
+            """
+            Function creating the `httpx.AsyncClient` of a worker, called in the worker thread. Defaults to
+            a client calling the FastAPI app in-process, like the default client of the MCP server.
+            """
+        ),
+    ] = None
+
+    @model_validator(mode="after")
+    def validate_sizes(self):
+        if self.workers < 1:
+            raise ValueError("workers must be a positive integer")
+
+        if self.max_queue < 1:
+            raise ValueError("max_queue must be a positive integer")
+
+        return self
+
+
 class ClientRegistrationRequest(BaseType):
     redirect_uris: List[str]
     client_name: Optional[str] = None
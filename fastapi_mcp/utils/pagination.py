@@ -0,0 +1,74 @@
+import base64
+import binascii
+from bisect import bisect_right
+from typing import Any, List, Optional, Sequence, Tuple
+
+import mcp.types as types
+from mcp.shared.exceptions import McpError
+
+
+def get_request_cursor(request: Any) -> Optional[str]:
+    """
+    Get the pagination cursor of a paginated MCP request.
+
+    Newer versions of the `mcp` package keep the cursor in `params`, as the spec says, while older
+    versions model it as a top-level field of the request. Support both.
+    """
+    params = getattr(request, "params", None)
+    cursor = getattr(params, "cursor", None) if params is not None else None
+    if cursor is None:
+        cursor = getattr(request, "cursor", None)
+    return cursor
+
+
+def encode_cursor(tool_name: str) -> str:
+    """
+    Encode an opaque cursor pointing right after the given tool.
+
+    The cursor holds the name of the last tool on the page rather than an offset, so it stays valid
+    when the tool list is rebuilt (e.g. by `setup_server()`) between two page requests.
+    """
+    return base64.urlsafe_b64encode(tool_name.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> str:
+    """
+    Decode a cursor created by `encode_cursor()` back into a tool name.
+
+    Raises:
+        McpError: If the cursor is malformed
+    """
+    try:
+        return base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+    except (binascii.Error, UnicodeError, ValueError):
+        raise McpError(types.ErrorData(code=types.INVALID_PARAMS, message=f"Invalid cursor: {cursor}"))
+
+
+def paginate_tools(
+    tools: Sequence[types.Tool],
+    cursor: Optional[str],
+    page_size: int,
+) -> Tuple[List[types.Tool], Optional[str]]:
+    """
+    Get a single page of tools.
+
+    Args:
+        tools: The tools to paginate, sorted by name
+        cursor: The cursor sent by the client, or None for the first page
+        page_size: Maximum number of tools in a page
+
+    Returns:
+        A tuple containing:
+        - The tools in the requested page
+        - The cursor of the next page, or None if this is the last page
+    """
+    if page_size < 1:
+        raise ValueError(f"page_size must be a positive integer, got {page_size}")
+
+    start = 0
+    if cursor is not None:
+        start = bisect_right(tools, decode_cursor(cursor), key=lambda tool: tool.name)
+
+    page = list(tools[start : start + page_size])
+    next_cursor = encode_cursor(page[-1].name) if page and start + page_size < len(tools) else None
+    return page, next_cursor
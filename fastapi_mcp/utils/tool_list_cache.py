@@ -0,0 +1,110 @@
+import hashlib
+import json
+from typing import Dict, List, Optional, Set
+
+import mcp.types as types
+
+from fastapi_mcp.utils.pagination import paginate_tools
+
+
+TOOLS_HASH_META_KEY = "fastapi-mcp/toolsHash"
+
+
+def tools_content_hash(tools: List[types.Tool]) -> str:
+    """
+    Hash the content of tools, independently of their order.
+    """
+    serialized = json.dumps(
+        [
+            tool.model_dump(mode="json", by_alias=True, exclude_none=True)
+            for tool in sorted(tools, key=lambda tool: tool.name)
+        ],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class ToolListCache:
+    """
+    Caches the `tools/list` responses for a fixed list of tools, both as `ListToolsResult` models and as
+    serialized JSON bytes.
+
+    The cache is immutable: it is built for a given list of tools, and a new one has to be created
+    whenever the tools change (e.g. in `FastApiMCP.setup_server()`).
+    """
+
+    def __init__(self, tools: List[types.Tool], page_size: Optional[int] = None):
+        self.tools = tools
+        self.page_size = page_size
+
+        # Sort by name, so cursors keep pointing at the same place when the tools are rebuilt
+        self._tools_by_name = sorted(tools, key=lambda tool: tool.name)
+
+        self._content_hash: Optional[str] = None
+        self._pages: Dict[Optional[str], types.ListToolsResult] = {}
+        self._page_bytes: Dict[Optional[str], bytes] = {}
+        self._issued_cursors: Set[str] = set()
+
+    @property
+    def content_hash(self) -> str:
+        """
+        A hash of the content of all the tools, independent of their order and of the page size.
+
+        Clients and proxies can compare it with a previously seen value to cheaply detect that the tool
+        list did not change.
+        """
+        if self._content_hash is None:
+            self._content_hash = tools_content_hash(self._tools_by_name)
+        return self._content_hash
+
+    def get_page(self, cursor: Optional[str] = None) -> types.ListToolsResult:
+        """
+        Get the `tools/list` result for the given cursor.
+
+        Only pages of cursors issued by this cache are cached, so arbitrary cursors sent by clients
+        cannot grow the cache.
+        """
+        page = self._pages.get(cursor)
+        if page is not None:
+            return page
+
+        if self.page_size is None:
+            tools, next_cursor = self.tools, None
+        else:
+            tools, next_cursor = paginate_tools(self._tools_by_name, cursor, self.page_size)
+
+        page = types.ListToolsResult(
+            tools=tools,
+            nextCursor=next_cursor,
+            _meta={TOOLS_HASH_META_KEY: self.content_hash},
+        )
+
+        if cursor is None or cursor in self._issued_cursors:
+            self._pages[cursor] = page
+            if next_cursor is not None:
+                self._issued_cursors.add(next_cursor)
+        return page
+
+    def get_page_bytes(self, cursor: Optional[str] = None) -> bytes:
+        """
+        Get the serialized JSON of the `tools/list` result for the given cursor.
+        """
+        page_bytes = self._page_bytes.get(cursor)
+        if page_bytes is not None:
+            return page_bytes
+
+        page = self.get_page(cursor)
+        page_bytes = page.model_dump_json(by_alias=True, exclude_none=True).encode("utf-8")
+
+        if cursor in self._pages:
+            self._page_bytes[cursor] = page_bytes
+        return page_bytes
+
+    @property
+    def etag(self) -> str:
+        """
+        An HTTP entity tag for the pages of this cache, derived from the content hash of the tool list.
+        """
+        return f'"{self.content_hash}"'
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+from typing import Awaitable, Callable, List, Optional, TypeVar
+
+import httpx
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WorkerPoolFullError(Exception):
+    """
+    Raised when a call is submitted to a worker pool that already has `max_queue` calls running or waiting.
+    """
+
+
+class _Worker:
+    def __init__(self, name: str, client_factory: Callable[[], httpx.AsyncClient]):
+        self.loop = asyncio.new_event_loop()
+        self.pending = 0
+        self._client_factory = client_factory
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+        self.client: httpx.AsyncClient
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.client = self._client_factory()
+        except BaseException as e:
+            self._error = e
+            self._ready.set()
+            self.loop.close()
+            return
+
+        self._ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            try:
+                self.loop.run_until_complete(self.client.aclose())
+            finally:
+                self.loop.close()
+
+    def stop(self) -> None:
+        if self.loop.is_closed():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+class ToolWorkerPool:
+    """
+    A pool of worker threads, each running its own event loop and HTTP client, that tool calls can be
+    offloaded to.
+
+    Calls are sent to the worker with the fewest calls in progress. Workers are started on the first call.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], httpx.AsyncClient],
+        workers: int = 2,
+        max_queue: int = 64,
+        name: str = "fastapi_mcp_tool_worker",
+    ):
+        self.client_factory = client_factory
+        self.size = workers
+        self.max_queue = max_queue
+        self.name = name
+        self.pending = 0
+
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        return bool(self._workers)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._workers:
+                return
+            workers = [_Worker(f"{self.name}_{i}", self.client_factory) for i in range(self.size)]
+            try:
+                for worker in workers:
+                    worker.start()
+            except BaseException:
+                for worker in workers:
+                    if worker.thread.is_alive():
+                        worker.stop()
+                raise
+            self._workers = workers
+
+    def shutdown(self) -> None:
+        """
+        Stop the workers, once the calls they are running are done. The pool can be started again afterwards.
+        """
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
+
+    async def run(self, func: Callable[[httpx.AsyncClient], Awaitable[T]]) -> T:
+        """
+        Run `func` in a worker, with the HTTP client of the worker, and wait for its result.
+
+        Raises:
+            WorkerPoolFullError: If `max_queue` calls are already running or waiting in the pool
+        """
+        if self.pending >= self.max_queue:
+            raise WorkerPoolFullError(f"The tool worker pool is full ({self.max_queue} calls in progress)")
+
+        if not self._workers:
+            # Starting the threads blocks for as long as creating the clients takes, which is short
+            self.start()
+
+        worker = min(self._workers, key=lambda w: w.pending)
+        worker.pending += 1
+        self.pending += 1
+        try:
+            future = asyncio.run_coroutine_threadsafe(_call(func, worker), worker.loop)
+            try:
+                return await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+        finally:
+            worker.pending -= 1
+            self.pending -= 1
+
+
+async def _call(func: Callable[[httpx.AsyncClient], Awaitable[T]], worker: _Worker) -> T:
+    return await func(worker.client)
@@ -0,0 +1,189 @@
+import asyncio
+from typing import Dict, List
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fastapi_mcp.auth.http_cache import CachedJSONDocument, get_shared_http_client, parse_cache_control
+from fastapi_mcp.auth.proxy import setup_oauth_metadata_proxy
+
+
+METADATA_URL = "https://auth.example.com/.well-known/openid-configuration"
+METADATA = {
+    "issuer": "https://auth.example.com/",
+    "authorization_endpoint": "https://auth.example.com/authorize",
+    "token_endpoint": "https://auth.example.com/oauth/token",
+}
+
+
+class FakeProvider:
+    def __init__(self, headers: Dict[str, str]):
+        self.headers = headers
+        self.requests: List[httpx.Request] = []
+        self.fail = False
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.fail:
+            return httpx.Response(500)
+        return httpx.Response(200, json=METADATA, headers=self.headers)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_parse_cache_control():
+    assert parse_cache_control(None) == {}
+    assert parse_cache_control('public, Max-Age=300, stale-while-revalidate="60", no-transform') == {
+        "public": None,
+        "max-age": "300",
+        "stale-while-revalidate": "60",
+        "no-transform": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_cached_document_lifecycle():
+    provider = FakeProvider({"Cache-Control": "max-age=60, stale-while-revalidate=30"})
+    clock = FakeClock()
+    cache = CachedJSONDocument(METADATA_URL, http_client=provider.client(), clock=clock)
+
+    # Concurrent requests share a single fetch
+    results = await asyncio.gather(*(cache.get() for _ in range(5)))
+    assert all(result == METADATA for result in results)
+    assert len(provider.requests) == 1
+
+    # Fresh
+    clock.now += 59
+    await cache.get()
+    assert len(provider.requests) == 1
+
+    # Stale, but served while refreshing in the background
+    clock.now += 10
+    assert await cache.get() == METADATA
+    await asyncio.sleep(0.01)
+    assert len(provider.requests) == 2
+
+    # Refreshing fails, but the stale document is still served until the stale window ends
+    provider.fail = True
+    clock.now += 61
+    assert await cache.get() == METADATA
+    await asyncio.sleep(0.01)
+    assert len(provider.requests) == 3
+
+    clock.now += 30
+    with pytest.raises(httpx.HTTPStatusError):
+        await cache.get()
+
+
+@pytest.mark.asyncio
+async def test_cached_document_retries_after_failure():
+    provider = FakeProvider({"Cache-Control": "max-age=60, stale-while-revalidate=3600"})
+    clock = FakeClock()
+    cache = CachedJSONDocument(METADATA_URL, http_client=provider.client(), retry_after=30, clock=clock)
+    await cache.get()
+
+    provider.fail = True
+    clock.now += 61
+    assert await cache.get() == METADATA
+    await asyncio.sleep(0.01)
+    assert len(provider.requests) == 2
+
+    # During the outage, the refresh isn't retried on every request
+    for _ in range(10):
+        clock.now += 2
+        assert await cache.get() == METADATA
+    await asyncio.sleep(0.01)
+    assert len(provider.requests) == 2
+
+    # Only once the retry delay is over
+    clock.now += 11
+    provider.fail = False
+    assert await cache.get() == METADATA
+    await asyncio.sleep(0.01)
+    assert len(provider.requests) == 3
+
+
+def test_replaced_shared_client_is_closed():
+    first_loop = asyncio.new_event_loop()
+    try:
+        first_client = first_loop.run_until_complete(_get_shared_client())
+        second_client = asyncio.run(_get_shared_client())
+        assert second_client is not first_client
+
+        # Closed in the event loop it was used in
+        first_loop.run_until_complete(asyncio.sleep(0.01))
+        assert first_client.is_closed
+    finally:
+        first_loop.close()
+
+
+async def _get_shared_client() -> httpx.AsyncClient:
+    return get_shared_http_client()
+
+
+@pytest.mark.asyncio
+async def test_cached_document_lifetimes():
+    clock = FakeClock()
+
+    no_cache_provider = FakeProvider({"Cache-Control": "no-cache"})
+    no_cache = CachedJSONDocument(METADATA_URL, http_client=no_cache_provider.client(), clock=clock)
+    await no_cache.get()
+    await no_cache.get()
+    assert len(no_cache_provider.requests) == 2
+
+    default_provider = FakeProvider({"Age": "10"})
+    default_cache = CachedJSONDocument(
+        METADATA_URL,
+        http_client=default_provider.client(),
+        default_ttl=100,
+        default_stale_while_revalidate=0,
+        clock=clock,
+    )
+    await default_cache.get()
+    clock.now += 89
+    await default_cache.get()
+    assert len(default_provider.requests) == 1
+
+    # The Age header counts against the TTL
+    clock.now += 2
+    await default_cache.get()
+    assert len(default_provider.requests) == 2
+
+
+def test_metadata_proxy_uses_cache():
+    provider = FakeProvider({"Cache-Control": "max-age=300"})
+    app = FastAPI()
+    setup_oauth_metadata_proxy(
+        app, metadata_url=METADATA_URL, register_path="/oauth/register", http_client=provider.client()
+    )
+    client = TestClient(app)
+
+    for _ in range(3):
+        response = client.get("/.well-known/oauth-authorization-server")
+        assert response.status_code == 200
+        assert response.json()["authorization_endpoint"] == "http://testserver/oauth/authorize"
+        assert response.json()["registration_endpoint"] == "http://testserver/oauth/register"
+        assert response.json()["token_endpoint"] == METADATA["token_endpoint"]
+
+    assert len(provider.requests) == 1
+
+
+def test_metadata_proxy_error():
+    provider = FakeProvider({})
+    provider.fail = True
+    app = FastAPI()
+    setup_oauth_metadata_proxy(app, metadata_url=METADATA_URL, http_client=provider.client())
+
+    response = TestClient(app).get("/.well-known/oauth-authorization-server")
+    assert response.status_code == 502
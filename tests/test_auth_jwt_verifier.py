@@ -0,0 +1,198 @@
+import json
+import time
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from fastapi_mcp import FastApiMCP, AuthConfig
+from fastapi_mcp.auth.verifier import JWTVerifier, TokenVerificationError
+
+jwt = pytest.importorskip("jwt")
+rsa = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.rsa")
+
+
+JWKS_URL = "https://auth.example.com/.well-known/jwks.json"
+ISSUER = "https://auth.example.com/"
+AUDIENCE = "https://api.example.com"
+
+
+class FakeIssuer:
+    def __init__(self):
+        self.keys: Dict[str, Any] = {}
+        self.requests: List[httpx.Request] = []
+        self.rotate("key-1")
+
+    def rotate(self, kid: str) -> None:
+        self.keys[kid] = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    def jwks(self) -> Dict[str, Any]:
+        keys = []
+        for kid, private_key in self.keys.items():
+            jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+            jwk.update({"kid": kid, "use": "sig", "alg": "RS256"})
+            keys.append(jwk)
+        return {"keys": keys}
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return httpx.Response(200, json=self.jwks(), headers={"Cache-Control": "max-age=3600"})
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+    def token(self, kid: str = "key-1", **claims: Any) -> str:
+        payload = {"iss": ISSUER, "aud": AUDIENCE, "sub": "user-1", "exp": int(time.time()) + 600, **claims}
+        return jwt.encode(payload, self.keys[kid], algorithm="RS256", headers={"kid": kid})
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_verifier(issuer: FakeIssuer, clock: FakeClock, **kwargs: Any) -> JWTVerifier:
+    return JWTVerifier(JWKS_URL, issuer=ISSUER, audience=AUDIENCE, http_client=issuer.client(), clock=clock, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_verify_caches_keys_and_claims():
+    issuer = FakeIssuer()
+    verifier = make_verifier(issuer, FakeClock())
+
+    token = issuer.token()
+    claims = await verifier.verify(token)
+    assert claims["sub"] == "user-1"
+    assert await verifier.verify(token) is claims
+
+    # Other tokens signed with the same key don't fetch the JWKS again
+    assert (await verifier.verify(issuer.token(sub="user-2")))["sub"] == "user-2"
+    assert len(issuer.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_verify_rejects_invalid_tokens():
+    issuer = FakeIssuer()
+    verifier = make_verifier(issuer, FakeClock())
+
+    with pytest.raises(TokenVerificationError):
+        await verifier.verify("not-a-jwt")
+    with pytest.raises(TokenVerificationError):
+        await verifier.verify(issuer.token(aud="https://other.example.com"))
+    with pytest.raises(TokenVerificationError):
+        await verifier.verify(issuer.token(iss="https://evil.example.com/"))
+    with pytest.raises(TokenVerificationError):
+        await verifier.verify(issuer.token(exp=int(time.time()) - 60))
+
+    forged = jwt.encode(
+        {"iss": ISSUER, "aud": AUDIENCE, "exp": int(time.time()) + 600},
+        rsa.generate_private_key(public_exponent=65537, key_size=2048),
+        algorithm="RS256",
+        headers={"kid": "key-1"},
+    )
+    with pytest.raises(TokenVerificationError):
+        await verifier.verify(forged)
+
+
+@pytest.mark.asyncio
+async def test_cached_claims_expire_with_token():
+    issuer = FakeIssuer()
+    clock = FakeClock()
+    verifier = make_verifier(issuer, clock, max_cache_ttl=60)
+
+    token = issuer.token(exp=int(clock.now) + 30)
+    claims = await verifier.verify(token)
+
+    clock.now += 20
+    assert await verifier.verify(token) is claims
+
+    # The token is verified again once it expired according to the verifier's clock
+    clock.now += 20
+    assert await verifier.verify(token) is not claims
+
+    # Claims of long-lived tokens are cached for `max_cache_ttl` at most
+    token = issuer.token(exp=int(clock.now) + 3600)
+    claims = await verifier.verify(token)
+    clock.now += 61
+    assert await verifier.verify(token) is not claims
+
+
+@pytest.mark.asyncio
+async def test_unknown_key_refreshes_jwks_with_rate_limit():
+    issuer = FakeIssuer()
+    clock = FakeClock()
+    verifier = make_verifier(issuer, clock, jwks_min_refresh_interval=60)
+
+    await verifier.verify(issuer.token())
+    assert len(issuer.requests) == 1
+
+    # Rotated keys are picked up right away
+    issuer.rotate("key-2")
+    await verifier.verify(issuer.token(kid="key-2"))
+    assert len(issuer.requests) == 2
+
+    # Until the rate limit expires, unknown keys don't refresh the JWKS again
+    issuer.rotate("key-3")
+    with pytest.raises(TokenVerificationError, match="Unknown signing key"):
+        await verifier.verify(issuer.token(kid="key-3"))
+    assert len(issuer.requests) == 2
+
+    clock.now += 60
+    await verifier.verify(issuer.token(kid="key-3"))
+    assert len(issuer.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_invalidate_and_cache_size():
+    issuer = FakeIssuer()
+    verifier = make_verifier(issuer, FakeClock(), max_cached_tokens=2)
+
+    tokens = [issuer.token(sub=f"user-{i}") for i in range(3)]
+    for token in tokens:
+        await verifier.verify(token)
+    assert list(verifier._claims_cache) == tokens[1:]
+
+    verifier.invalidate(tokens[1])
+    assert list(verifier._claims_cache) == tokens[2:]
+
+
+def test_auth_config_token_verifier():
+    issuer = FakeIssuer()
+    verifier = JWTVerifier(JWKS_URL, issuer=ISSUER, audience=AUDIENCE, http_client=issuer.client())
+
+    app = FastAPI()
+
+    @app.get("/me", operation_id="me")
+    async def me(request: Request):
+        return {"sub": request.state.auth_claims["sub"]}
+
+    seen_claims = []
+
+    async def record_claims(request: Request):
+        seen_claims.append(request.state.auth_claims)
+
+    mcp = FastApiMCP(
+        app,
+        auth_config=AuthConfig(token_verifier=verifier, dependencies=[Depends(record_claims)]),
+    )
+    mcp.mount()
+
+    with TestClient(app) as client:
+        response = client.get("/mcp/tools")
+        assert response.status_code == 401
+        assert response.headers["www-authenticate"] == "Bearer"
+
+        response = client.get("/mcp/tools", headers={"Authorization": "Bearer not-a-jwt"})
+        assert response.status_code == 401
+
+        response = client.get("/mcp/tools", headers={"Authorization": f"Bearer {issuer.token()}"})
+        assert response.status_code == 200
+        assert [tool["name"] for tool in response.json()["tools"]] == ["me"]
+
+    # The verifier runs before the other dependencies
+    assert [claims["sub"] for claims in seen_claims] == ["user-1"]
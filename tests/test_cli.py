@@ -0,0 +1,67 @@
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from fastapi_mcp import FastApiMCP
+from fastapi_mcp.cli import app
+from fastapi_mcp.manifest import ToolManifest
+
+from .fixtures.simple_app import make_simple_fastapi_app
+
+APP = "tests.fixtures.simple_app:make_simple_fastapi_app"
+
+runner = CliRunner()
+
+
+def test_export_and_load_manifest(tmp_path: Path):
+    output = tmp_path / "tools.json"
+    result = runner.invoke(app, ["export", APP, "--factory", "--output", str(output)])
+    assert result.exit_code == 0, result.output
+    assert "Wrote 6 tools" in result.output
+
+    manifest = ToolManifest.load(output)
+    converted = FastApiMCP(make_simple_fastapi_app())
+    assert manifest.tools == converted.tools
+    assert manifest.operation_map == converted.operation_map
+
+    # Loading the manifest gives the same tools as converting, and the filters still apply
+    loaded = FastApiMCP(make_simple_fastapi_app(), manifest=output)
+    assert loaded.tools == converted.tools
+    filtered = FastApiMCP(make_simple_fastapi_app(), manifest=manifest, include_operations=["get_item"])
+    assert [tool.name for tool in filtered.tools] == ["get_item"]
+    assert set(filtered.operation_map) == {"get_item"}
+
+    with pytest.raises(ValueError, match="describe_all_responses"):
+        FastApiMCP(make_simple_fastapi_app(), manifest=manifest, describe_all_responses=True)
+
+
+def test_load_manifest_of_unknown_format(tmp_path: Path):
+    path = tmp_path / "tools.json"
+    path.write_text(json.dumps({"format_version": 999}))
+    with pytest.raises(ValueError, match="format version 999"):
+        ToolManifest.load(path)
+
+
+def test_inspect_and_profile():
+    result = runner.invoke(app, ["inspect", APP, "--factory"], env={"COLUMNS": "200"})
+    assert result.exit_code == 0, result.output
+    assert "6 tools of Test API" in result.output
+    assert "update_item" in result.output
+    assert "Total size of the tools" in result.output
+
+    result = runner.invoke(app, ["profile", APP, "--factory", "--limit", "2"], env={"COLUMNS": "200"})
+    assert result.exit_code == 0, result.output
+    assert "Conversion time of the 6 operations" in result.output
+    assert result.output.count("/items") == 2
+
+
+def test_invalid_app():
+    result = runner.invoke(app, ["export", "tests.fixtures.simple_app"])
+    assert result.exit_code != 0
+    assert "module:attribute" in result.output
+
+    result = runner.invoke(app, ["export", "tests.fixtures.simple_app:make_simple_fastapi_app"])
+    assert result.exit_code != 0
+    assert "not a FastAPI app" in result.output
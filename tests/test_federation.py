@@ -0,0 +1,223 @@
+import json
+from typing import Optional
+
+import httpx
+import pytest
+import mcp.types as types
+from fastapi import APIRouter, FastAPI, Header
+from fastapi.testclient import TestClient
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from fastapi_mcp import FederatedMCP, MCPSource, ToolView
+from fastapi_mcp.types import HTTPRequestInfo, WorkerPoolConfig
+
+
+@pytest.fixture
+def orders_router() -> APIRouter:
+    router = APIRouter(prefix="/orders", tags=["orders"])
+
+    @router.get("/{order_id}", operation_id="get_order")
+    async def get_order(order_id: int):
+        return {"id": order_id, "status": "shipped"}
+
+    return router
+
+
+def test_source_validation(simple_fastapi_app: FastAPI):
+    with pytest.raises(ValueError):
+        MCPSource("items")
+
+    with pytest.raises(ValueError):
+        MCPSource("items", app=simple_fastapi_app, base_url="http://items")
+
+    with pytest.raises(ValueError):
+        MCPSource("not a namespace", app=simple_fastapi_app)
+
+    with pytest.raises(ValueError):
+        FederatedMCP(FastAPI(), sources=[MCPSource("a__b", app=simple_fastapi_app)])
+
+    with pytest.raises(ValueError):
+        FederatedMCP(
+            FastAPI(), sources=[MCPSource("items", app=simple_fastapi_app), MCPSource("items", app=simple_fastapi_app)]
+        )
+
+
+def test_options_of_fastapi_mcp(simple_fastapi_app: FastAPI):
+    federated = FederatedMCP(
+        FastAPI(),
+        sources=[MCPSource("items", app=simple_fastapi_app)],
+        tools_page_size=2,
+        worker_pool=WorkerPoolConfig(tools=ToolView(methods=["GET"])),
+    )
+    assert federated._catalog.tools_cache.page_size == 2
+    assert federated._catalog.pooled_operations == {
+        operation.operation_id
+        for operation in federated._catalog.index.operations.values()
+        if operation.method == "get"
+    }
+
+    with pytest.raises(ValueError, match="include_tags"):
+        FederatedMCP(FastAPI(), sources=[MCPSource("items", app=simple_fastapi_app)], include_tags=["items"])
+
+
+def test_namespaced_tools(simple_fastapi_app: FastAPI, complex_fastapi_app: FastAPI, orders_router: APIRouter):
+    federated = FederatedMCP(
+        FastAPI(),
+        sources=[
+            MCPSource("items", app=simple_fastapi_app, exclude_tags=["error"]),
+            MCPSource("shop", app=complex_fastapi_app, include_operations=["get_*"]),
+            MCPSource("orders", app=orders_router),
+        ],
+    )
+
+    assert [tool.name for tool in federated.tools] == [
+        "items__list_items",
+        "items__create_item",
+        "items__get_item",
+        "items__update_item",
+        "items__delete_item",
+        "shop__get_product",
+        "shop__get_customer",
+        "orders__get_order",
+    ]
+    assert set(federated.operation_map) == {tool.name for tool in federated.tools}
+    assert federated.operation_map["orders__get_order"]["path"] == "/orders/{order_id}"
+
+    # The index covers all the operations of all the sources, namespaced
+    index = federated._catalog.index
+    assert "shop__create_order" in index
+    assert index.operations["items__get_item"].path == "/items/items/{item_id}"
+    assert set(index.by_tag["shop"]) == {
+        "shop__list_products",
+        "shop__get_product",
+        "shop__create_order",
+        "shop__get_customer",
+    }
+
+
+def test_sources_share_clients(simple_fastapi_app: FastAPI, orders_router: APIRouter):
+    items_source = MCPSource("items", app=simple_fastapi_app)
+    orders_source = MCPSource("orders", app=orders_router)
+    federated = FederatedMCP(FastAPI(), sources=[items_source, orders_source])
+
+    assert federated._get_tool_client("items__get_item") is items_source.http_client
+    assert federated._get_tool_client("orders__get_order") is orders_source.http_client
+
+    federated.setup_server()
+    assert federated._get_tool_client("items__get_item") is items_source.http_client
+
+
+@pytest.mark.asyncio
+async def test_call_federated_tools(simple_fastapi_app: FastAPI, orders_router: APIRouter):
+    # A "remote" source, with a given schema, called through an HTTP client
+    remote_app = FastAPI()
+    remote_app.include_router(orders_router)
+    remote_source = MCPSource(
+        "remote",
+        base_url="http://remote",
+        openapi_schema=remote_app.openapi(),
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=remote_app), base_url="http://remote"),
+    )
+
+    federated = FederatedMCP(
+        FastAPI(),
+        sources=[MCPSource("items", app=simple_fastapi_app), remote_source],
+        tool_views={"remote": ToolView(include_tags=["remote"])},
+    )
+
+    async with create_connected_server_and_client_session(federated.server) as client_session:
+        items_result = await client_session.call_tool("items__get_item", {"item_id": 1})
+        assert not items_result.isError
+        assert isinstance(items_result.content[0], types.TextContent)
+        assert json.loads(items_result.content[0].text)["id"] == 1
+
+        remote_result = await client_session.call_tool("remote__get_order", {"order_id": 7})
+        assert not remote_result.isError
+        assert isinstance(remote_result.content[0], types.TextContent)
+        assert json.loads(remote_result.content[0].text) == {"id": 7, "status": "shipped"}
+
+        unknown_result = await client_session.call_tool("get_item", {"item_id": 1})
+        assert unknown_result.isError
+
+    direct_result = await federated.call_tool("remote__get_order", {"order_id": 8})
+    assert isinstance(direct_result[0], types.TextContent)
+    assert json.loads(direct_result[0].text)["id"] == 8
+
+    assert [tool.name for tool in federated._catalog.view("remote").tools] == ["remote__get_order"]
+
+
+def test_mount_federated_server(simple_fastapi_app: FastAPI):
+    gateway = FastAPI()
+    federated = FederatedMCP(gateway, sources=[MCPSource("items", app=simple_fastapi_app)])
+    federated.mount()
+
+    client = TestClient(gateway)
+    tools = client.get("/mcp/tools").json()["tools"]
+    assert len(tools) == 6
+    assert all(tool["name"].startswith("items__") for tool in tools)
+
+
+@pytest.mark.asyncio
+async def test_unavailable_sources(simple_fastapi_app: FastAPI, orders_router: APIRouter, caplog):
+    remote_app = FastAPI()
+    remote_app.include_router(orders_router)
+    # Nothing listens on these, so fetching their schema fails
+    remote_source = MCPSource("remote", base_url="http://127.0.0.1:9", openapi_schema=remote_app.openapi(), timeout=1)
+    down_source = MCPSource("down", base_url="http://127.0.0.1:9", timeout=1)
+
+    federated = FederatedMCP(
+        FastAPI(), sources=[MCPSource("items", app=simple_fastapi_app), remote_source, down_source]
+    )
+    assert federated.unavailable_sources == {"down"}
+    tool_names = {tool.name for tool in federated.tools}
+    assert "remote__get_order" in tool_names
+    assert not any(name.startswith("down__") for name in tool_names)
+    assert any(record.name == "fastapi_mcp.federation" and "'down'" in record.getMessage() for record in caplog.records)
+
+    # A source that fails on refresh keeps its previous tools
+    remote_source.openapi_schema = None
+    assert await federated.refresh_tools() is False
+    assert federated.unavailable_sources == {"down", "remote"}
+    assert {tool.name for tool in federated.tools} == tool_names
+
+
+@pytest.mark.asyncio
+async def test_authorization_is_forwarded_to_opted_in_sources_only():
+    def echo_app() -> FastAPI:
+        app = FastAPI()
+
+        @app.get("/whoami", operation_id="whoami")
+        async def whoami(authorization: Optional[str] = Header(None, include_in_schema=False)):
+            return {"authorization": authorization}
+
+        return app
+
+    federated = FederatedMCP(
+        FastAPI(),
+        sources=[
+            MCPSource("trusted", app=echo_app(), forward_authorization=True),
+            MCPSource("other", app=echo_app()),
+        ],
+    )
+    http_request_info = HTTPRequestInfo(
+        method="POST",
+        path="/messages/",
+        headers={"authorization": "Bearer secret"},
+        cookies={},
+        query_params={},
+        body=None,
+    )
+
+    async def call(tool_name: str) -> Optional[str]:
+        result = await federated._execute_api_tool(
+            client=federated._get_tool_client(tool_name),
+            tool_name=tool_name,
+            arguments={},
+            operation_map=federated.operation_map,
+            http_request_info=http_request_info,
+        )
+        assert isinstance(result[0], types.TextContent)
+        return json.loads(result[0].text)["authorization"]
+
+    assert await call("trusted__whoami") == "Bearer secret"
+    assert await call("other__whoami") is None
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+import fastapi_mcp
+
+# Modules that only the MCP server needs, and that must load on first use only
+HEAVY_MODULES = ["fastapi_mcp.server", "fastapi_mcp.transport.sse", "httpx", "mcp.server"]
+
+
+def profile_import(statement: str) -> Dict[str, int]:
+    """
+    Run an import statement in a fresh interpreter with `-X importtime`, and get the cumulative import time
+    of every module it loaded, in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True, check=True
+    )
+    times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def report(times: Dict[str, int], count: int = 10) -> str:
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:count]
+    return "\n".join(f"{cumulative / 1000:8.1f}ms  {module}" for module, cumulative in slowest)
+
+
+@pytest.mark.parametrize(
+    "statement",
+    ["import fastapi_mcp", "from fastapi_mcp import AuthConfig, OAuthMetadata, ToolView"],
+)
+def test_import_does_not_load_the_server(statement: str):
+    times = profile_import(statement)
+    loaded = [module for module in HEAVY_MODULES if module in times]
+    assert not loaded, f"{statement!r} loaded {loaded}. Slowest imports:\n{report(times)}"
+
+
+def test_lazy_attributes():
+    from fastapi_mcp.server import FastApiMCP
+
+    assert fastapi_mcp.FastApiMCP is FastApiMCP
+    assert set(fastapi_mcp.__all__) <= set(dir(fastapi_mcp))
+
+    with pytest.raises(AttributeError):
+        fastapi_mcp.NotAThing  # noqa: B018
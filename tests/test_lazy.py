@@ -0,0 +1,207 @@
+import asyncio
+import threading
+import anyio
+import httpx
+import mcp.types as types
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from fastapi_mcp import FastApiMCP
+from fastapi_mcp.catalog import ToolCatalog
+from fastapi_mcp.testing import connect_in_memory
+
+
+class CountingFastApiMCP(FastApiMCP):
+    builds = 0
+
+    def _build_catalog(self) -> ToolCatalog:
+        self.builds += 1
+        return super()._build_catalog()
+
+
+def test_eager_by_default(simple_fastapi_app: FastAPI):
+    mcp = CountingFastApiMCP(simple_fastapi_app)
+    assert mcp.builds == 1
+
+
+@pytest.mark.asyncio
+async def test_lazy_builds_once_on_first_request(simple_fastapi_app: FastAPI):
+    mcp = CountingFastApiMCP(simple_fastapi_app, lazy=True)
+    mcp.mount()
+    assert mcp.builds == 0
+
+    async with connect_in_memory(mcp) as first, connect_in_memory(mcp) as second:
+        assert mcp.builds == 0
+
+        # Concurrent first requests wait for a single build
+        results = await asyncio.gather(
+            first.list_tools(), second.list_tools(), first.call_tool("get_item", {"item_id": 1})
+        )
+        assert mcp.builds == 1
+        assert results[0] == results[1]
+        assert not results[2].isError
+
+    # Rebuilt when next needed
+    mcp.setup_server()
+    assert mcp.builds == 1
+    assert {tool.name for tool in mcp.tools} == {tool.name for tool in results[0].tools}
+    assert mcp.builds == 2
+
+
+@pytest.mark.asyncio
+async def test_lazy_warmup_and_refresh(simple_fastapi_app: FastAPI):
+    mcp = CountingFastApiMCP(simple_fastapi_app, lazy=True)
+
+    await mcp.warmup()
+    await mcp.warmup()
+    assert mcp.builds == 1
+
+    mcp.setup_server()
+    assert await mcp.refresh_tools() is True
+    assert mcp.builds == 2
+    assert await mcp.refresh_tools() is False
+
+
+def test_lazy_tools_endpoint(simple_fastapi_app: FastAPI):
+    mcp = CountingFastApiMCP(simple_fastapi_app, lazy=True)
+    mcp.mount()
+
+    with TestClient(simple_fastapi_app) as client:
+        response = client.get("/mcp/tools")
+        assert response.status_code == 200
+        assert len(response.json()["tools"]) == len(mcp.tools)
+    assert mcp.builds == 1
+
+
+@pytest.fixture
+def slow_build(monkeypatch: pytest.MonkeyPatch) -> threading.Event:
+    """
+    Make the tool builds wait until the returned event is set.
+    """
+    release = threading.Event()
+    build_catalog = FastApiMCP._build_catalog
+
+    def slow_build_catalog(self: FastApiMCP) -> ToolCatalog:
+        release.wait(5)
+        return build_catalog(self)
+
+    monkeypatch.setattr(FastApiMCP, "_build_catalog", slow_build_catalog)
+    return release
+
+
+@pytest.mark.asyncio
+async def test_background_warmup(simple_fastapi_app: FastAPI, slow_build: threading.Event):
+    mcp = FastApiMCP(simple_fastapi_app, background_warmup=True, warmup_timeout=0.1)
+    mcp.mount()
+    assert not mcp.ready
+
+    with TestClient(simple_fastapi_app) as client:
+        # The app answers while the tools are being built
+        assert client.get("/items/1").status_code == 200
+        response = client.get("/mcp/ready")
+        assert response.status_code == 503
+        assert response.json() == {"ready": False}
+        assert client.get("/mcp/tools").status_code == 503
+
+    async with connect_in_memory(mcp) as session:
+        # Requests time out waiting for the build
+        result = await session.call_tool("get_item", {"item_id": 1})
+        assert result.isError
+        assert isinstance(result.content[0], types.TextContent)
+        assert "still being built" in result.content[0].text
+
+        slow_build.set()
+        with anyio.fail_after(5):
+            while not mcp.ready:
+                await asyncio.sleep(0.01)
+        tools = await session.list_tools()
+        assert len(tools.tools) > 0
+
+    with TestClient(simple_fastapi_app) as client:
+        response = client.get("/mcp/ready")
+        assert response.status_code == 200
+        assert response.json() == {"ready": True, "tools": len(mcp.tools)}
+
+
+@pytest.mark.asyncio
+async def test_sync_endpoints_answer_during_background_warmup(simple_fastapi_app: FastAPI, slow_build: threading.Event):
+    @simple_fastapi_app.get("/health")
+    def health():
+        return {"ok": True}
+
+    mcp = FastApiMCP(simple_fastapi_app, background_warmup=True, warmup_timeout=5)
+    mcp.mount()
+
+    transport = httpx.ASGITransport(app=simple_fastapi_app)
+    async with (
+        connect_in_memory(mcp) as session,
+        httpx.AsyncClient(transport=transport, base_url="http://test") as client,
+    ):
+        # More MCP requests waiting for the tools than threads in anyio's default worker pool
+        waiting = int(anyio.to_thread.current_default_thread_limiter().total_tokens) + 5
+        requests = [asyncio.create_task(session.list_tools()) for _ in range(waiting)]
+        await asyncio.sleep(0.1)
+
+        # Sync endpoints run in the worker pool, and still answer right away
+        with anyio.fail_after(1):
+            response = await client.get("/health")
+        assert response.status_code == 200
+        assert not mcp.ready
+
+        slow_build.set()
+        results = await asyncio.gather(*requests)
+        assert all(result.tools for result in results)
+
+
+@pytest.mark.asyncio
+async def test_waiting_for_the_build_holds_no_worker_threads(simple_fastapi_app: FastAPI, slow_build: threading.Event):
+    mcp = CountingFastApiMCP(simple_fastapi_app, lazy=True)
+
+    async with anyio.create_task_group() as tg:
+        # More waiters than threads in anyio's default worker pool
+        for _ in range(int(anyio.to_thread.current_default_thread_limiter().total_tokens) + 5):
+            tg.start_soon(mcp.warmup)
+        await asyncio.sleep(0.1)
+
+        # What a sync endpoint of the app does
+        with anyio.fail_after(1):
+            await anyio.to_thread.run_sync(lambda: None)
+
+        slow_build.set()
+
+    assert mcp.builds == 1
+    assert mcp.ready
+
+
+@pytest.mark.asyncio
+async def test_warmup_timeout(simple_fastapi_app: FastAPI, slow_build: threading.Event):
+    mcp = CountingFastApiMCP(simple_fastapi_app, lazy=True)
+    with pytest.raises(TimeoutError, match="still being built"):
+        await mcp.warmup(timeout=0.05)
+
+    # The build goes on, and later callers wait for it
+    slow_build.set()
+    await mcp.warmup(timeout=5)
+    assert mcp.builds == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_build_is_retried(simple_fastapi_app: FastAPI, monkeypatch: pytest.MonkeyPatch):
+    mcp = CountingFastApiMCP(simple_fastapi_app, lazy=True)
+    build_catalog = FastApiMCP._build_catalog
+    failures = [RuntimeError("conversion failed")]
+
+    def flaky_build_catalog(self: FastApiMCP) -> ToolCatalog:
+        if failures:
+            raise failures.pop()
+        return build_catalog(self)
+
+    monkeypatch.setattr(FastApiMCP, "_build_catalog", flaky_build_catalog)
+
+    with pytest.raises(RuntimeError, match="conversion failed"):
+        await mcp.warmup()
+    assert not mcp.ready
+
+    await mcp.warmup()
+    assert mcp.ready
@@ -0,0 +1,118 @@
+import asyncio
+import inspect
+import logging
+import time
+
+import pytest
+from fastapi import FastAPI
+from mcp.server.lowlevel.server import Server
+
+from fastapi_mcp import FastApiMCP
+from fastapi_mcp.loop_monitor import EventLoopMonitor
+from fastapi_mcp.metrics import MetricsRegistry
+from fastapi_mcp.server import LowlevelMCPServer
+from fastapi_mcp.testing import connect_in_memory
+
+
+@pytest.fixture
+def blocking_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/report", operation_id="build_report")
+    async def build_report():
+        time.sleep(0.3)  # Blocks the event loop
+        return {"status": "done"}
+
+    @app.get("/ping", operation_id="ping")
+    async def ping():
+        return {"status": "ok"}
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_stall_attributed_to_tool_call(blocking_app: FastAPI, caplog: pytest.LogCaptureFixture):
+    monitor = EventLoopMonitor(interval=0.01, threshold=0.1)
+    mcp = FastApiMCP(blocking_app, metrics=True, loop_monitor=monitor)
+    assert mcp.loop_monitor is monitor
+    assert monitor.metrics is mcp.metrics
+
+    try:
+        with caplog.at_level(logging.WARNING, logger="fastapi_mcp.loop_monitor"):
+            async with connect_in_memory(mcp) as session:
+                assert monitor.running
+                await session.call_tool("ping", {})
+                assert monitor.stalls == 0
+
+                await session.call_tool("build_report", {})
+    finally:
+        monitor.stop()
+
+    assert monitor.stalls == 1
+    assert monitor.max_lag >= 0.25
+    assert mcp.metrics is not None
+    assert mcp.metrics.loop_stalls == {"tools/call:build_report": 1}
+    assert mcp.metrics.loop_lag_count == monitor.samples
+
+    [record] = [record for record in caplog.records if record.name == "fastapi_mcp.loop_monitor"]
+    assert "while handling tools/call:build_report" in record.getMessage()
+    # The stack sample shows the blocking code
+    assert "time.sleep(0.3)" in record.getMessage()
+
+
+def test_loop_lag_metrics():
+    metrics = MetricsRegistry()
+    assert "event_loop" not in metrics.render_prometheus()
+
+    metrics.loop_lag(0.002)
+    metrics.loop_lag(0.3, "tools/call:build_report")
+
+    text = metrics.render_prometheus()
+    assert 'fastapi_mcp_event_loop_lag_seconds_bucket{le="0.001"} 0' in text
+    assert 'fastapi_mcp_event_loop_lag_seconds_bucket{le="0.005"} 1' in text
+    assert 'fastapi_mcp_event_loop_lag_seconds_bucket{le="+Inf"} 2' in text
+    assert "fastapi_mcp_event_loop_lag_seconds_count 2" in text
+    assert "fastapi_mcp_event_loop_lag_max_seconds 0.3" in text
+    assert 'fastapi_mcp_event_loop_stalls_total{activity="tools/call:build_report"} 1' in text
+
+
+def test_loop_monitor_disabled_by_default(blocking_app: FastAPI):
+    assert FastApiMCP(blocking_app).loop_monitor is None
+
+    with pytest.raises(ValueError):
+        EventLoopMonitor(threshold=0)
+
+
+@pytest.mark.asyncio
+async def test_watchdog_survives_errors(monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture):
+    monitor = EventLoopMonitor(interval=0.01, threshold=0.05)
+    failures = [RuntimeError("dictionary changed size during iteration")]
+    sample_stack = monitor._sample_stack
+
+    def flaky_sample_stack() -> str:
+        if failures:
+            raise failures.pop()
+        return sample_stack()
+
+    monkeypatch.setattr(monitor, "_sample_stack", flaky_sample_stack)
+
+    monitor.start()
+    try:
+        with caplog.at_level(logging.WARNING, logger="fastapi_mcp.loop_monitor"):
+            for _ in range(2):
+                time.sleep(0.15)  # Blocks the event loop
+                await asyncio.sleep(0.05)
+    finally:
+        monitor.stop()
+
+    messages = [record.getMessage() for record in caplog.records if record.name == "fastapi_mcp.loop_monitor"]
+    assert "Failed to check the event loop for stalls" in messages
+    # The watchdog kept running, and caught the second stall
+    assert any(message.startswith("Event loop blocked for more than") for message in messages)
+
+
+def test_handle_request_override_matches_mcp():
+    # LowlevelMCPServer overrides this private method of mcp, which may change between mcp versions
+    assert inspect.signature(LowlevelMCPServer._handle_request).parameters.keys() == (
+        inspect.signature(Server._handle_request).parameters.keys()
+    )
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from backend.mcp_pool import MCPProcessPool
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVER_SCRIPT = """
+import sys
+import uvicorn
+from fastapi_mcp import FastApiMCP
+from tests.fixtures.simple_app import make_simple_fastapi_app
+
+app = make_simple_fastapi_app()
+FastApiMCP(app).mount()
+uvicorn.run(app, host="127.0.0.1", port=int(sys.argv[1]), log_level="error", timeout_graceful_shutdown=1)
+"""
+
+# Accepts connections, but never answers them
+SILENT_SCRIPT = """
+import socket
+import sys
+import time
+
+server = socket.socket()
+server.bind(("127.0.0.1", int(sys.argv[1])))
+server.listen()
+time.sleep(60)
+"""
+
+
+def server_config(script: str = SERVER_SCRIPT):
+    return {
+        "command": sys.executable,
+        "args": ["-c", script, "{port}"],
+        "env": {"PYTHONPATH": ROOT},
+        "ssePath": "/mcp",
+    }
+
+
+@pytest.mark.asyncio
+async def test_acquire_and_release():
+    pool = MCPProcessPool({"items": server_config()}, min_workers=1, max_workers=2)
+    await pool.start()
+    try:
+        [warm] = pool._idle["items"]
+
+        tools = await pool.list_tools("items")
+        assert "get_item" in {tool.name for tool in tools.tools}
+        result = await pool.call_tool("items", "get_item", {"item_id": 1})
+        assert not result.isError
+
+        # Workers are reused once released, and more are started up to max_workers
+        async with pool.acquire("items") as first:
+            assert first is warm
+            async with pool.acquire("items") as second:
+                assert second is not first
+                assert len(pool._workers["items"]) == 2
+
+                waiting = asyncio.create_task(pool.list_tools("items"))
+                await asyncio.sleep(0.2)
+                assert not waiting.done()
+            await asyncio.wait_for(waiting, 10)
+    finally:
+        await pool.close()
+
+    assert pool._workers["items"] == []
+    assert warm.proc is not None and warm.proc.returncode is not None
+
+
+@pytest.mark.asyncio
+async def test_health_check_restarts_dead_workers():
+    pool = MCPProcessPool({"items": server_config()}, min_workers=1, max_workers=2)
+    await pool.start()
+    try:
+        [worker] = pool._idle["items"]
+        await pool._maintain_server("items")
+        assert pool._idle["items"] == [worker]
+
+        assert worker.proc is not None
+        worker.proc.kill()
+        await worker.proc.wait()
+        await pool._maintain_server("items")
+
+        [replacement] = pool._idle["items"]
+        assert replacement is not worker
+        assert await replacement.health_check(timeout=5)
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_startup_times_out_when_the_handshake_hangs():
+    pool = MCPProcessPool({"silent": server_config(SILENT_SCRIPT)}, min_workers=0, max_workers=1, startup_timeout=2)
+    start = time.monotonic()
+    try:
+        with pytest.raises(RuntimeError, match="启动失败"):
+            await pool.list_tools("silent")
+        assert time.monotonic() - start < 10
+
+        # The slot of the worker is released
+        assert pool._workers["silent"] == []
+    finally:
+        await pool.close()
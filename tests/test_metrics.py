@@ -0,0 +1,76 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from fastapi_mcp import FastApiMCP
+from fastapi_mcp.metrics import MetricsRegistry
+
+
+def test_histogram_buckets():
+    metrics = MetricsRegistry(latency_buckets=[1.0, 0.1])
+    started_at = metrics.call_started("tool")
+    assert metrics.tool("tool").in_flight == 1
+
+    metrics.call_finished("tool", started_at, None)
+    tool_metrics = metrics.tool("tool")
+    assert tool_metrics.in_flight == 0
+    assert tool_metrics.calls == 1
+    assert tool_metrics.errors == {"exception": 1}
+    assert tool_metrics.latency_buckets == [1, 0, 0]
+
+    text = metrics.render_prometheus()
+    assert 'fastapi_mcp_tool_latency_seconds_bucket{tool="tool",le="0.1"} 1' in text
+    assert 'fastapi_mcp_tool_latency_seconds_bucket{tool="tool",le="1.0"} 1' in text
+    assert 'fastapi_mcp_tool_latency_seconds_bucket{tool="tool",le="+Inf"} 1' in text
+    assert 'fastapi_mcp_tool_latency_seconds_count{tool="tool"} 1' in text
+    assert "# TYPE fastapi_mcp_tool_latency_seconds histogram" in text
+
+
+@pytest.mark.asyncio
+async def test_tool_call_metrics(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app, metrics=True)
+    assert mcp.metrics is not None
+
+    async with create_connected_server_and_client_session(mcp.server) as client_session:
+        await client_session.call_tool("get_item", {"item_id": 1})
+        await client_session.call_tool("get_item", {"item_id": 2})
+        await client_session.call_tool("get_item", {"item_id": 404})
+        await client_session.call_tool("create_item", {"id": 10, "name": "New", "price": 1.0, "tags": []})
+        await client_session.call_tool("no_such_tool", {})
+
+    get_item = mcp.metrics.tools["get_item"]
+    assert get_item.calls == 3
+    assert get_item.errors == {"404": 1}
+    assert get_item.in_flight == 0
+    assert get_item.response_bytes > 0
+    assert sum(get_item.latency_buckets) == 3
+
+    assert mcp.metrics.tools["create_item"].request_bytes > 0
+
+    # Unknown tools don't create series
+    assert set(mcp.metrics.tools) == {"get_item", "create_item"}
+
+
+def test_metrics_endpoint(simple_fastapi_app: FastAPI):
+    metrics = MetricsRegistry()
+    FastApiMCP(simple_fastapi_app, metrics=metrics).mount()
+
+    metrics.call_finished("get_item", metrics.call_started("get_item"), None)
+
+    with TestClient(simple_fastapi_app) as client:
+        response = client.get("/mcp/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'fastapi_mcp_tool_calls_total{tool="get_item"} 1' in response.text
+        assert 'fastapi_mcp_tool_errors_total{tool="get_item",status="exception"} 1' in response.text
+        assert "fastapi_mcp_sessions_active 0" in response.text
+
+
+def test_metrics_disabled_by_default(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app)
+    mcp.mount()
+    assert mcp.metrics is None
+
+    with TestClient(simple_fastapi_app) as client:
+        assert client.get("/mcp/metrics").status_code == 404
@@ -0,0 +1,131 @@
+import re
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
+
+from fastapi_mcp import FastApiMCP
+from fastapi_mcp.openapi.convert import convert_openapi_to_mcp_tools
+from fastapi_mcp.openapi.index import OperationIndex, name_matches
+from fastapi_mcp.openapi.utils import resolve_schema_references
+
+
+@pytest.fixture
+def tagged_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/", operation_id="list_items", tags=["items"])
+    async def list_items():
+        return [{"id": 1}]
+
+    @app.get("/items/{item_id}", operation_id="get_item", tags=["items", "read"])
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    @app.post("/items/", operation_id="create_item", tags=["items", "write"])
+    async def create_item():
+        return {"id": 2}
+
+    @app.delete("/items/{item_id}", operation_id="delete_item", tags=["items", "admin-delete"])
+    async def delete_item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/admin/users", operation_id="admin_list_users", tags=["admin-users"])
+    async def admin_list_users():
+        return []
+
+    @app.get("/search/", operation_id="search_items", tags=["search"])
+    async def search_items():
+        return [{"id": 1}]
+
+    return app
+
+
+@pytest.fixture
+def tagged_app_index(tagged_app: FastAPI) -> OperationIndex:
+    return OperationIndex(get_openapi(title=tagged_app.title, version=tagged_app.version, routes=tagged_app.routes))
+
+
+def test_name_matches():
+    assert name_matches("get_item", "get_item")
+    assert not name_matches("get_item", "get_")
+    assert name_matches("get_item", "get_*")
+    assert name_matches("get_item", re.compile(r"get_\w+"))
+    assert not name_matches("get_item", re.compile(r"get"))
+    assert name_matches("get_item", lambda name: name.endswith("_item"))
+
+    with pytest.raises(TypeError):
+        name_matches("get_item", 42)  # type: ignore
+
+
+def test_index_lookups(tagged_app_index: OperationIndex):
+    index = tagged_app_index
+
+    assert len(index) == 6
+    assert "get_item" in index
+    assert index.operations["get_item"].path == "/items/{item_id}"
+    assert index.operations["get_item"].tags == ("items", "read")
+
+    assert set(index.by_tag["items"]) == {"list_items", "get_item", "create_item", "delete_item"}
+    assert index.with_methods(["GET"]) == {"list_items", "get_item", "admin_list_users", "search_items"}
+    assert index.with_methods(["post", "delete"]) == {"create_item", "delete_item"}
+
+    assert index.with_path_prefix("/items") == {"list_items", "get_item", "create_item", "delete_item"}
+    assert index.with_path_prefix("/items/{") == {"get_item", "delete_item"}
+    assert index.with_path_prefix("/admin") == {"admin_list_users"}
+    assert index.with_path_prefix("/nothing") == set()
+
+
+def test_index_select(tagged_app_index: OperationIndex):
+    index = tagged_app_index
+
+    assert index.select() is None
+    assert index.select(include_operations=["get_item", "missing"]) == {"get_item"}
+    assert index.select(include_operations=["*_items"]) == {"list_items", "search_items"}
+    assert index.select(exclude_operations=[re.compile(r".*_item")]) == {
+        "list_items",
+        "admin_list_users",
+        "search_items",
+    }
+    assert index.select(include_tags=["admin*"]) == {"delete_item", "admin_list_users"}
+    assert index.select(exclude_tags=[lambda tag: tag != "search"]) == {"search_items"}
+    assert index.select(include_operations=["get_item"], include_tags=["search"]) == {"get_item", "search_items"}
+
+
+def test_pattern_filters(tagged_app: FastAPI):
+    glob_mcp = FastApiMCP(tagged_app, include_operations=["*_item"])
+    assert {tool.name for tool in glob_mcp.tools} == {"get_item", "create_item", "delete_item"}
+    assert set(glob_mcp.operation_map) == {"get_item", "create_item", "delete_item"}
+
+    regex_mcp = FastApiMCP(tagged_app, exclude_tags=[re.compile(r"admin-.*")])
+    assert {tool.name for tool in regex_mcp.tools} == {"list_items", "get_item", "create_item", "search_items"}
+
+    predicate_mcp = FastApiMCP(tagged_app, include_operations=[lambda operation_id: operation_id.startswith("admin")])
+    assert {tool.name for tool in predicate_mcp.tools} == {"admin_list_users"}
+
+    empty_mcp = FastApiMCP(tagged_app, include_tags=["non_existent_tag"])
+    assert empty_mcp.tools == []
+    assert empty_mcp.operation_map == {}
+
+
+def test_only_selected_operations_are_converted(tagged_app: FastAPI):
+    with patch("fastapi_mcp.openapi.convert.resolve_schema_references", wraps=resolve_schema_references) as resolve:
+        mcp = FastApiMCP(tagged_app, include_operations=["get_item"])
+
+    assert [tool.name for tool in mcp.tools] == ["get_item"]
+    assert resolve.call_count == 1
+    assert len(mcp._catalog.index) == 6
+
+
+def test_convert_selected_operations(tagged_app: FastAPI):
+    openapi_schema = get_openapi(title=tagged_app.title, version=tagged_app.version, routes=tagged_app.routes)
+
+    all_tools, all_operations = convert_openapi_to_mcp_tools(openapi_schema)
+    tools, operation_map = convert_openapi_to_mcp_tools(openapi_schema, operation_ids={"get_item", "search_items"})
+
+    assert [tool.name for tool in tools] == ["get_item", "search_items"]
+    assert set(operation_map) == {"get_item", "search_items"}
+    for tool in tools:
+        assert tool == next(t for t in all_tools if t.name == tool.name)
+        assert operation_map[tool.name] == all_operations[tool.name]
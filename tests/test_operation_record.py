@@ -0,0 +1,73 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
+
+from fastapi_mcp.manifest import ToolManifest
+from fastapi_mcp.openapi.convert import convert_openapi_to_mcp_tools
+from fastapi_mcp.openapi.operation import OperationRecord, ParameterRecord
+
+
+@pytest.fixture
+def operation_map(complex_fastapi_app: FastAPI):
+    openapi_schema = get_openapi(title=complex_fastapi_app.title, version="1.0.0", routes=complex_fastapi_app.routes)
+    _, operation_map = convert_openapi_to_mcp_tools(openapi_schema)
+    return operation_map
+
+
+def test_records_keep_what_execution_needs(operation_map):
+    get_product = operation_map["get_product"]
+    assert get_product.path == "/products/{product_id}"
+    assert get_product.method == "get"
+    assert get_product.body_media_type is None
+    assert [(param.name, param.location) for param in get_product.parameters] == [
+        ("product_id", "path"),
+        ("include_unavailable", "query"),
+    ]
+
+    create_order = operation_map["create_order"]
+    assert create_order.body_media_type == "application/json"
+    assert {(param.name, param.location) for param in create_order.parameters} == {
+        ("user_id", "cookie"),
+        ("authorization", "header"),
+    }
+
+
+def test_records_hold_no_schemas(operation_map):
+    for operation in operation_map.values():
+        assert not hasattr(operation, "__dict__")
+        for param in operation.parameters:
+            assert all(not isinstance(value, dict) for value in param)
+
+
+def test_records_are_immutable(operation_map):
+    operation = operation_map["get_product"]
+    with pytest.raises(AttributeError):
+        operation.path = "/other"
+    with pytest.raises(AttributeError):
+        operation.extra = True
+
+
+def test_item_access(operation_map):
+    operation = operation_map["get_product"]
+    assert operation["path"] == operation.path
+    assert operation["method"] == operation.method
+    with pytest.raises(KeyError):
+        operation["parameters"]
+
+
+def test_dict_round_trip(operation_map):
+    for operation in operation_map.values():
+        assert OperationRecord.from_dict(operation.to_dict()) == operation
+
+    record = OperationRecord("op", "/op", "get", (ParameterRecord("q", "query", "form", True),))
+    assert hash(OperationRecord.from_dict(record.to_dict())) == hash(record)
+
+
+def test_manifest_round_trip(complex_fastapi_app: FastAPI, tmp_path):
+    manifest = ToolManifest.from_app(complex_fastapi_app)
+    path = tmp_path / "mcp-tools.json"
+    manifest.save(path)
+
+    loaded = ToolManifest.load(path)
+    assert all(isinstance(operation, OperationRecord) for operation in loaded.operation_map.values())
+    assert loaded.operation_map == manifest.operation_map
@@ -0,0 +1,93 @@
+import copy
+
+import pytest
+from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
+from pydantic import BaseModel
+
+from fastapi_mcp import FastApiMCP
+from fastapi_mcp.manifest import ToolManifest
+from fastapi_mcp.openapi.convert import convert_openapi_to_mcp_tools
+from fastapi_mcp.openapi.intern import SchemaInterner
+
+
+class Address(BaseModel):
+    street: str
+    city: str
+
+
+class Customer(BaseModel):
+    name: str
+    address: Address
+
+
+@pytest.fixture
+def shared_model_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/customers", operation_id="create_customer")
+    async def create_customer(customer: Customer):
+        return customer
+
+    @app.put("/customers/{customer_id}", operation_id="update_customer")
+    async def update_customer(customer_id: int, customer: Customer):
+        return customer
+
+    @app.post("/addresses", operation_id="create_address")
+    async def create_address(address: Address):
+        return address
+
+    return app
+
+
+def test_identical_subschemas_are_shared(shared_model_app: FastAPI):
+    mcp = FastApiMCP(shared_model_app, share_schemas=True)
+    schemas = {tool.name: tool.inputSchema for tool in mcp.tools}
+
+    created = schemas["create_customer"]["properties"]
+    updated = schemas["update_customer"]["properties"]
+    assert created["address"] is updated["address"]
+    assert created["name"] is updated["name"]
+
+    # The tools are the same as without sharing
+    unshared = FastApiMCP(shared_model_app)
+    assert [tool.model_dump_json() for tool in mcp.tools] == [tool.model_dump_json() for tool in unshared.tools]
+
+
+def test_schemas_are_not_shared_by_default(shared_model_app: FastAPI):
+    openapi_schema = get_openapi(title="Test", version="1.0.0", routes=shared_model_app.routes)
+    tools, _ = convert_openapi_to_mcp_tools(openapi_schema)
+    schemas = {tool.name: tool.inputSchema for tool in tools}
+    assert (
+        schemas["create_customer"]["properties"]["address"] is not (schemas["update_customer"]["properties"]["address"])
+    )
+
+
+def test_intern_does_not_modify_its_input():
+    interner = SchemaInterner()
+    value = {"a": [{"type": "string"}, {"type": "string"}], "b": {"type": "string"}}
+    original = copy.deepcopy(value)
+
+    interned = interner.intern(value)
+    assert value == original
+    assert interned == original
+    assert interned is not value
+    assert interned["a"][0] is interned["a"][1] is interned["b"]
+
+
+def test_intern_distinguishes_structure():
+    interner = SchemaInterner()
+    assert interner.intern({"default": 1}) is not interner.intern({"default": True})
+    assert interner.intern({"default": 1}) is not interner.intern({"default": 1.0})
+    assert interner.intern({"a": 1, "b": 2}) is not interner.intern({"b": 2, "a": 1})
+    assert interner.intern([1, 2]) is not interner.intern([2, 1])
+    assert interner.intern({"a": [1]}) is interner.intern({"a": [1]})
+
+
+def test_loaded_manifest_shares_subschemas(shared_model_app: FastAPI, tmp_path):
+    path = tmp_path / "mcp-tools.json"
+    ToolManifest.from_app(shared_model_app).save(path)
+
+    mcp = FastApiMCP(shared_model_app, manifest=path, share_schemas=True)
+    schemas = {tool.name: tool.inputSchema for tool in mcp.tools}
+    assert schemas["create_customer"]["properties"]["address"] is schemas["update_customer"]["properties"]["address"]
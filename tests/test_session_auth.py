@@ -0,0 +1,232 @@
+import uuid
+from typing import Any, Dict, List, Optional
+
+import anyio
+import pytest
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from fastapi_mcp import FastApiMCP, AuthConfig
+from fastapi_mcp.auth.session import SessionAuthenticator
+from fastapi_mcp.transport.sse import FastApiSseTransport
+from fastapi_mcp.types import SessionPrincipal
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_request(
+    authorization: str = "Bearer token-1",
+    claims: Any = None,
+    session_id: str = "",
+    extra_headers: Optional[Dict[str, str]] = None,
+) -> Request:
+    headers = [(b"authorization", authorization.encode())] if authorization else []
+    headers += [(name.encode(), value.encode()) for name, value in (extra_headers or {}).items()]
+    request = Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/mcp",
+            "headers": headers,
+            "query_string": f"session_id={session_id}".encode(),
+        }
+    )
+    if claims is not None:
+        request.state.auth_claims = claims
+    return request
+
+
+@pytest.mark.asyncio
+async def test_bind_and_check():
+    clock = FakeClock()
+    authenticator = SessionAuthenticator(max_age=3600, clock=clock)
+
+    principal = authenticator.bind(make_request(claims={"sub": "user-1", "exp": clock.now + 60}))
+    assert principal.claims["sub"] == "user-1"
+    assert principal.expires_at == clock.now + 60
+
+    await authenticator.check(principal, make_request())
+
+    with pytest.raises(HTTPException) as excinfo:
+        await authenticator.check(principal, make_request("Bearer token-2"))
+    assert excinfo.value.status_code == 403
+
+    with pytest.raises(HTTPException) as excinfo:
+        await authenticator.check(None, make_request())
+    assert excinfo.value.status_code == 401
+
+    clock.now += 60
+    with pytest.raises(HTTPException, match="Session expired") as excinfo:
+        await authenticator.check(principal, make_request())
+    assert excinfo.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_max_age_and_revocation():
+    clock = FakeClock()
+    revoked_subjects = set()
+
+    async def is_revoked(principal: SessionPrincipal) -> bool:
+        return principal.claims.get("sub") in revoked_subjects
+
+    authenticator = SessionAuthenticator(max_age=30, is_revoked=is_revoked, clock=clock)
+    principal = authenticator.bind(make_request(claims={"sub": "user-1", "exp": clock.now + 3600}))
+    assert principal.expires_at == clock.now + 30
+
+    await authenticator.check(principal, make_request())
+
+    revoked_subjects.add("user-1")
+    with pytest.raises(HTTPException, match="Session revoked"):
+        await authenticator.check(principal, make_request())
+
+    # Without claims nor max age, sessions never expire
+    principal = SessionAuthenticator(clock=clock).bind(make_request())
+    assert principal.claims == {}
+    assert principal.expires_at is None
+
+
+@pytest.mark.asyncio
+async def test_sessions_without_credentials_are_refused():
+    authenticator = SessionAuthenticator()
+    with pytest.raises(HTTPException) as excinfo:
+        authenticator.bind(make_request(""))
+    assert excinfo.value.status_code == 401
+
+    principal = authenticator.bind(make_request())
+    with pytest.raises(HTTPException) as excinfo:
+        await authenticator.check(principal, make_request(""))
+    assert excinfo.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_cookies_are_part_of_the_credentials():
+    authenticator = SessionAuthenticator()
+    principal = authenticator.bind(make_request("", extra_headers={"cookie": "session=user-1"}))
+
+    await authenticator.check(principal, make_request("", extra_headers={"cookie": "session=user-1"}))
+    for request in (make_request("", extra_headers={"cookie": "session=user-2"}), make_request("")):
+        with pytest.raises(HTTPException) as excinfo:
+            await authenticator.check(principal, request)
+        assert excinfo.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_configured_credential_headers():
+    authenticator = SessionAuthenticator(credential_headers=["X-API-Key"])
+    principal = authenticator.bind(make_request("", extra_headers={"x-api-key": "key-1"}))
+
+    # Other headers are not part of the credentials
+    await authenticator.check(principal, make_request("Bearer other", extra_headers={"x-api-key": "key-1"}))
+    with pytest.raises(HTTPException) as excinfo:
+        await authenticator.check(principal, make_request("", extra_headers={"x-api-key": "key-2"}))
+    assert excinfo.value.status_code == 403
+
+    with pytest.raises(HTTPException) as excinfo:
+        authenticator.bind(make_request("Bearer token-1"))
+    assert excinfo.value.status_code == 401
+
+
+def test_connection_without_credentials_is_refused():
+    async def authenticate_by_address(request: Request):
+        pass
+
+    app = FastAPI()
+    mcp = FastApiMCP(
+        app,
+        auth_config=AuthConfig(
+            dependencies=[Depends(authenticate_by_address)],
+            session_auth=True,
+            session_credential_headers=["x-api-key"],
+        ),
+    )
+    mcp.mount()
+
+    response = TestClient(app).get("/mcp", headers={"Authorization": "Bearer token-1"})
+    assert response.status_code == 401
+    assert "x-api-key" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_connect_binds_principal_to_session():
+    transport = FastApiSseTransport("/mcp/messages/", session_authenticator=SessionAuthenticator())
+    disconnected = anyio.Event()
+    sent: List[Dict[str, Any]] = []
+
+    async def receive():
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    request = Request(
+        {"type": "http", "method": "GET", "path": "/mcp", "headers": [(b"authorization", b"Bearer token-1")]},
+        receive,
+        send,
+    )
+    request.state.auth_claims = {"sub": "user-1"}
+
+    async with transport.connect_fastapi_sse(request):
+        [session_id] = transport._read_stream_writers
+        assert transport._session_principals[session_id].claims == {"sub": "user-1"}
+
+        await transport.session_authenticator.check(  # type: ignore[union-attr]
+            transport._session_principals.get(session_id), make_request(session_id=session_id.hex)
+        )
+        disconnected.set()
+
+    assert transport._session_principals == {}
+
+
+@pytest.mark.parametrize("session_auth", [False, True])
+def test_messages_skip_dependencies_with_session_auth(session_auth: bool):
+    async def authenticate(request: Request):
+        pass
+
+    app = FastAPI()
+    mcp = FastApiMCP(app, auth_config=AuthConfig(dependencies=[Depends(authenticate)], session_auth=session_auth))
+    mcp.mount()
+
+    routes = {getattr(route, "path", None): route for route in app.routes}
+    assert len(routes["/mcp"].dependencies) == 1  # type: ignore[attr-defined]
+    assert len(routes["/mcp/messages/"].dependencies) == (0 if session_auth else 1)  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_post_message_checks_session_binding():
+    transport = FastApiSseTransport("/mcp/messages/", session_authenticator=SessionAuthenticator())
+
+    session_id = uuid.uuid4()
+    send_stream, receive_stream = anyio.create_memory_object_stream(1)
+    transport._read_stream_writers[session_id] = send_stream
+
+    def post(authorization: str) -> Request:
+        body = b'{"jsonrpc": "2.0", "method": "notifications/initialized"}'
+
+        async def receive():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        request = make_request(authorization, session_id=session_id.hex)
+        request._receive = receive
+        return request
+
+    # Sessions established without a principal are rejected
+    with pytest.raises(HTTPException) as excinfo:
+        await transport.handle_fastapi_post_message(post("Bearer token-1"))
+    assert excinfo.value.status_code == 401
+
+    transport._session_principals[session_id] = transport.session_authenticator.bind(  # type: ignore[union-attr]
+        make_request("Bearer token-1")
+    )
+    response = await transport.handle_fastapi_post_message(post("Bearer token-1"))
+    assert response.status_code == 202
+
+    with pytest.raises(HTTPException) as excinfo:
+        await transport.handle_fastapi_post_message(post("Bearer token-2"))
+    assert excinfo.value.status_code == 403
@@ -183,3 +183,29 @@ async def test_send_message_safely_exception_handling(
 
     # Verify that the writer.send was called
     assert mock_writer.send.called
+
+
+@pytest.mark.anyio
+async def test_handle_post_message_mirrors_list_tools_cursor(
+    mock_transport: FastApiSseTransport, valid_session_id: UUID, mock_writer: AsyncMock
+) -> None:
+    """Test that the pagination cursor of a tools/list request is readable by any version of `mcp`."""
+    mock_transport._read_stream_writers[valid_session_id] = mock_writer
+
+    mock_request = MagicMock(spec=Request)
+    mock_request.method = "POST"
+    mock_request.url.path = "/messages"
+    mock_request.headers = {}
+    mock_request.cookies = {}
+    mock_request.query_params = {"session_id": valid_session_id.hex}
+    mock_request.body = AsyncMock(
+        return_value=b'{"jsonrpc": "2.0", "id": "1", "method": "tools/list", "params": {"cursor": "abc"}}'
+    )
+
+    with patch("fastapi_mcp.transport.sse.BackgroundTasks") as MockBackgroundTasks:
+        response = await mock_transport.handle_fastapi_post_message(mock_request)
+
+        assert response.status_code == 202
+        sent_message = MockBackgroundTasks.return_value.add_task.call_args[0][2]
+        assert sent_message.root.params["cursor"] == "abc"
+        assert sent_message.root.model_dump()["cursor"] == "abc"
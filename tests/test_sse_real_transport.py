@@ -17,6 +17,7 @@ import pytest
 import httpx
 import uvicorn
 from fastapi_mcp import FastApiMCP
+from fastapi_mcp.discovery import discover_server, discover_servers
 
 from .fixtures.simple_app import make_simple_fastapi_app
 
@@ -193,3 +194,33 @@ async def test_sse_tool_call(server: None, server_url: str) -> None:
             assert not tool_call_result.isError
             assert tool_call_result.content is not None
             assert len(tool_call_result.content) > 0
+
+
+@pytest.mark.anyio
+async def test_discover_servers(server: None, server_url: str, server_port: int) -> None:
+    with socket.socket() as s:
+        s.bind((HOST, 0))
+        unused_port = s.getsockname()[1]
+    unreachable_url = f"http://{HOST}:{unused_port}/mcp"
+
+    results = [
+        result
+        async for result in discover_servers([server_url + "/mcp", unreachable_url, server_url + "/missing"], timeout=5)
+    ]
+    by_url = {result.url: result for result in results}
+    assert len(by_url) == 3
+
+    found = by_url[server_url + "/mcp"]
+    assert found.ok
+    assert found.server_name == SERVER_NAME
+    assert {tool.name for tool in found.tools} >= {"list_items", "get_item"}
+
+    assert not by_url[unreachable_url].ok
+    assert not by_url[server_url + "/missing"].ok
+
+
+@pytest.mark.anyio
+async def test_discover_server_timeout(server: None, server_url: str) -> None:
+    result = await discover_server(server_url + "/mcp", timeout=0.001)
+    assert not result.ok
+    assert result.error is not None and "Timed out" in result.error
@@ -0,0 +1,74 @@
+import json
+
+import mcp.types as types
+import pytest
+from fastapi import FastAPI, Request
+
+from fastapi_mcp import FastApiMCP, ToolView
+from fastapi_mcp.testing import ToolCallSpec, connect_in_memory, run_load
+
+
+@pytest.fixture
+def echo_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}", operation_id="get_item", tags=["items"])
+    async def get_item(item_id: int, request: Request):
+        return {"id": item_id, "authorization": request.headers.get("authorization")}
+
+    @app.delete("/items/{item_id}", operation_id="delete_item", tags=["admin"])
+    async def delete_item(item_id: int):
+        return None
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_connect_in_memory(echo_app: FastAPI):
+    mcp = FastApiMCP(echo_app, tool_views={"readonly": ToolView(include_tags=["items"])})
+
+    async with connect_in_memory(mcp) as session:
+        tools = await session.list_tools()
+        assert {tool.name for tool in tools.tools} == {"get_item", "delete_item"}
+        assert len(mcp._session_writers) == 1
+
+    assert len(mcp._session_writers) == 0
+
+    async with connect_in_memory(mcp, tool_view="readonly", headers={"authorization": "Bearer token"}) as session:
+        tools = await session.list_tools()
+        assert [tool.name for tool in tools.tools] == ["get_item"]
+
+        result = await session.call_tool("get_item", {"item_id": 1})
+        assert isinstance(result.content[0], types.TextContent)
+        assert json.loads(result.content[0].text) == {"id": 1, "authorization": "Bearer token"}
+
+
+@pytest.mark.asyncio
+async def test_run_load(echo_app: FastAPI):
+    mcp = FastApiMCP(echo_app)
+    tool_mix = [
+        ToolCallSpec(name="get_item", arguments=lambda rng: {"item_id": rng.randint(1, 100)}, weight=3),
+        ToolCallSpec(name="delete_item", arguments={"item_id": 1}),
+        ToolCallSpec(name="get_item_missing_argument", weight=0.5),
+    ]
+
+    result = await run_load(mcp, tool_mix, sessions=5, calls_per_session=20, seed=42)
+
+    assert result.sessions == 5
+    assert result.calls == 100
+    assert sum(stats.calls for stats in result.tools.values()) == 100
+    assert result.tools["get_item"].calls > result.tools["delete_item"].calls
+    assert result.tools["get_item"].errors == 0
+    assert result.tools["get_item_missing_argument"].errors == result.tools["get_item_missing_argument"].calls
+    assert result.errors == result.tools["get_item_missing_argument"].errors
+    assert result.calls_per_second > 0
+    assert result.overall.p50_ms <= result.overall.p99_ms <= result.overall.max_ms
+
+    # The same seed picks the same calls
+    again = await run_load(mcp, tool_mix, sessions=5, calls_per_session=20, seed=42)
+    assert {name: stats.calls for name, stats in again.tools.items()} == {
+        name: stats.calls for name, stats in result.tools.items()
+    }
+
+    with pytest.raises(ValueError):
+        await run_load(mcp, [])
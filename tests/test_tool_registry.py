@@ -0,0 +1,96 @@
+import asyncio
+from typing import List
+
+import mcp.types as types
+import pytest
+
+from backend.tool_registry import ToolRegistry
+
+
+class CountingFetcher:
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self) -> List[types.Tool]:
+        self.calls += 1
+        await self.release.wait()
+        return [types.Tool(name=f"tool_{self.calls}", inputSchema={"type": "object"})]
+
+
+@pytest.mark.asyncio
+async def test_first_read_waits_for_the_fetch():
+    registry = ToolRegistry(max_tools=10)
+    fetcher = CountingFetcher()
+    registry.register("server", "external", fetcher)
+
+    tools = await registry.get_tools("server")
+    assert [tool.name for tool in tools] == ["tool_1"]
+    assert fetcher.calls == 1
+
+    # Fresh tools are served from the cache
+    await registry.get_tools("server")
+    assert fetcher.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_read_returns_cached_tools_and_revalidates_in_background():
+    registry = ToolRegistry(max_tools=10, ttl=0.0)
+    fetcher = CountingFetcher()
+    registry.register("server", "external", fetcher)
+    await registry.refresh("server")
+
+    fetcher.release.clear()
+    tools = await registry.get_tools("server")
+    assert [tool.name for tool in tools] == ["tool_1"]
+
+    # A single refresh runs in the background, and its result is served once it completes
+    await registry.get_tools("server")
+    await asyncio.sleep(0)
+    assert fetcher.calls == 2
+
+    fetcher.release.set()
+    await asyncio.wait_for(asyncio.shield(registry._entries["server"].refreshing), 1)
+    assert [tool.name for tool in await registry.get_tools("server")] == ["tool_2"]
+    await registry.close()
+
+
+@pytest.mark.asyncio
+async def test_aggregated_revalidates_stale_servers():
+    registry = ToolRegistry(max_tools=10, ttl=0.0)
+    fetcher = CountingFetcher()
+    registry.register("server", "python", fetcher)
+    await registry.refresh("server")
+
+    fetcher.release.clear()
+    servers = await registry.aggregated()
+    assert [tool["name"] for tool in servers["server"]["tools"]] == ["tool_1"]
+    await asyncio.sleep(0)
+    assert fetcher.calls == 2
+
+    fetcher.release.set()
+    await asyncio.wait_for(asyncio.shield(registry._entries["server"].refreshing), 1)
+    servers = await registry.aggregated()
+    assert [tool["name"] for tool in servers["server"]["tools"]] == ["tool_2"]
+    await registry.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_revalidation_keeps_the_cached_tools():
+    registry = ToolRegistry(max_tools=10, ttl=0.0)
+    fetcher = CountingFetcher()
+    registry.register("server", "external", fetcher)
+    await registry.refresh("server")
+
+    async def failing_fetch() -> List[types.Tool]:
+        raise RuntimeError("server is down")
+
+    registry._entries["server"].fetcher = failing_fetch
+    await registry.get_tools("server")
+    await asyncio.wait_for(asyncio.shield(registry._entries["server"].refreshing), 1)
+
+    servers = await registry.aggregated()
+    assert [tool["name"] for tool in servers["server"]["tools"]] == ["tool_1"]
+    assert "server is down" in servers["server"]["error"]
+    await registry.close()
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+import mcp.types as types
+from fastapi import FastAPI
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from fastapi_mcp import FastApiMCP
+from fastapi_mcp.search import ToolSearchIndex, tokenize
+
+
+def test_tokenize():
+    assert tokenize("get_item") == ["get", "item"]
+    assert tokenize("listHTTPItems") == ["list", "http", "items"]
+    assert tokenize("/items/{item_id}") == ["items", "item", "id"]
+    assert tokenize("Create an Order") == ["create", "an", "order"]
+
+
+def test_tokenize_non_ascii():
+    assert tokenize("创建订单") == ["创建", "建订", "订单"]
+    assert tokenize("获取 item_id 的订单") == ["获取", "item", "id", "的订", "订单"]
+    assert tokenize("单") == ["单"]
+    assert tokenize("Создать заказ") == ["создать", "заказ"]
+    assert tokenize("café_au_lait") == ["café", "au", "lait"]
+
+
+def test_search_non_ascii_descriptions():
+    app = FastAPI()
+
+    @app.post("/orders", operation_id="create_order", summary="创建订单")
+    async def create_order():
+        return {}
+
+    @app.post("/users", operation_id="create_user", summary="创建用户")
+    async def create_user():
+        return {}
+
+    @app.get("/users", operation_id="list_users", summary="获取用户列表")
+    async def list_users():
+        return {}
+
+    search_index = ToolSearchIndex(FastApiMCP(app).tools)
+    assert search_index.search("订单", limit=1)[0].name == "create_order"
+    assert search_index.search("用户列表", limit=1)[0].name == "list_users"
+    assert {tool.name for tool in search_index.search("创建")} == {"create_order", "create_user"}
+
+
+def test_search_index_ranking(complex_fastapi_app: FastAPI):
+    mcp = FastApiMCP(complex_fastapi_app)
+    search_index = ToolSearchIndex(mcp.tools, mcp._catalog.index)
+
+    assert [tool.name for tool in search_index.search("order", limit=1)] == ["create_order"]
+    assert search_index.search("customer")[0].name == "get_customer"
+    assert search_index.search("products")[0].name in {"list_products", "get_product"}
+    assert search_index.search("nothing matches this") == []
+    assert len(search_index.search("product", limit=1)) == 1
+
+
+def test_search_index_empty():
+    assert ToolSearchIndex([]).search("anything") == []
+
+
+@pytest.mark.asyncio
+async def test_tool_search_mode(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app, tool_search=True)
+
+    # All tools are still converted, but only the meta-tools are listed
+    assert len(mcp.tools) == 6
+
+    async with create_connected_server_and_client_session(mcp.server) as client_session:
+        tools_result = await client_session.list_tools()
+        assert [tool.name for tool in tools_result.tools] == ["search_tools", "call_tool"]
+
+        search_result = await client_session.call_tool("search_tools", {"query": "delete an item", "limit": 2})
+        assert not search_result.isError
+        assert isinstance(search_result.content[0], types.TextContent)
+        found = json.loads(search_result.content[0].text)
+        assert len(found) == 2
+        assert found[0]["name"] == "delete_item"
+        assert "item_id" in found[0]["inputSchema"]["properties"]
+
+        call_result = await client_session.call_tool("call_tool", {"name": "get_item", "arguments": {"item_id": 1}})
+        assert not call_result.isError
+        assert isinstance(call_result.content[0], types.TextContent)
+        assert json.loads(call_result.content[0].text)["id"] == 1
+
+        # Tools found through search can also be called directly
+        direct_result = await client_session.call_tool("get_item", {"item_id": 2})
+        assert not direct_result.isError
+
+        missing_name_result = await client_session.call_tool("call_tool", {"arguments": {}})
+        assert missing_name_result.isError
+
+        missing_query_result = await client_session.call_tool("search_tools", {})
+        assert missing_query_result.isError
@@ -0,0 +1,128 @@
+import json
+
+import anyio
+import pytest
+import mcp.types as types
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from mcp.client.session import ClientSession
+from mcp.shared.memory import create_client_server_memory_streams
+
+from fastapi_mcp import FastApiMCP, ToolView
+from fastapi_mcp.server import TOOL_VIEW_CAPABILITY
+
+
+TOOL_VIEWS = {
+    "readonly": ToolView(methods=["GET"], exclude_tags=["error"]),
+    "single_item": ToolView(path_prefix="/items/{"),
+}
+
+
+def test_tool_view_validation():
+    with pytest.raises(ValueError):
+        ToolView(include_operations=["a"], exclude_operations=["b"])
+
+    with pytest.raises(ValueError):
+        ToolView(include_tags=["a"], exclude_tags=["b"])
+
+
+def test_catalog_views(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app, tool_views=TOOL_VIEWS)
+    catalog = mcp._catalog
+
+    readonly = catalog.view("readonly")
+    assert [tool.name for tool in readonly.tools] == ["list_items", "get_item"]
+    assert set(readonly.operation_map) == {"list_items", "get_item"}
+    assert catalog.view("readonly") is readonly
+
+    # Views share the tools converted for the whole catalog
+    assert all(any(tool is catalog_tool for catalog_tool in catalog.tools) for tool in readonly.tools)
+
+    single_item = catalog.view("single_item")
+    assert {tool.name for tool in single_item.tools} == {"get_item", "update_item", "delete_item"}
+
+    with pytest.raises(KeyError):
+        catalog.view("missing")
+
+    # Views are rebuilt along with the catalog
+    mcp.setup_server()
+    assert mcp._catalog.view("readonly") is not readonly
+
+
+@pytest.mark.asyncio
+async def test_session_tool_view(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app, tool_views=TOOL_VIEWS)
+
+    async with create_client_server_memory_streams() as (client_streams, server_streams):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(mcp._run_session, *server_streams, "readonly")
+
+            async with ClientSession(*client_streams) as client_session:
+                await client_session.initialize()
+
+                tools_result = await client_session.list_tools()
+                assert [tool.name for tool in tools_result.tools] == ["list_items", "get_item"]
+
+                allowed_result = await client_session.call_tool("get_item", {"item_id": 1})
+                assert not allowed_result.isError
+
+                # Tools outside of the view cannot be called either
+                denied_result = await client_session.call_tool("delete_item", {"item_id": 1})
+                assert denied_result.isError
+
+            tg.cancel_scope.cancel()
+
+
+@pytest.mark.asyncio
+async def test_initialization_tool_view_hint(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app, tool_views=TOOL_VIEWS)
+
+    async with create_client_server_memory_streams() as (client_streams, server_streams):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(mcp._run_session, *server_streams)
+
+            async with ClientSession(*client_streams) as client_session:
+                await client_session.send_request(
+                    types.ClientRequest(
+                        types.InitializeRequest(
+                            method="initialize",
+                            params=types.InitializeRequestParams(
+                                protocolVersion=types.LATEST_PROTOCOL_VERSION,
+                                capabilities=types.ClientCapabilities(
+                                    experimental={TOOL_VIEW_CAPABILITY: {"name": "single_item"}}
+                                ),
+                                clientInfo=types.Implementation(name="test", version="0.1.0"),
+                            ),
+                        )
+                    ),
+                    types.InitializeResult,
+                )
+                await client_session.send_notification(
+                    types.ClientNotification(types.InitializedNotification(method="notifications/initialized"))
+                )
+
+                tools_result = await client_session.list_tools()
+                assert {tool.name for tool in tools_result.tools} == {"get_item", "update_item", "delete_item"}
+
+            tg.cancel_scope.cancel()
+
+
+def test_tools_http_endpoint_views(simple_fastapi_app: FastAPI):
+    def resolver(request: Request):
+        return "readonly" if request.headers.get("x-role") == "viewer" else None
+
+    mcp = FastApiMCP(simple_fastapi_app, tool_views=TOOL_VIEWS, tool_view_resolver=resolver)
+    mcp.mount()
+    client = TestClient(simple_fastapi_app)
+
+    all_tools = json.loads(client.get("/mcp/tools").content)["tools"]
+    assert len(all_tools) == 6
+
+    view_response = client.get("/mcp/tools", params={"view": "single_item"})
+    assert {tool["name"] for tool in view_response.json()["tools"]} == {"get_item", "update_item", "delete_item"}
+
+    # The resolver takes precedence over the query parameter
+    resolved_response = client.get("/mcp/tools", params={"view": "single_item"}, headers={"x-role": "viewer"})
+    assert [tool["name"] for tool in resolved_response.json()["tools"]] == ["list_items", "get_item"]
+
+    assert client.get("/mcp/tools", params={"view": "missing"}).status_code == 400
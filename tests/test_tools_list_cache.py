@@ -0,0 +1,96 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from fastapi_mcp import FastApiMCP
+from fastapi_mcp.utils.tool_list_cache import TOOLS_HASH_META_KEY, ToolListCache
+
+
+def test_pages_are_cached(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app, tools_page_size=4)
+    cache = mcp._catalog.tools_cache
+
+    first_page = cache.get_page()
+    assert cache.get_page() is first_page
+    assert cache.get_page_bytes() is cache.get_page_bytes()
+
+    assert first_page.nextCursor is not None
+    second_page = cache.get_page(first_page.nextCursor)
+    assert cache.get_page(first_page.nextCursor) is second_page
+
+
+def test_unknown_cursors_are_not_cached(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app, tools_page_size=4)
+    cache = mcp._catalog.tools_cache
+
+    # A valid cursor that was never issued by this cache
+    cursor = ToolListCache(list(reversed(mcp.tools)), page_size=1).get_page().nextCursor
+    assert cache.get_page(cursor) is not cache.get_page(cursor)
+
+
+def test_page_bytes_match_page(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app)
+    cache = mcp._catalog.tools_cache
+
+    result = json.loads(cache.get_page_bytes())
+    assert [tool["name"] for tool in result["tools"]] == [tool.name for tool in mcp.tools]
+    assert result["_meta"][TOOLS_HASH_META_KEY] == cache.content_hash
+
+
+def test_content_hash_is_stable(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app)
+    original_cache = mcp._catalog.tools_cache
+    original_hash = original_cache.content_hash
+
+    # Order and page size don't affect the hash
+    assert ToolListCache(list(reversed(mcp.tools)), page_size=2).content_hash == original_hash
+
+    # Rebuilding the same tools invalidates the cache, but keeps the hash
+    mcp.setup_server()
+    assert mcp._catalog.tools_cache is not original_cache
+    assert mcp._catalog.tools_cache.content_hash == original_hash
+
+    # Changing the tools changes the hash
+    @simple_fastapi_app.get("/new", operation_id="new_endpoint")
+    async def new_endpoint():
+        return {}
+
+    mcp.setup_server()
+    assert mcp._catalog.tools_cache.content_hash != original_hash
+
+
+@pytest.mark.asyncio
+async def test_list_tools_includes_content_hash(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app)
+
+    async with create_connected_server_and_client_session(mcp.server) as client_session:
+        result = await client_session.list_tools()
+
+    assert result.meta is not None
+    assert result.meta[TOOLS_HASH_META_KEY] == mcp._catalog.tools_cache.content_hash
+
+
+def test_tools_http_endpoint(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app, tools_page_size=4)
+    mcp.mount()
+    client = TestClient(simple_fastapi_app)
+
+    response = client.get("/mcp/tools")
+    assert response.status_code == 200
+    assert response.content == mcp._catalog.tools_cache.get_page_bytes()
+    etag = response.headers["etag"]
+    assert etag == f'"{mcp._catalog.tools_cache.content_hash}"'
+
+    next_cursor = response.json()["nextCursor"]
+    response = client.get("/mcp/tools", params={"cursor": next_cursor})
+    assert response.status_code == 200
+    assert len(response.json()["tools"]) == 2
+
+    response = client.get("/mcp/tools", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    response = client.get("/mcp/tools", params={"cursor": "not a valid cursor!"})
+    assert response.status_code == 400
@@ -0,0 +1,93 @@
+from typing import List, Optional
+
+import pytest
+import mcp.types as types
+from mcp.client.session import ClientSession
+from mcp.shared.exceptions import McpError
+from mcp.shared.memory import create_connected_server_and_client_session
+from fastapi import FastAPI
+
+from fastapi_mcp import FastApiMCP
+from fastapi_mcp.utils.pagination import decode_cursor, encode_cursor
+
+
+async def list_tools_page(client_session: ClientSession, cursor: Optional[str] = None) -> types.ListToolsResult:
+    return await client_session.send_request(
+        types.ClientRequest(types.ListToolsRequest(method="tools/list", cursor=cursor)),
+        types.ListToolsResult,
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_tools_without_page_size_returns_everything(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app)
+
+    async with create_connected_server_and_client_session(mcp.server) as client_session:
+        result = await list_tools_page(client_session)
+
+    assert [tool.name for tool in result.tools] == [tool.name for tool in mcp.tools]
+    assert result.nextCursor is None
+
+
+@pytest.mark.asyncio
+async def test_list_tools_paginated(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app, tools_page_size=4)
+
+    pages: List[List[str]] = []
+    cursor = None
+    async with create_connected_server_and_client_session(mcp.server) as client_session:
+        while True:
+            result = await list_tools_page(client_session, cursor)
+            pages.append([tool.name for tool in result.tools])
+            cursor = result.nextCursor
+            if cursor is None:
+                break
+
+    assert [len(page) for page in pages] == [4, 2]
+    all_names = [name for page in pages for name in page]
+    assert all_names == sorted(tool.name for tool in mcp.tools)
+
+
+@pytest.mark.asyncio
+async def test_list_tools_cursor_survives_setup_server(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app, tools_page_size=3)
+
+    async with create_connected_server_and_client_session(mcp.server) as client_session:
+        first_page = await list_tools_page(client_session)
+        assert first_page.nextCursor is not None
+
+        # Add an endpoint that sorts before the cursor, and rebuild the tools
+        @simple_fastapi_app.get("/aaa", operation_id="aaa_first")
+        async def aaa_first():
+            return {}
+
+        mcp.setup_server()
+
+        second_page = await list_tools_page(client_session, first_page.nextCursor)
+
+    first_names = [tool.name for tool in first_page.tools]
+    second_names = [tool.name for tool in second_page.tools]
+    assert "aaa_first" not in second_names
+    assert not set(first_names) & set(second_names)
+    assert second_names[0] > first_names[-1]
+
+
+@pytest.mark.asyncio
+async def test_list_tools_invalid_cursor(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app, tools_page_size=2)
+
+    async with create_connected_server_and_client_session(mcp.server) as client_session:
+        with pytest.raises(McpError) as excinfo:
+            await list_tools_page(client_session, "not a valid cursor!")
+
+    assert excinfo.value.error.code == types.INVALID_PARAMS
+
+
+def test_cursor_roundtrip():
+    assert decode_cursor(encode_cursor("get_item")) == "get_item"
+    assert decode_cursor(encode_cursor("列出项目")) == "列出项目"
+
+
+def test_invalid_page_size(simple_fastapi_app: FastAPI):
+    with pytest.raises(ValueError):
+        FastApiMCP(simple_fastapi_app, tools_page_size=0)
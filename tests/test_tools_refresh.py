@@ -0,0 +1,95 @@
+from typing import List
+
+import anyio
+import pytest
+import mcp.types as types
+from mcp.client.session import ClientSession
+from mcp.shared.memory import create_client_server_memory_streams
+from fastapi import FastAPI
+
+from fastapi_mcp import FastApiMCP
+
+
+@pytest.mark.asyncio
+async def test_refresh_tools_notifies_sessions(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app)
+    received: List[types.ServerNotification] = []
+    tools_changed = anyio.Event()
+
+    async def message_handler(message):
+        if isinstance(message, types.ServerNotification):
+            received.append(message)
+            if isinstance(message.root, types.ToolListChangedNotification):
+                tools_changed.set()
+
+    async with create_client_server_memory_streams() as (client_streams, server_streams):
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(mcp._run_session, *server_streams)
+
+            async with ClientSession(*client_streams, message_handler=message_handler) as client_session:
+                init_result = await client_session.initialize()
+                assert init_result.capabilities.tools is not None
+                assert init_result.capabilities.tools.listChanged is True
+                assert len(mcp._session_writers) == 1
+
+                # Nothing changed, so nothing is sent
+                assert await mcp.refresh_tools() is False
+
+                @simple_fastapi_app.get("/new", operation_id="new_endpoint")
+                async def new_endpoint():
+                    return {}
+
+                assert await mcp.refresh_tools() is True
+
+                with anyio.fail_after(5):
+                    await tools_changed.wait()
+
+                assert len(received) == 1
+                tools_result = await client_session.list_tools()
+                assert "new_endpoint" in [tool.name for tool in tools_result.tools]
+
+            tg.cancel_scope.cancel()
+
+    assert not mcp._session_writers
+
+
+@pytest.mark.asyncio
+async def test_refresh_tools_swaps_catalog(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app)
+    original_catalog = mcp._catalog
+
+    @simple_fastapi_app.get("/new", operation_id="new_endpoint")
+    async def new_endpoint():
+        return {}
+
+    assert await mcp.refresh_tools() is True
+    assert mcp._catalog is not original_catalog
+    assert "new_endpoint" in mcp.operation_map
+    assert "new_endpoint" in [tool.name for tool in mcp.tools]
+    assert "new_endpoint" not in original_catalog.operation_map
+
+
+@pytest.mark.asyncio
+async def test_refresh_tools_with_tool_search(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app, tool_search=True)
+    assert await mcp.refresh_tools() is False
+
+    # The listed meta-tools stay the same, but the tools they search changed
+    @simple_fastapi_app.get("/new", operation_id="new_endpoint")
+    async def new_endpoint():
+        return {}
+
+    assert await mcp.refresh_tools() is True
+    assert "new_endpoint" in mcp.operation_map
+
+
+@pytest.mark.asyncio
+async def test_notify_tools_changed_drops_closed_sessions(simple_fastapi_app: FastAPI):
+    mcp = FastApiMCP(simple_fastapi_app)
+
+    writer, reader = anyio.create_memory_object_stream[types.JSONRPCMessage](1)
+    reader.close()
+    mcp._session_writers.add(writer)
+
+    await mcp.notify_tools_changed()
+    assert writer not in mcp._session_writers
@@ -0,0 +1,162 @@
+import json
+import time
+import uuid
+from typing import Dict, List, Union
+
+import anyio
+import mcp.types as types
+import pytest
+from fastapi import FastAPI, Request
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from fastapi_mcp import FastApiMCP
+from fastapi_mcp.tracing import TRACE_CONTEXT_PARAM, InMemorySpanExporter, SpanContext, SpanExporter, Tracer
+from fastapi_mcp.transport.sse import FastApiSseTransport
+
+
+def test_traceparent():
+    context = SpanContext(trace_id="4bf92f3577b34da6a3ce929d0e0e4736", span_id="00f067aa0ba902b7")
+    assert context.to_traceparent() == "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+    assert SpanContext.from_traceparent(context.to_traceparent()) == context
+
+    assert SpanContext.from_traceparent(None) is None
+    assert SpanContext.from_traceparent("garbage") is None
+    assert SpanContext.from_traceparent("00-00000000000000000000000000000000-00f067aa0ba902b7-01") is None
+
+
+def test_span_nesting_and_errors():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter)
+
+    with tracer.start_span("outer") as outer:
+        with pytest.raises(ValueError):
+            with tracer.start_span("inner"):
+                raise ValueError("boom")
+        assert tracer.current_span() is outer
+    assert tracer.current_span() is None
+
+    inner, outer = exporter.get_finished_spans()
+    assert inner.parent_id == outer.context.span_id
+    assert inner.context.trace_id == outer.context.trace_id
+    assert outer.parent_id is None
+    assert (inner.status, inner.error) == ("error", "boom")
+    assert outer.status == "ok"
+    assert outer.duration is not None and outer.duration >= 0
+
+
+@pytest.fixture
+def traced_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}", operation_id="get_item")
+    async def get_item(item_id: int, request: Request):
+        if item_id == 500:
+            raise RuntimeError("boom")
+        return {"id": item_id, "traceparent": request.headers.get("traceparent")}
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_tool_call_spans(traced_app: FastAPI):
+    exporter = InMemorySpanExporter()
+    mcp = FastApiMCP(traced_app, tracer=Tracer(exporter))
+
+    async with create_connected_server_and_client_session(mcp.server) as client_session:
+        result = await client_session.call_tool("get_item", {"item_id": 1})
+        assert not result.isError
+        assert isinstance(result.content[0], types.TextContent)
+        forwarded_traceparent = json.loads(result.content[0].text)["traceparent"]
+
+        result = await client_session.call_tool("get_item", {"item_id": 500})
+        assert result.isError
+
+    dispatch, failed_dispatch = exporter.get_finished_spans("mcp.tool.dispatch")
+    upstream, failed_upstream = exporter.get_finished_spans("mcp.upstream.request")
+
+    assert dispatch.attributes["mcp.tool.name"] == "get_item"
+    assert upstream.parent_id == dispatch.context.span_id
+    assert upstream.attributes["http.route"] == "/items/{item_id}"
+    assert upstream.attributes["url.path"] == "/items/1"
+    assert upstream.attributes["http.response.status_code"] == 200
+
+    # The API gets the context of the upstream request span
+    assert SpanContext.from_traceparent(forwarded_traceparent) == upstream.context
+
+    assert failed_upstream.status == "error"
+    assert failed_dispatch.status == "error"
+
+
+@pytest.mark.asyncio
+async def test_message_receipt_and_queue_wait(traced_app: FastAPI):
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter)
+    mcp = FastApiMCP(traced_app, tracer=tracer)
+    transport = FastApiSseTransport("/mcp/messages/", tracer=tracer)
+
+    session_id = uuid.uuid4()
+    send_stream, receive_stream = anyio.create_memory_object_stream[Union[types.JSONRPCMessage, Exception]](1)
+    transport._read_stream_writers[session_id] = send_stream
+
+    client_context = SpanContext(trace_id="4bf92f3577b34da6a3ce929d0e0e4736", span_id="00f067aa0ba902b7")
+    body = json.dumps(
+        {"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": "get_item", "arguments": {"item_id": 1}}}
+    ).encode()
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    request = Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/mcp/messages/",
+            "headers": [(b"traceparent", client_context.to_traceparent().encode())],
+            "query_string": f"session_id={session_id.hex}".encode(),
+        },
+        receive,
+    )
+    response = await transport.handle_fastapi_post_message(request)
+    assert response.status_code == 202
+    assert response.background is not None
+    await response.background()
+
+    [receive_span] = exporter.get_finished_spans("mcp.message.receive")
+    assert receive_span.parent_id == client_context.span_id
+    assert receive_span.context.trace_id == client_context.trace_id
+    assert receive_span.attributes["mcp.method"] == "tools/call"
+    assert receive_span.attributes["http.status_code"] == 202
+
+    message = receive_stream.receive_nowait()
+    assert isinstance(message, types.JSONRPCMessage) and isinstance(message.root, types.JSONRPCRequest)
+    assert message.root.params is not None
+    trace_context: Dict = message.root.params[TRACE_CONTEXT_PARAM]
+    assert SpanContext.from_traceparent(trace_context["traceparent"]) == receive_span.context
+
+    # Simulate a message that waited in the queue before being handled
+    trace_context["received_at"] = time.time() - 0.5
+    call_request = types.ClientRequest(
+        types.CallToolRequest.model_validate(
+            {
+                "method": "tools/call",
+                "params": {"name": "get_item", "arguments": {"item_id": 1}, TRACE_CONTEXT_PARAM: trace_context},
+            }
+        )
+    )
+    async with create_connected_server_and_client_session(mcp.server) as client_session:
+        await client_session.send_request(call_request, types.CallToolResult)
+
+    [queue_wait] = exporter.get_finished_spans("mcp.queue_wait")
+    [dispatch] = exporter.get_finished_spans("mcp.tool.dispatch")
+    spans: List = [queue_wait, dispatch]
+    assert all(span.parent_id == receive_span.context.span_id for span in spans)
+    assert all(span.context.trace_id == client_context.trace_id for span in spans)
+    assert queue_wait.duration is not None and queue_wait.duration >= 0.5
+
+
+def test_exporters_must_implement_export():
+    class IncompleteExporter(SpanExporter):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteExporter()  # type: ignore[abstract]
@@ -58,7 +58,8 @@ class TestOAuthMetadata:
 class TestAuthConfig:
     def test_required_fields_validation(self):
         with pytest.raises(
-            ValidationError, match="at least one of 'issuer', 'custom_oauth_metadata' or 'dependencies' is required"
+            ValidationError,
+            match="at least one of 'issuer', 'custom_oauth_metadata', 'dependencies' or 'token_verifier' is required",
         ):
             AuthConfig()
 
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List
+
+import mcp.types as types
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from fastapi_mcp import FastApiMCP, ToolView
+from fastapi_mcp.testing import connect_in_memory
+from fastapi_mcp.types import WorkerPoolConfig
+
+
+@pytest.fixture
+def blocking_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/report", operation_id="build_report")
+    async def build_report():
+        time.sleep(0.2)  # Blocks the event loop it runs on
+        return {"thread": threading.current_thread().name}
+
+    @app.get("/ping", operation_id="ping")
+    async def ping():
+        return {"thread": threading.current_thread().name}
+
+    return app
+
+
+def result_thread(result: types.CallToolResult) -> str:
+    assert not result.isError
+    assert isinstance(result.content[0], types.TextContent)
+    return json.loads(result.content[0].text)["thread"]
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_run_on_worker_pool(blocking_app: FastAPI):
+    mcp = FastApiMCP(blocking_app, worker_pool=WorkerPoolConfig(workers=2))
+    assert mcp.worker_pool is not None
+
+    try:
+        async with connect_in_memory(mcp) as session:
+            ticks = 0
+
+            async def tick():
+                nonlocal ticks
+                for _ in range(10):
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            # The event loop of the session keeps running while the endpoints block their workers
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                session.call_tool("build_report", {}), session.call_tool("build_report", {}), tick()
+            )
+            elapsed = time.perf_counter() - start
+
+            assert ticks == 10
+            assert elapsed < 0.35
+            threads = {result_thread(results[0]), result_thread(results[1])}
+            assert threads == {"fastapi_mcp_tool_worker_0", "fastapi_mcp_tool_worker_1"}
+            assert mcp.worker_pool.pending == 0
+    finally:
+        mcp.worker_pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_routing_and_queue_limit(blocking_app: FastAPI):
+    mcp = FastApiMCP(
+        blocking_app,
+        worker_pool=WorkerPoolConfig(workers=1, max_queue=1, tools=ToolView(include_operations=["build_report"])),
+    )
+    assert mcp.worker_pool is not None
+
+    try:
+        async with connect_in_memory(mcp) as session:
+            assert result_thread(await session.call_tool("ping", {})) == threading.current_thread().name
+
+            first, second = await asyncio.gather(
+                session.call_tool("build_report", {}), session.call_tool("build_report", {})
+            )
+            assert result_thread(first) == "fastapi_mcp_tool_worker_0"
+            assert second.isError
+            assert isinstance(second.content[0], types.TextContent)
+            assert "worker pool is full" in second.content[0].text
+    finally:
+        mcp.worker_pool.shutdown()
+
+
+@pytest.mark.parametrize("custom_lifespan", [False, True])
+def test_worker_pool_is_shut_down_with_the_app(custom_lifespan: bool):
+    events: List[str] = []
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        events.append("startup")
+        yield
+        events.append("shutdown")
+
+    app = FastAPI(lifespan=lifespan if custom_lifespan else None)
+
+    @app.get("/ping", operation_id="ping")
+    async def ping():
+        return {}
+
+    mcp = FastApiMCP(app, worker_pool=WorkerPoolConfig(workers=2))
+    mcp.mount()
+    mcp.mount(mount_path="/other-mcp")
+    assert mcp.worker_pool is not None
+
+    with TestClient(app):
+        mcp.worker_pool.start()
+        threads = [worker.thread for worker in mcp.worker_pool._workers]
+        clients = [worker.client for worker in mcp.worker_pool._workers]
+        assert all(thread.is_alive() for thread in threads)
+
+    assert not mcp.worker_pool.started
+    assert not any(thread.is_alive() for thread in threads)
+    assert all(client.is_closed for client in clients)
+    assert events == (["startup", "shutdown"] if custom_lifespan else [])
+
+
+def test_worker_pool_config_validation():
+    with pytest.raises(ValidationError):
+        WorkerPoolConfig(workers=0)
+
+    with pytest.raises(ValidationError):
+        WorkerPoolConfig(max_queue=0)